@@ -26,7 +26,7 @@ if sys.version_info[0] == 3:
 
 from builtins import object
 from builtins import next
-from future.utils import iteritems
+from future.utils import iteritems, itervalues
 
 from cobra.mit.naming import Dn
 from cobra.mit.naming import Rn
@@ -144,6 +144,13 @@ class MoStatus(object):
         return self.status >= other.status
 
 
+# The dirty props of a compact Mo until one is set
+_NO_DIRTY_PROPS = frozenset()
+
+# The children of a Mo until one is attached, shared by all the leaves
+_NO_CHILDREN = ()
+
+
 class BaseMo(object):
     class _ChildContainer(object):
         class _ClassContainer(object):
@@ -170,7 +177,7 @@ class BaseMo(object):
                 return len(self._childObjects)
 
             def __iter__(self):
-                return iter(list(self._childObjects.values()))
+                return iter(itervalues(self._childObjects))
 
             @property
             def childClass(self):
@@ -209,27 +216,6 @@ class BaseMo(object):
                     newChildContainer._childObjects[nameTuple] = childMo.clone(parentMo=parentMo, depth=depth)
                 return newChildContainer
 
-        class _ChildIter(object):
-            def __init__(self, classContainers):
-                self._containers = iter(list(classContainers.values()))
-                self._currentContainer = None
-
-            def __next__(self):
-                if self._currentContainer is None:
-                    # If no more containers this statement will throw an
-                    # StopIteration exception and we exit else we move on
-                    # to the next container
-                    self._currentContainer = iter(next(self._containers))
-                try:
-                    return next(self._currentContainer)
-                except StopIteration:
-                    # Current container is done, see if we have anything else
-                    self._currentContainer = None
-                    return next(self)
-
-            def __iter__(self):
-                return self
-
         def __init__(self, classMeta):
             self._classMeta = classMeta
 
@@ -272,13 +258,15 @@ class BaseMo(object):
             return classContainer
 
         def __iter__(self):
-            return BaseMo._ChildContainer._ChildIter(self._classContainers)
+            # The children are not copied, like a dict the tree must not be
+            # changed while it is iterated
+            for classContainer in itervalues(self._classContainers):
+                for childMo in itervalues(classContainer._childObjects):
+                    yield childMo
 
         def __len__(self):
-            numChildren = 0
-            for _, classContainer in iteritems(self._classContainers):
-                numChildren += len(classContainer)
-            return numChildren
+            return sum(len(classContainer._childObjects) for classContainer
+                       in itervalues(self._classContainers))
 
     def __init__(self, parentMoOrDn, markDirty, *namingVals,
                  **creationProps):
@@ -293,7 +281,7 @@ class BaseMo(object):
         else:
             self.__dict__['_BaseMo__status'] = MoStatus(MoStatus.CREATED | MoStatus.MODIFIED)
         self.__dict__['_BaseMo__dirtyProps'] = set()
-        self.__dict__['_BaseMo__children'] = BaseMo._ChildContainer(self.__meta)
+        self.__dict__['_BaseMo__children'] = _NO_CHILDREN
         self.__dict__['_BaseMo__rn'] = Rn(self.__meta, *namingVals)
         self.__dict__['_BaseMo__dn'] = None
 
@@ -339,11 +327,168 @@ class BaseMo(object):
         if self.__parentMo:
             self.__parentMo.__modifyChild(self, attach=True)
 
+    # Compact and frozen variants of the model classes, see _compactClass
+    # and _frozenClass
+    _compactClasses = {}
+    _frozenClasses = {}
+
+    @classmethod
+    def _fromWire(cls, parentMo, parentDnStr, namingVals, wireProps,
+                  compact=False, frozen=False):
+        """Hydrate a Mo of this class from the properties decoded by a codec.
+
+        This is the fast path of the codecs: the properties are not validated
+        one by one, no dirty tracking is done and the Mo is inserted directly
+        in the child container of its parent. The result is equivalent to
+        calling the class with markDirty=False followed by resetProps().
+
+        Args:
+            parentMo (BaseMo): the parent Mo, or None for a top level Mo
+            parentDnStr (str): the parent dn of a top level Mo
+            namingVals (list): the naming values of the Mo
+            wireProps (dict): the other properties of the Mo, consumed
+            compact (bool): create the Mo with the compact layout, see
+                _compactClass
+            frozen (bool): create a read-only Mo, see _frozenClass, takes
+                precedence over compact
+        """
+        if frozen:
+            return cls._frozenClass()._fromFrozenWire(
+                parentMo, parentDnStr, namingVals, wireProps)
+        if compact:
+            return cls._compactClass()._fromCompactWire(
+                parentMo, parentDnStr, namingVals, wireProps)
+        meta = cls.meta
+        mo = cls.__new__(cls)
+        moDict = mo.__dict__
+        moDict['_BaseMo__meta'] = meta
+        statusStr = wireProps.pop('status', None)
+        if statusStr is not None:
+            moDict['_BaseMo__status'] = MoStatus.fromString(statusStr)
+        else:
+            moDict['_BaseMo__status'] = MoStatus(MoStatus.CREATED | MoStatus.MODIFIED)
+        moDict['_BaseMo__dirtyProps'] = set()
+        moDict['_BaseMo__children'] = _NO_CHILDREN
+        moDict['_BaseMo__rn'] = Rn(meta, *namingVals)
+        moDict['_BaseMo__dn'] = None
+        moDict['_BaseMo__parentDn'] = None
+        moDict['_BaseMo__parentMo'] = parentMo
+        if parentMo is None:
+            moDict['_BaseMo__parentDnStr'] = str(parentDnStr)
+
+        wirePropNames = meta._wirePropNames
+        if wirePropNames is None:
+            wirePropNames = meta._wirePropNames = frozenset(meta.props.names)
+        for propMeta, value in zip(meta.namingProps, namingVals):
+            moDict[propMeta.name] = value
+        if wirePropNames.issuperset(wireProps):
+            moDict.update(wireProps)
+        else:
+            # Props of an upgraded meta are ignored, see __init__
+            for name, value in iteritems(wireProps):
+                if name in wirePropNames:
+                    moDict[name] = value
+
+        if parentMo is not None:
+            parentMo.__attachDecodedChild(mo, namingVals)
+        return mo
+
+    def __attachDecodedChild(self, childMo, namingVals):
+        if len(namingVals) == 0:
+            key = None
+        elif len(namingVals) == 1:
+            key = namingVals[0]
+        else:
+            key = tuple(namingVals)
+        classContainer = self.__childContainer()._getChildContainerByMo(childMo)
+        classContainer._childObjects[key] = childMo
+
+    def __childContainer(self):
+        children = self.__children
+        if children is _NO_CHILDREN:
+            children = self.__children = BaseMo._ChildContainer(self.__meta)
+        return children
+
+    @classmethod
+    def _compactClass(cls):
+        """Return the compact variant of this class.
+
+        Compact Mos keep their core state in slots and their decoded props in
+        a tuple laid out by a map shared with the Mos that have the same
+        props. The model classes declare no slots, so an instance dict is
+        still created, but only when a prop is set. Their status is kept as
+        an int until it is read and their set of dirty props is created on
+        first use.
+        They take about a quarter less memory than a regular Mo, at the cost
+        of a slower attribute access, and are meant for read-only query results.
+        The compact variant is a subclass of the class, clones are regular
+        Mos.
+        """
+        compactCls = BaseMo._compactClasses.get(cls)
+        if compactCls is None:
+            compactCls = type(cls.__name__, (_CompactMo, cls), {
+                '__module__': cls.__module__,
+                '__slots__': _CompactMo._CORE_SLOTS + ('_BaseMo__status',),
+                '_BaseMo__meta': cls.meta,
+                '_namingPropNames': tuple(propMeta.name for propMeta in
+                                          cls.meta.namingProps),
+                '_propLayouts': {},
+            })
+            # Setting the slots through their descriptors skips __setattr__
+            slots = vars(compactCls)
+            compactCls._coreSlotSetters = tuple(
+                slots[slot].__set__ for slot in _CompactMo._CORE_SLOTS)
+            BaseMo._compactClasses[cls] = compactCls
+        return compactCls
+
+    @classmethod
+    def _frozenClass(cls):
+        """Return the frozen variant of this class.
+
+        Frozen Mos are read-only: their core state and props are stored in
+        slots, their status is shared and immutable and they have no dirty
+        props. The model classes declare no slots, so the instances still have
+        an instance dict, it stays empty since props cannot be set. Reading a
+        prop does not go through __getattr__ once it has been decoded, setting
+        a prop or the status raises a ValueError.
+        The frozen variant is a subclass of the class, thaw() and clones
+        return regular Mos.
+        """
+        frozenCls = BaseMo._frozenClasses.get(cls)
+        if frozenCls is None:
+            propSlots = [propName for propName in cls.meta.props.names
+                         if not hasattr(cls, propName)]
+            namingPropNames = set(propMeta.name for propMeta in
+                                  cls.meta.namingProps)
+            frozenCls = type(cls.__name__, (_FrozenMo, cls), {
+                '__module__': cls.__module__,
+                '__slots__': _FrozenMo._CORE_SLOTS + tuple(propSlots),
+                '_BaseMo__meta': cls.meta,
+                '_valuePropNames': tuple(propName for propName in propSlots
+                                         if propName not in namingPropNames),
+            })
+            # Setting the slots through their descriptors skips __setattr__
+            slots = vars(frozenCls)
+            frozenCls._coreSlotSetters = tuple(
+                slots[slot].__set__ for slot in _FrozenMo._CORE_SLOTS)
+            frozenCls._propSlotSetters = dict(
+                (propName, slots[propName].__set__) for propName in propSlots)
+            BaseMo._frozenClasses[cls] = frozenCls
+        return frozenCls
+
+    @classmethod
+    def _regularClass(cls):
+        return cls
+
+    def thaw(self):
+        """Return a mutable Mo, a copy of this Mo and its subtree if frozen."""
+        return self
+
     def clone(self, parentMo=None, depth=-1):
         namingVals = self.__rn.namingValueList
         if parentMo is None:
             parentMo = self._parentDn()
-        newMo = self.__class__(parentMo, *namingVals, markDirty=False)
+        newMo = self._regularClass()(parentMo, *namingVals, markDirty=False)
 
         # Copy the properties based on the meta
         for prop in self.__meta.props:
@@ -358,7 +503,7 @@ class BaseMo(object):
 
         newMo.status.update(self.__status)
 
-        if depth != 0:
+        if depth != 0 and self.__children is not _NO_CHILDREN:
             # Clone the containers to form the subtree recursively
             childDepth = depth - 1
             newMo.__dict__['_BaseMo__children'] = self.__children.clone(parentMo=newMo, depth=childDepth)
@@ -372,7 +517,7 @@ class BaseMo(object):
             dirtyValue = getattr(srcMo, dirtyPropName)
             if dirtyPropMeta.isCreateOnly:
                 self.__dict__[dirtyPropName] = dirtyValue
-                self.__dirtyProps.add(dirtyPropName)
+                self.__addDirtyProp(dirtyPropName)
             else:
                 setattr(self, dirtyPropName, dirtyValue)
         self.__status.update(srcMo.status)
@@ -393,7 +538,14 @@ class BaseMo(object):
 
         # We got this call because properties did not match, so look for
         # child class containers
-        return self.__children._getChildContainer(attrName)
+        children = self.__children
+        if children is not _NO_CHILDREN:
+            return children._getChildContainer(attrName)
+        # Only keep the containers of a leaf once a child class is found
+        children = BaseMo._ChildContainer(self.__meta)
+        classContainer = children._getChildContainer(attrName)
+        self.__children = children
+        return classContainer
 
     def __setattr__(self, attrName, attrValue):
         if attrName in self.meta.props:
@@ -420,18 +572,25 @@ class BaseMo(object):
 
         if markDirty:
             self.__setModified()
-            self.__dirtyProps.add(propName)
+            self.__addDirtyProp(propName)
+
+    def __addDirtyProp(self, propName):
+        dirtyProps = self.__dirtyProps
+        if dirtyProps is _NO_DIRTY_PROPS:
+            # Compact Mos create their set on first use
+            dirtyProps = self.__dirtyProps = set()
+        dirtyProps.add(propName)
 
     def __setModified(self):
         self.__status.onBit(MoStatus.MODIFIED)
-        self.__dirtyProps.add('status')
+        self.__addDirtyProp('status')
 
     def __modifyChild(self, childMo, attach):
         childMeta = childMo.meta
         namingVals = []
         for nPropMeta in childMeta.namingProps:
             namingVals.append(getattr(childMo, nPropMeta.name))
-        childContainer = self.__children._getChildContainerByMo(childMo)
+        childContainer = self.__childContainer()._getChildContainerByMo(childMo)
         if len(namingVals) == 0:
             if attach:
                 childContainer[None] = childMo
@@ -474,7 +633,7 @@ class BaseMo(object):
     def _delete(self):
         self.__status.clear()
         self.__status.onBit(MoStatus.DELETED)
-        self.__dirtyProps.add('status')
+        self.__addDirtyProp('status')
 
     def _dn(self):
         if self.__dn is None:
@@ -490,7 +649,10 @@ class BaseMo(object):
 
     def _parentDn(self):
         if self.__parentDn is None:
-            self.__parentDn = Dn.fromString(self.__parentDnStr)
+            if self.__parentMo is not None:
+                self.__parentDn = self.__parentMo.dn.clone()
+            else:
+                self.__parentDn = Dn.fromString(self.__parentDnStr)
         return self.__parentDn
 
     def _parent(self):
@@ -510,3 +672,227 @@ class BaseMo(object):
 
     def _isPropDirty(self, propName):
         return propName in self.__dirtyProps
+
+
+class _CompactMo(object):
+    """
+    The base of the compact variants of the model classes, see
+    BaseMo._compactClass. The private attributes of BaseMo are slots of the
+    compact class, so the BaseMo implementation is shared by both layouts.
+    A prop that is set is stored like in a regular Mo.
+    """
+
+    _CORE_SLOTS = ('_statusValue', '_BaseMo__dirtyProps', '_BaseMo__children',
+                   '_BaseMo__rn', '_BaseMo__dn', '_BaseMo__parentDn',
+                   '_BaseMo__parentMo', '_BaseMo__parentDnStr', '_propLayout',
+                   '_propValues')
+
+    # The status is created from _statusValue on first use
+    _SLOTS = frozenset(_CORE_SLOTS + ('_BaseMo__status',))
+
+    # The setters of the core slots, in _CORE_SLOTS order, the naming prop
+    # names and the prop layouts, set on each subclass
+    _coreSlotSetters = ()
+    _namingPropNames = ()
+    _propLayouts = {}
+
+    @classmethod
+    def _fromCompactWire(cls, parentMo, parentDnStr, namingVals, wireProps):
+        meta = cls.meta
+        mo = cls.__new__(cls)
+        statusStr = wireProps.pop('status', None)
+        if statusStr is not None:
+            status = MoStatus.fromString(statusStr).value
+        else:
+            status = MoStatus.CREATED | MoStatus.MODIFIED
+        (setStatusValue, setDirtyProps, setChildren, setRn, setDn, setParentDn,
+         setParentMo, setParentDnStr, setPropLayout,
+         setPropValues) = cls._coreSlotSetters
+        setStatusValue(mo, status)
+        setDirtyProps(mo, _NO_DIRTY_PROPS)
+        setChildren(mo, _NO_CHILDREN)
+        setRn(mo, Rn(meta, *namingVals))
+        setDn(mo, None)
+        setParentDn(mo, None)
+        setParentMo(mo, parentMo)
+        setParentDnStr(mo, None if parentMo is not None else str(parentDnStr))
+
+        wirePropNames = meta._wirePropNames
+        if wirePropNames is None:
+            wirePropNames = meta._wirePropNames = frozenset(meta.props.names)
+        if not wirePropNames.issuperset(wireProps):
+            # Props of an upgraded meta are ignored, see BaseMo.__init__
+            wireProps = dict((name, value) for name, value in
+                             iteritems(wireProps) if name in wirePropNames)
+        # Only the decoded props are stored, the Mos of a query usually have
+        # the same props and share their layout
+        propNames = cls._namingPropNames + tuple(wireProps)
+        propLayout = cls._propLayouts.get(propNames)
+        if propLayout is None:
+            propLayout = cls._propLayouts[propNames] = dict(
+                (propName, index) for index, propName in enumerate(propNames))
+        setPropLayout(mo, propLayout)
+        setPropValues(mo, tuple(namingVals) + tuple(itervalues(wireProps)))
+
+        if parentMo is not None:
+            parentMo._BaseMo__attachDecodedChild(mo, namingVals)
+        return mo
+
+    @classmethod
+    def _regularClass(cls):
+        return cls.__bases__[1]
+
+    def __getattr__(self, attrName):
+        if attrName == '_BaseMo__status':
+            status = MoStatus(self._statusValue)
+            object.__setattr__(self, attrName, status)
+            return status
+
+        index = self._propLayout.get(attrName)
+        if index is not None:
+            return self._propValues[index]
+        props = self.meta.props
+        if attrName in props:
+            # Not decoded, the default value is not stored
+            return props[attrName].defaultValueStr
+        return BaseMo.__getattr__(self, attrName)
+
+    def __setattr__(self, attrName, attrValue):
+        if attrName in _CompactMo._SLOTS:
+            object.__setattr__(self, attrName, attrValue)
+        else:
+            BaseMo.__setattr__(self, attrName, attrValue)
+
+
+class _FrozenMoStatus(MoStatus):
+    """An immutable MoStatus, shared by the frozen Mos with the same status."""
+
+    # status -> _FrozenMoStatus
+    _statuses = {}
+
+    @classmethod
+    def fromValue(cls, status):
+        frozenStatus = cls._statuses.get(status)
+        if frozenStatus is None:
+            frozenStatus = cls._statuses[status] = cls(status)
+        return frozenStatus
+
+    def __init__(self, status):
+        self.__dict__['_MoStatus__status'] = status
+
+    def __setattr__(self, attrName, attrValue):
+        raise ValueError('the status of a frozen Mo cannot be changed')
+
+
+class _FrozenMo(object):
+    """
+    The base of the frozen variants of the model classes, see
+    BaseMo._frozenClass. The private attributes of BaseMo are slots of the
+    frozen class, so the BaseMo implementation is shared by both layouts.
+    Only the lazily computed ones can be set once the Mo is decoded.
+    """
+
+    _CORE_SLOTS = ('_BaseMo__status', '_BaseMo__children', '_BaseMo__rn',
+                   '_BaseMo__dn', '_BaseMo__parentDn', '_BaseMo__parentMo',
+                   '_BaseMo__parentDnStr')
+
+    # BaseMo private attributes caching a value computed on demand
+    _CACHE_SLOTS = frozenset(['_BaseMo__dn', '_BaseMo__parentDn',
+                              '_BaseMo__children'])
+
+    _BaseMo__dirtyProps = _NO_DIRTY_PROPS
+
+    # The setters of the core slots, in _CORE_SLOTS order, and of the prop
+    # slots by prop name and the props that are not naming props, set on
+    # each subclass
+    _coreSlotSetters = ()
+    _propSlotSetters = {}
+    _valuePropNames = ()
+
+    @classmethod
+    def _fromFrozenWire(cls, parentMo, parentDnStr, namingVals, wireProps):
+        meta = cls.meta
+        mo = cls.__new__(cls)
+        statusStr = wireProps.pop('status', None)
+        if statusStr is not None:
+            status = MoStatus.fromString(statusStr).value
+        else:
+            status = MoStatus.CREATED | MoStatus.MODIFIED
+        (setStatus, setChildren, setRn, setDn, setParentDn, setParentMo,
+         setParentDnStr) = cls._coreSlotSetters
+        setStatus(mo, _FrozenMoStatus.fromValue(status))
+        setChildren(mo, _NO_CHILDREN)
+        setRn(mo, Rn(meta, *namingVals))
+        setDn(mo, None)
+        setParentDn(mo, None)
+        setParentMo(mo, parentMo)
+        setParentDnStr(mo, None if parentMo is not None else str(parentDnStr))
+
+        propSlotSetters = cls._propSlotSetters
+        for propMeta, value in zip(meta.namingProps, namingVals):
+            propSlotSetters[propMeta.name](mo, value)
+        for name, value in iteritems(wireProps):
+            setSlot = propSlotSetters.get(name)
+            # Props of an upgraded meta are ignored, see BaseMo.__init__
+            if setSlot is not None:
+                setSlot(mo, value)
+
+        if parentMo is not None:
+            parentMo._BaseMo__attachDecodedChild(mo, namingVals)
+        return mo
+
+    @classmethod
+    def _regularClass(cls):
+        return cls.__bases__[1]
+
+    def thaw(self):
+        """Return a mutable copy of this Mo and its subtree."""
+        return self.__thaw(None)
+
+    def __thaw(self, parentMo):
+        namingVals = [getattr(self, propMeta.name)
+                      for propMeta in self.meta.namingProps]
+        wireProps = {}
+        getSlot = object.__getattribute__
+        for name in self._valuePropNames:
+            try:
+                wireProps[name] = getSlot(self, name)
+            except AttributeError:
+                # Not decoded, the thawed Mo has the default value as well
+                pass
+        parentDnStr = str(self._parentDn()) if parentMo is None else None
+        mo = self._regularClass()._fromWire(parentMo, parentDnStr, namingVals,
+                                            wireProps)
+        mo.__dict__['_BaseMo__status'] = MoStatus(self.status.value)
+        for childMo in self.children:
+            childMo.__thaw(mo)
+        return mo
+
+    def _attachChild(self, childMo):
+        # Before the child is detached from its current parent
+        self.__raiseFrozen()
+
+    def _BaseMo__modifyChild(self, childMo, attach):
+        self.__raiseFrozen()
+
+    def __raiseFrozen(self):
+        raise ValueError('frozen Mo "{0}" cannot be modified, thaw it '
+                         'first'.format(str(self.dn)))
+
+    def __getattr__(self, attrName):
+        props = self.meta.props
+        if attrName in props:
+            # Not decoded, the default value is not stored
+            return props[attrName].defaultValueStr
+        return BaseMo.__getattr__(self, attrName)
+
+    def __setattr__(self, attrName, attrValue):
+        if attrName in _FrozenMo._CACHE_SLOTS:
+            object.__setattr__(self, attrName, attrValue)
+        elif attrName == '_BaseMo__dirtyProps' and not attrValue:
+            # resetProps, a frozen Mo has no dirty props to reset
+            pass
+        elif attrName in self.meta.props or attrName.startswith('_BaseMo__'):
+            self.__raiseFrozen()
+        else:
+            BaseMo.__setattr__(self, attrName, attrValue)
@@ -14,4 +14,4 @@
 
 """The ACI Python SDK json codec module."""
 
-from cobra.mit.jsoncodec import parseJSONError, fromJSONStr, fromJSONDict, toJSONStr, _createMo
+from cobra.mit.jsoncodec import parseJSONError, fromJSONStr, fromJSONDict, fromJSONStream, fromJSONColumns, toJSONStr, _createMo
@@ -14,4 +14,4 @@
 
 """The ACI Python SDK json codec module."""
 
-from cobra.mit.xmlcodec import parseXMLError, fromXMLStr, fromXMLStream, toXMLStr, _toXMLStr, _createMo
+from cobra.mit.xmlcodec import parseXMLError, fromXMLStr, fromXMLStream, iterXMLStream, fromXMLColumns, toXMLStr, _toXMLStr, _createMo
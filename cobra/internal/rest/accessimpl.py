@@ -19,9 +19,18 @@ if sys.version_info[0] == 3:
     from builtins import str
 from builtins import object
 
+import copy
 import requests
-from cobra.internal.codec.jsoncodec import fromJSONStr, parseJSONError
-from cobra.internal.codec.xmlcodec import fromXMLStr, parseXMLError
+from requests.adapters import HTTPAdapter
+try:
+    from urllib3.util.retry import Retry
+except ImportError:
+    from requests.packages.urllib3.util.retry import Retry
+from multiprocessing.pool import ThreadPool
+from cobra.mit._codec_utils import listWithTotalCount
+from cobra.mit._lookup import setPageOrder
+from cobra.internal.codec.jsoncodec import fromJSONStr, fromJSONStream, fromJSONColumns, parseJSONError
+from cobra.internal.codec.xmlcodec import fromXMLStr, iterXMLStream, fromXMLColumns, parseXMLError
 from cobra.mit.request import QueryError, CommitError, RestError, AbstractRequest, CheckRequestStateQuery
 from cobra.mit.session import LoginSession, CertSession, AbstractSession
 import json
@@ -86,10 +95,10 @@ class RefreshRequest(AbstractRequest):
 
 class LoginHandler(object):
     @classmethod
-    def login(cls, session):
+    def login(cls, session, accessimpl):
         loginRequest = LoginRequest(session.user, session.password)
         url = loginRequest.getUrl(session)
-        rsp = requests.post(url, **loginRequest.requestargs(session))
+        rsp = accessimpl._requests.post(url, **loginRequest.requestargs(session))
         session._parseResponse(rsp)
 
     @classmethod
@@ -104,7 +113,7 @@ class LoginHandler(object):
 
 class CertHandler(object):
     @classmethod
-    def login(cls, session):
+    def login(cls, session, accessimpl):
         pass
 
     @classmethod
@@ -122,10 +131,42 @@ class RestAccess(object):
         CertSession: CertHandler,
     }
 
+    # Default number of worker threads fetching pages concurrently
+    DEFAULT_PAGE_WORKERS = 8
+
+    # Number of bytes read at once from the streamed responses
+    STREAM_CHUNK_SIZE = 65536
+
     def __init__(self, session):
         self._session = session
-        self._requests = requests.Session()
-        #requests.adapters.HTTPAdapter(pool_connections = 64, pool_maxsize = 128)
+        self._requests = self.__makeRequestsSession(session)
+
+    @staticmethod
+    def __makeRequestsSession(session):
+        """Create the requests session and its connection pool
+
+        All the requests made through this object, including login and
+        refresh, share the pooled connections of this session.
+
+        Args:
+            session (LoginSession/CertSession): Session object holding the
+                connection pool options
+        """
+        requestsSession = requests.Session()
+        maxRetries = session.maxRetries
+        if maxRetries:
+            # Connect errors are always retried, read errors such as a
+            # connection reset only for the idempotent methods
+            maxRetries = Retry(total=maxRetries, connect=maxRetries,
+                               read=maxRetries, backoff_factor=0.1)
+        adapter = HTTPAdapter(pool_connections=session.poolConnections,
+                              pool_maxsize=session.poolMaxSize,
+                              max_retries=maxRetries)
+        requestsSession.mount('https://', adapter)
+        requestsSession.mount('http://', adapter)
+        if not session.keepAlive:
+            requestsSession.headers['Connection'] = 'close'
+        return requestsSession
 
     def login(self):
         """
@@ -137,7 +178,7 @@ class RestAccess(object):
         sessionClass = self._session.__class__
         loginHandler = RestAccess.loginHandlers.get(sessionClass, None)
         if loginHandler is not None:
-            loginHandler.login(self._session)
+            loginHandler.login(self._session, self)
 
     def logout(self):
         sessionClass = self._session.__class__
@@ -155,7 +196,7 @@ class RestAccess(object):
         if loginHandler is not None:
             loginHandler.refresh(self._session, self)
 
-    def _get(self, request):
+    def _get(self, request, stream=False):
         """
         Internal _get method which performs raw request and returns requests
         response object
@@ -164,21 +205,107 @@ class RestAccess(object):
         headers = self._session.getHeaders(uriPathAndOptions, None)
         return self._requests.get(request.getUrl(self._session), headers=headers,
                                   verify=self._session.secure,
-                                  timeout=self._session.timeout)
+                                  timeout=self._session.timeout,
+                                  stream=stream)
 
-    def get(self, request):
+    def get(self, request, compact=False, frozen=False):
         """Return data from the server for the given request on the
         given session
         Args:
             request (DnQuery/ClassQuery/TraceQuery/AbstractQuery child): Query
                 object
+            compact (bool): decode the Mos with the compact layout
+            frozen (bool): decode read-only Mos
         Return:
             requests.response
         """
         rsp = self._get(request)
         if rsp.status_code != requests.codes.ok:
             return self.__parseError(rsp, QueryError, rsp.status_code)
-        return self.__parseResponse(rsp)
+        return self.__parseResponse(rsp, compact, frozen)
+
+    def getStream(self, request, compact=False, frozen=False):
+        """Return an iterator of the Mos for the given request, decoded
+        incrementally while the response body is downloaded
+        Args:
+            request (DnQuery/ClassQuery/TraceQuery/AbstractQuery child): Query
+                object
+            compact (bool): decode the Mos with the compact layout
+            frozen (bool): decode read-only Mos
+        Return:
+            iterator of Mos with a totalCount attribute
+        """
+        rsp = self._get(request, stream=True)
+        if rsp.status_code != requests.codes.ok:
+            return self.__parseError(rsp, QueryError, rsp.status_code)
+        return self.__parseStream(rsp, compact, frozen)
+
+    def getColumns(self, request, propNames=None, arrays=False):
+        """Return the data for the given request decoded into columns
+        Args:
+            request (DnQuery/ClassQuery/TraceQuery/AbstractQuery child): Query
+                object
+            propNames (list of str): the props to decode, all when None
+            arrays (bool): convert the columns to arrays
+        Return:
+            columnsWithTotalCount of MoColumns by class name
+        """
+        rsp = self._get(request)
+        if rsp.status_code != requests.codes.ok:
+            return self.__parseError(rsp, QueryError, rsp.status_code)
+        if self._session.formatType == AbstractSession.XML_FORMAT:
+            return fromXMLColumns(rsp.text, propNames, arrays)
+        return fromJSONColumns(rsp.text, propNames, arrays)
+
+    def getPaged(self, request, pageSize, maxWorkers=None, cacheId=None):
+        """Return all the data for the given request, fetched page by page
+
+        The first page is fetched to learn the totalCount of the query, the
+        remaining pages are then fetched concurrently on a bounded pool of
+        threads sharing this object's connection pool. The request itself is
+        not modified, each page is fetched with its own copy. The copies are
+        ordered by dn when the request has no orderBy, so that the pages are
+        consistent. A DnQuery without a classFilter cannot be ordered by dn,
+        the caller must set its orderBy.
+        Args:
+            request (DnQuery/ClassQuery/AbstractQuery child): Query object
+            pageSize (int): number of objects requested per page
+            maxWorkers (int): maximum number of pages fetched concurrently,
+                defaults to DEFAULT_PAGE_WORKERS
+            cacheId (int): cache-session id pinned on every page so all the
+                pages are served from the same snapshot
+        Return:
+            listWithTotalCount of the Mos of all the pages in page order
+        """
+        maxWorkers = maxWorkers if maxWorkers else self.DEFAULT_PAGE_WORKERS
+        firstRequest = copy.deepcopy(request)
+        firstRequest.pageSize = pageSize
+        setPageOrder(firstRequest)
+        if cacheId is not None:
+            firstRequest.cacheId = cacheId
+        firstRequest.page = 0
+        firstPage = self.get(firstRequest)
+
+        allMos = listWithTotalCount(firstPage)
+        allMos.totalCount = firstPage.totalCount
+        numPages = (firstPage.totalCount + pageSize - 1) // pageSize
+        if numPages <= 1 or not firstPage:
+            return allMos
+
+        pageRequests = []
+        for page in range(1, numPages):
+            pageRequest = copy.deepcopy(firstRequest)
+            pageRequest.page = page
+            pageRequests.append(pageRequest)
+
+        pool = ThreadPool(min(maxWorkers, len(pageRequests)))
+        try:
+            # imap hands the results back in the order of the requests
+            for mos in pool.imap(self.get, pageRequests):
+                allMos.extend(mos)
+        finally:
+            pool.terminate()
+        return allMos
 
     def post(self, request):
         """Return data from the server for the given request on the
@@ -254,8 +381,16 @@ class RestAccess(object):
         except ValueError as ex:
             raise RestError(None, str(ex), httpCode)
 
-    def __parseResponse(self, rsp):
+    def __parseStream(self, rsp, compact=False, frozen=False):
+        if self._session.formatType == AbstractSession.XML_FORMAT:
+            # iterparse reads the raw socket, let urllib3 undo any gzip
+            rsp.raw.decode_content = True
+            return iterXMLStream(rsp.raw, compact, frozen)
+        return fromJSONStream(rsp.iter_content(self.STREAM_CHUNK_SIZE),
+                              compact=compact, frozen=frozen)
+
+    def __parseResponse(self, rsp, compact=False, frozen=False):
         if self._session.formatType == AbstractSession.XML_FORMAT:
-            return fromXMLStr(rsp.text)
-        return fromJSONStr(rsp.text)
+            return fromXMLStr(rsp.text, compact=compact, frozen=frozen)
+        return fromJSONStr(rsp.text, compact=compact, frozen=frozen)
 
@@ -0,0 +1,202 @@
+# Copyright 2019 Cisco Systems, Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""The asyncio implementation of the access layer for the ACI Python SDK
+(cobra).
+
+This module requires Python 3 and the aiohttp package.
+"""
+
+import json
+import os
+import ssl
+
+import aiohttp
+import requests
+from cobra.internal.codec.jsoncodec import (fromJSONStr, fromJSONColumns,
+                                            parseJSONError)
+from cobra.internal.codec.xmlcodec import (fromXMLStr, fromXMLColumns,
+                                           parseXMLError)
+from cobra.internal.rest.accessimpl import LoginRequest, RefreshRequest
+from cobra.mit.request import QueryError, CommitError, RestError
+from cobra.mit.session import LoginSession, AbstractSession
+
+
+class BufferedResponse(object):
+    """
+    A fully read aiohttp response exposing the subset of the requests response
+    interface used by the sessions to parse the login responses
+    """
+
+    def __init__(self, url, status_code, text):
+        self.url = url
+        self.status_code = status_code
+        self.text = text
+
+    def json(self):
+        return json.loads(self.text)
+
+    def raise_for_status(self):
+        if self.status_code >= requests.codes.bad:
+            raise requests.HTTPError('%d Error for url: %s' %
+                                     (self.status_code, self.url),
+                                     response=self)
+
+
+class AsyncRestAccess(object):
+    """
+    asyncio counterpart of RestAccess, all the requests of one object are
+    multiplexed over a single aiohttp client session and its connection pool
+    """
+
+    def __init__(self, session):
+        self._session = session
+        self._client = None
+        self._sslContext = None
+
+    def _getClient(self):
+        # The client session has to be created from within the running loop
+        if self._client is None or self._client.closed:
+            session = self._session
+            # Like the requests pools, poolMaxSize bounds the connections to
+            # each host and the total is not bounded
+            connector = aiohttp.TCPConnector(
+                limit=0, limit_per_host=session.poolMaxSize,
+                force_close=not session.keepAlive)
+            self._client = aiohttp.ClientSession(connector=connector)
+        return self._client
+
+    def _requestOptions(self):
+        return {
+            'ssl': self._sslOption(),
+            'timeout': aiohttp.ClientTimeout(total=self._session.timeout),
+        }
+
+    def _sslOption(self):
+        # Like the verify argument of requests, secure is either a bool or
+        # the path of a CA bundle file or directory
+        secure = self._session.secure
+        if not isinstance(secure, str):
+            return True if secure else False
+        if self._sslContext is None:
+            if os.path.isdir(secure):
+                self._sslContext = ssl.create_default_context(capath=secure)
+            else:
+                self._sslContext = ssl.create_default_context(cafile=secure)
+        return self._sslContext
+
+    async def close(self):
+        if self._client is not None:
+            await self._client.close()
+            self._client = None
+
+    async def login(self):
+        """
+        Authenticate the user provided by the session object, certificate
+        based sessions sign every request and need no login
+        """
+        if isinstance(self._session, LoginSession):
+            loginRequest = LoginRequest(self._session.user,
+                                        self._session.password)
+            kwargs = loginRequest.requestargs(self._session)
+            rsp = await self._send('POST', loginRequest.getUrl(self._session),
+                                   kwargs['headers'], kwargs['data'])
+            self._session._parseResponse(rsp)
+
+    async def logout(self):
+        pass
+
+    async def refreshSession(self):
+        """Refresh the cookie for the given session object
+        """
+        if isinstance(self._session, LoginSession):
+            refreshRequest = RefreshRequest(self._session.cookie)
+            self._session._parseResponse(await self._get(refreshRequest))
+
+    async def _send(self, method, url, headers, data=None):
+        async with self._getClient().request(method, url, headers=headers,
+                                             data=data,
+                                             **self._requestOptions()) as rsp:
+            text = await rsp.text()
+            return BufferedResponse(url, rsp.status, text)
+
+    async def _get(self, request):
+        """
+        Internal _get method which performs raw request and returns the
+        buffered response
+        """
+        uriPathAndOptions = request.getUriPathAndOptions(self._session)
+        headers = self._session.getHeaders(uriPathAndOptions, None)
+        return await self._send('GET', request.getUrl(self._session), headers)
+
+    async def get(self, request, compact=False, frozen=False):
+        """Return data from the server for the given request on the
+        given session
+        Args:
+            request (DnQuery/ClassQuery/TraceQuery/AbstractQuery child): Query
+                object
+            compact (bool): decode the Mos with the compact layout
+            frozen (bool): decode read-only Mos
+        Return:
+            listWithTotalCount of Mos
+        """
+        rsp = await self._get(request)
+        if rsp.status_code != requests.codes.ok:
+            return self.__parseError(rsp, QueryError, rsp.status_code)
+        return self.__parseResponse(rsp, compact, frozen)
+
+    async def getColumns(self, request, propNames=None, arrays=False):
+        """Return the data for the given request decoded into columns
+        Args:
+            request (DnQuery/ClassQuery/TraceQuery/AbstractQuery child): Query
+                object
+            propNames (list of str): the props to decode, all when None
+            arrays (bool): convert the columns to arrays
+        Return:
+            columnsWithTotalCount of MoColumns by class name
+        """
+        rsp = await self._get(request)
+        if rsp.status_code != requests.codes.ok:
+            return self.__parseError(rsp, QueryError, rsp.status_code)
+        if self._session.formatType == AbstractSession.XML_FORMAT:
+            return fromXMLColumns(rsp.text, propNames, arrays)
+        return fromJSONColumns(rsp.text, propNames, arrays)
+
+    async def post(self, request):
+        """Post the data of the given request on the given session
+        Args:
+            request (ConfigRequest): ConfigRequest object
+        Return:
+            BufferedResponse
+        """
+        kwargs = request.requestargs(self._session)
+        rsp = await self._send('POST', request.getUrl(self._session),
+                               kwargs['headers'], kwargs['data'])
+        if rsp.status_code >= requests.codes.bad:
+            return self.__parseError(rsp, CommitError, rsp.status_code)
+        return rsp
+
+    def __parseError(self, rsp, errorClass, httpCode):
+        try:
+            if self._session.formatType == AbstractSession.XML_FORMAT:
+                parseXMLError(rsp.text, errorClass, httpCode)
+            else:
+                parseJSONError(rsp.text, errorClass, httpCode)
+        except ValueError as ex:
+            raise RestError(None, str(ex), httpCode)
+
+    def __parseResponse(self, rsp, compact=False, frozen=False):
+        if self._session.formatType == AbstractSession.XML_FORMAT:
+            return fromXMLStr(rsp.text, compact=compact, frozen=frozen)
+        return fromJSONStr(rsp.text, compact=compact, frozen=frozen)
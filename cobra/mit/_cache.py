@@ -0,0 +1,69 @@
+# Copyright 2019 Cisco Systems, Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""The caches shared by the modules of cobra.mit."""
+
+from builtins import object
+
+from collections import namedtuple, OrderedDict
+from threading import Lock
+
+
+class ParseCache(object):
+    """
+    Thread safe LRU cache of what is parsed from strings, e.g. the nodes of
+    the Dns parsed from Dn strings. The cached values are shared by all the
+    lookups of the same string, they must not be modified.
+    """
+
+    CacheInfo = namedtuple('CacheInfo', ['hits', 'misses', 'maxSize',
+                                         'currSize'])
+
+    def __init__(self, maxSize):
+        self.maxSize = maxSize
+        self.hits = 0
+        self.misses = 0
+        self.__entries = OrderedDict()
+        self.__lock = Lock()
+
+    def get(self, string):
+        with self.__lock:
+            try:
+                value = self.__entries.pop(string)
+            except KeyError:
+                self.misses += 1
+                return None
+            # Re-insert as the most recently used entry
+            self.__entries[string] = value
+            self.hits += 1
+            return value
+
+    def put(self, string, value):
+        with self.__lock:
+            if self.maxSize <= 0:
+                return
+            self.__entries[string] = value
+            while len(self.__entries) > self.maxSize:
+                self.__entries.popitem(last=False)
+
+    def info(self):
+        with self.__lock:
+            return ParseCache.CacheInfo(self.hits, self.misses,
+                                        self.maxSize, len(self.__entries))
+
+    def clear(self):
+        with self.__lock:
+            self.__entries.clear()
+            self.hits = 0
+            self.misses = 0
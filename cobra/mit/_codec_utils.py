@@ -12,6 +12,8 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+from ._loader import ClassLoader
+
 
 class listWithTotalCount(list):
     def __init__(self, *args, **kwargs):
@@ -30,24 +32,40 @@ class listWithTotalCount(list):
         self._totalCount = value
 
 
+def splitDnStr(dnStr):
+    """Split a Dn string at the '/' that are not within brackets.
+
+    Returns:
+        tuple: the list of the strings between the separators, empty strings
+            included, and the bracket depth at the end of the string, which
+            is 0 for a well formed Dn string
+    """
+    pieces = dnStr.split('/')
+    if '[' not in dnStr and ']' not in dnStr:
+        return pieces, 0
+    # Join back the pieces split at a '/' within brackets
+    rnStrs = []
+    rnPieces = []
+    depth = 0
+    for piece in pieces:
+        rnPieces.append(piece)
+        if '[' in piece or ']' in piece:
+            depth += piece.count('[') - piece.count(']')
+        if depth == 0:
+            rnStrs.append('/'.join(rnPieces) if len(rnPieces) > 1 else piece)
+            rnPieces = []
+    if rnPieces:
+        rnStrs.append('/'.join(rnPieces))
+    return rnStrs, depth
+
+
 def getParentDn(dnStr):
     if dnStr is None:
         return ''
-    count = 0
-    reverseDn = dnStr[::-1]
-    pDn = ''
-    foundParent = False
-    for dnChar in reverseDn:
-        if not foundParent and dnChar == ']':
-            count += 1
-        elif not foundParent and dnChar == '[':
-            count -= 1
-        elif not foundParent and count == 0 and dnChar == '/':
-            foundParent = True
-        elif foundParent:
-            pDn += dnChar
-    parentDn = pDn[::-1]
-    return parentDn
+    rnStrs, _ = splitDnStr(dnStr)
+    if len(rnStrs) == 1:
+        return ''
+    return dnStr[:len(dnStr) - len(rnStrs[-1]) - 1]
 
 
 def parseMoClassName(className):
@@ -68,3 +86,57 @@ def parseMoClassName(className):
         pkg = className
         klass = ""
     return pkg, klass
+
+
+# PropMeta type class prefixes of the numeric props and the array type code
+# of their columns
+NUMERIC_TYPE_CODES = (
+    ('scalar:Uint64', 'Q'),
+    ('scalar:Uint', 'q'),
+    ('scalar:Sint', 'q'),
+    ('scalar:UByte', 'q'),
+    ('scalar:Double', 'd'),
+    ('scalar:Float', 'd'),
+)
+
+
+def getNumericTypeCode(propMeta):
+    """Return the array type code of a numeric prop, None for other props."""
+    typeClass = propMeta.typeClass or ''
+    for prefix, typeCode in NUMERIC_TYPE_CODES:
+        if typeClass.startswith(prefix):
+            return typeCode
+    return None
+
+
+class DecodePlan(object):
+    """What the codecs need to know to decode a Mo of one wire class."""
+
+    # Properties that are not passed on to the Mo
+    DROPPED_PROPS = frozenset(['dn', 'rn', 'instanceId', 'status'])
+
+    def __init__(self, moClassName):
+        self.moClassName = moClassName
+        self.generation = ClassLoader._generation
+        self.pyClass = ClassLoader.loadMoClass(moClassName)
+        if self.pyClass is None:
+            pkgName, className = parseMoClassName(moClassName)
+            self.pyClass = ClassLoader.loadClass("cobra.model." + pkgName +
+                                                 "." + className)
+        self.namingPropNames = tuple(propMeta.moPropName for propMeta in
+                                     self.pyClass.meta.namingProps)
+        self.droppedProps = DecodePlan.DROPPED_PROPS
+
+
+# Decode plans by wire class name, e.g. fvTenant
+_decodePlans = {}
+
+
+def getDecodePlan(moClassName):
+    """Return the cached DecodePlan of the wire class moClassName."""
+    plan = _decodePlans.get(moClassName)
+    if plan is None or plan.generation != ClassLoader._generation:
+        # The plans made before ClassLoader.clearCache refer to the classes
+        # loaded before, they are rebuilt
+        plan = _decodePlans[moClassName] = DecodePlan(moClassName)
+    return plan
@@ -0,0 +1,351 @@
+# Copyright 2019 Cisco Systems, Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Column oriented decoding of query results."""
+
+import sys
+if sys.version_info[0] == 3:
+    from builtins import str
+from builtins import object
+
+import array
+import operator
+from itertools import compress, repeat
+from future.utils import iteritems
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+from .naming import Rn
+from ._codec_utils import (getDecodePlan, getNumericTypeCode, getParentDn,
+                           splitDnStr)
+
+
+class MoColumns(object):
+    """The objects of one class of a query result, stored by column.
+
+    Every decoded property is a column holding one value per object, None
+    where an object does not have the property, and the dns of the objects
+    are in their own column. No Mo is created while decoding, getMo creates
+    the Mo of one row on demand.
+    """
+
+    def __init__(self, moClassName, propNames=None):
+        """
+        Args:
+            moClassName (str): the wire class name of the objects
+            propNames (list of str): the props to decode, all the props
+                received when None. The naming props are always decoded, the
+                props that the class does not have are ignored.
+        """
+        plan = getDecodePlan(moClassName)
+        meta = plan.pyClass.meta
+        self.moClassName = moClassName
+        self.dns = []
+        self.columns = {}
+        self.__plan = plan
+        self.__propNames = frozenset(name for name in meta.props.names
+                                     if name not in plan.droppedProps)
+        self.__discoverColumns = propNames is None
+        for propName in plan.namingPropNames + tuple(propNames or ()):
+            if propName in self.__propNames:
+                self.columns[propName] = []
+
+    @property
+    def meta(self):
+        return self.__plan.pyClass.meta
+
+    def __len__(self):
+        return len(self.dns)
+
+    def __getitem__(self, propName):
+        return self.columns[propName]
+
+    def __contains__(self, propName):
+        return propName in self.columns
+
+    def _extend(self, rows):
+        """Append rows, the dicts of the props received for each object."""
+        columns = self.columns
+        if self.__discoverColumns and rows:
+            receivedPropNames = set().union(*rows) & self.__propNames
+            for propName in sorted(receivedPropNames):
+                if propName not in columns:
+                    columns[propName] = [None] * len(self.dns)
+        # Build each column at once rather than row by row
+        self.dns.extend([row.get('dn') for row in rows])
+        for propName, column in iteritems(columns):
+            column.extend([row.get(propName) for row in rows])
+
+    def _propValues(self, propName):
+        """Return the values of a prop, its default where it is missing."""
+        default = self.meta.props[propName].defaultValueStr
+        column = self.columns.get(propName)
+        if column is None:
+            column = [default] * len(self)
+        elif isinstance(column, list):
+            if None in column:
+                column = [default if value is None else value
+                          for value in column]
+        elif isNumeric(column):
+            # Compared as strings, like on the Mos
+            column = [str(value) for value in column]
+        elif column.dtype == object:
+            missing = numpy.equal(column, None)
+            if missing.any():
+                column = numpy.where(missing, default, column)
+        if numpy is not None and isinstance(column, list):
+            column = numpy.array(column, dtype=object)
+        return column
+
+    def evaluate(self, propFilter):
+        """Evaluate a property filter against all the rows at once.
+
+        The filter is evaluated like on the Mos of the rows, the numeric
+        props and the constants are compared by value.
+
+        Args:
+            propFilter (str or Expression): the filter, in the syntax of the
+                query filters, e.g. 'eq(fvCEp.encap,"vlan-100")', or parsed
+
+        Returns:
+            the mask of the rows matching the filter, a NumPy array of bools
+            if NumPy is installed, a list of bools otherwise
+        """
+        if isinstance(propFilter, str):
+            from ._filter import filterParser
+            propFilter = filterParser.from_string(propFilter)
+        return propFilter.evaluateColumns(self)
+
+    def select(self, mask):
+        """Return the MoColumns of the rows selected by a mask."""
+        selected = MoColumns(self.moClassName, [])
+        selected.dns = list(compress(self.dns, mask))
+        selected.columns = dict((propName, selectRows(column, mask))
+                                for propName, column in
+                                iteritems(self.columns))
+        return selected
+
+    def getMo(self, row, frozen=False):
+        """Create the Mo of a row.
+
+        Args:
+            row (int): the index of the row
+            frozen (bool): create a read-only Mo
+
+        Returns:
+            cobra.mit.mo.Mo: the Mo, without parent Mo or children
+        """
+        plan = self.__plan
+        wireProps = {}
+        for propName, column in iteritems(self.columns):
+            value = column[row]
+            if value is not None:
+                # The values of numeric arrays are formatted back, the arrays
+                # only hold values whose string is the wire string
+                wireProps[propName] = value if isinstance(value, str) else \
+                    str(value)
+        dnStr = self.dns[row]
+        namingPropNames = plan.namingPropNames
+        if all(propName in wireProps for propName in namingPropNames):
+            namingVals = [wireProps.pop(propName)
+                          for propName in namingPropNames]
+        else:
+            # The naming props were not received, they are in the rn
+            rnStr = splitDnStr(dnStr)[0][-1]
+            namingVals = Rn.fromString(self.meta, rnStr).namingValueList
+            for propName in namingPropNames:
+                wireProps.pop(propName, None)
+        return plan.pyClass._fromWire(None, getParentDn(dnStr), namingVals,
+                                      wireProps, frozen=frozen)
+
+    def iterMos(self, frozen=False):
+        """Create the Mos of all the rows, one at a time."""
+        for row in range(len(self.dns)):
+            yield self.getMo(row, frozen)
+
+    def convertToArrays(self):
+        """Convert the columns to arrays, in place.
+
+        The numeric columns become arrays of numbers, NumPy arrays if NumPy
+        is installed or array.array otherwise. With NumPy the other columns
+        become NumPy arrays of objects, otherwise they stay lists. A numeric
+        column with a missing or non numeric value, or a value whose wire
+        string is not the string of the number, e.g. '1.000' or '007', stays
+        a list of strings so that getMo returns the Mo as it was received.
+
+        Returns:
+            MoColumns: self
+        """
+        props = self.meta.props
+        for propName, column in list(self.columns.items()):
+            if not isinstance(column, list):
+                continue
+            typeCode = getNumericTypeCode(props[propName])
+            values = None
+            if typeCode is not None:
+                values = parseNumericColumn(column, typeCode)
+            if numpy is not None:
+                if values is not None:
+                    values = numpy.asarray(values)
+                else:
+                    values = numpy.array(column, dtype=object)
+            if values is not None:
+                self.columns[propName] = values
+        return self
+
+
+def parseNumericColumn(column, typeCode):
+    """Return the array of the numbers of a column of strings, or None if
+    the column cannot be converted without changing its strings."""
+    parse = float if typeCode == 'd' else int
+    try:
+        values = [parse(value) for value in column]
+    except (TypeError, ValueError, OverflowError):
+        return None
+    for value, valueStr in zip(values, column):
+        if str(value) != valueStr:
+            return None
+    try:
+        return array.array(typeCode, values)
+    except OverflowError:
+        return None
+
+
+def selectRows(column, mask):
+    """Return the values of a column selected by a mask."""
+    if isinstance(column, list):
+        return list(compress(column, mask))
+    elif isinstance(column, array.array):
+        return array.array(column.typecode, compress(column, mask))
+    return column[numpy.asarray(mask, dtype=bool)]
+
+
+def isNumeric(values):
+    if isinstance(values, array.array):
+        return True
+    return numpy is not None and isinstance(values, numpy.ndarray) and \
+        values.dtype.kind in 'iuf'
+
+
+def constantMask(value, numRows):
+    """Return a mask of numRows times value."""
+    if numpy is not None:
+        return numpy.full(numRows, value, dtype=bool)
+    return [value] * numRows
+
+
+def compareColumn(values, compare, lValue):
+    """Return the mask of compare(value, lValue) for each value.
+
+    Args:
+        values: the values of a column, without missing values, see
+            MoColumns._propValues
+        compare: a comparison of the operator module, e.g. operator.eq
+        lValue (str): the value compared to
+    """
+    if numpy is not None and isinstance(values, numpy.ndarray):
+        return numpy.asarray(compare(values, lValue), dtype=bool)
+    return list(map(compare, values, repeat(lValue, len(values))))
+
+
+def compareParsedColumn(values, compare, parseValue, lValue, typedLValue):
+    """Return the mask of the comparisons of the parsed values, see
+    compareColumn. The values that cannot be parsed are compared as strings.
+
+    Args:
+        parseValue: the function parsing a value, None if it cannot
+        typedLValue: lValue parsed
+    """
+    mask = [compare(value, lValue) if typedValue is None else
+            compare(typedValue, typedLValue)
+            for value, typedValue in zip(values, map(parseValue, values))]
+    if numpy is not None:
+        return numpy.array(mask, dtype=bool)
+    return mask
+
+
+def wcardColumn(values, lValue):
+    """Return the mask of the values containing lValue."""
+    if numpy is not None and isinstance(values, numpy.ndarray):
+        return numpy.char.find(values.astype(str), lValue) >= 0
+    return list(map(operator.contains, values, repeat(lValue, len(values))))
+
+
+def andMasks(masks):
+    if numpy is not None:
+        return numpy.logical_and.reduce(masks)
+    return [all(row) for row in zip(*masks)]
+
+
+def orMasks(masks):
+    if numpy is not None:
+        return numpy.logical_or.reduce(masks)
+    return [any(row) for row in zip(*masks)]
+
+
+def notMask(mask):
+    if numpy is not None:
+        return numpy.logical_not(mask)
+    return [not value for value in mask]
+
+
+class columnsWithTotalCount(dict):
+    """The MoColumns of a query result by wire class name."""
+
+    def __init__(self, *args, **kwargs):
+        super(columnsWithTotalCount, self).__init__(*args, **kwargs)
+        self._totalCount = None
+
+    @property
+    def totalCount(self):
+        if self._totalCount is not None:
+            return self._totalCount
+        else:
+            return sum(len(moColumns) for moColumns in self.values())
+
+    @totalCount.setter
+    def totalCount(self, value):
+        self._totalCount = value
+
+
+def decodeColumns(rows, propNames=None, arrays=False):
+    """Decode the top level objects of a query result into columns.
+
+    Args:
+        rows: iterable of (moClassName, wireProps) tuples, one per top level
+            object, the children of the objects are not decoded
+        propNames (list of str): the props to decode, see MoColumns
+        arrays (bool): convert the columns to arrays once decoded, see
+            MoColumns.convertToArrays
+
+    Returns:
+        columnsWithTotalCount: the MoColumns by wire class name
+    """
+    rowsByClass = {}
+    for moClassName, wireProps in rows:
+        classRows = rowsByClass.get(moClassName)
+        if classRows is None:
+            classRows = rowsByClass[moClassName] = []
+        classRows.append(wireProps)
+
+    result = columnsWithTotalCount()
+    for moClassName, classRows in iteritems(rowsByClass):
+        moColumns = result[moClassName] = MoColumns(moClassName, propNames)
+        moColumns._extend(classRows)
+        if arrays:
+            moColumns.convertToArrays()
+    return result
@@ -16,6 +16,10 @@
 # if sys.version_info[0] == 3:
 from builtins import object
 
+import operator
+
+from ._codec_utils import getDecodePlan, getNumericTypeCode
+
 class Expression(object):
     def __init__(self):
         pass
@@ -23,29 +27,56 @@ class Expression(object):
     def evaluate(self, mo):
         raise NotImplementedError()
 
+    def evaluateColumns(self, moColumns):
+        """Return the mask of the rows of a MoColumns matching the expression."""
+        raise NotImplementedError()
+
+    def compile(self):
+        """Return a function of a Mo returning the same as evaluate, faster.
+
+        The class of the Mo is looked up once and the tests of the
+        sub-expressions on other classes are resolved at compile time.
+        """
+        testsByClass, otherwise = self._compileTests()
+        otherwise = _asFunction(otherwise)
+        getTest = dict((className, _asFunction(test)) for className, test in
+                       testsByClass.items()).get
+
+        def predicate(mo):
+            return getTest(mo.meta.moClassName, otherwise)(mo)
+        return predicate
+
+    def _compileTests(self):
+        """Return the tests of the Mos by class name and the test of the Mos
+        of the other classes.
+
+        A test is either a function of a Mo or the constant True or False.
+        """
+        return {}, self.evaluate
+
 
 def eq(mo, className, propName, lValue):
-    return mo.meta.moClassName == className and getattr(mo, propName, None) == lValue
+    return mo.meta.moClassName == className and _compareProp(mo, propName, operator.eq, lValue)
 
 
 def ne(mo, className, propName, lValue):
-    return mo.meta.moClassName == className and getattr(mo, propName, None) != lValue
+    return mo.meta.moClassName == className and _compareProp(mo, propName, operator.ne, lValue)
 
 
 def gt(mo, className, propName, lValue):
-    return mo.meta.moClassName == className and getattr(mo, propName, None) > lValue
+    return mo.meta.moClassName == className and _compareProp(mo, propName, operator.gt, lValue)
 
 
 def lt(mo, className, propName, lValue):
-    return mo.meta.moClassName == className and getattr(mo, propName, None) < lValue
+    return mo.meta.moClassName == className and _compareProp(mo, propName, operator.lt, lValue)
 
 
 def ge(mo, className, propName, lValue):
-    return mo.meta.moClassName == className and getattr(mo, propName, None) >= lValue
+    return mo.meta.moClassName == className and _compareProp(mo, propName, operator.ge, lValue)
 
 
 def le(mo, className, propName, lValue):
-    return mo.meta.moClassName == className and getattr(mo, propName, None) <= lValue
+    return mo.meta.moClassName == className and _compareProp(mo, propName, operator.le, lValue)
 
 
 def wcard(mo, className, propName, lValue):
@@ -57,6 +88,100 @@ def wcard(mo, className, propName, lValue):
     return False
 
 
+def _compareProp(mo, propName, compare, lValue):
+    pVal = getattr(mo, propName, None)
+    parseValue = getValueParser(mo.meta.moClassName, propName)
+    if parseValue is not None:
+        typedPVal = parseValue(pVal)
+        typedLValue = parseValue(lValue)
+        if typedPVal is not None and typedLValue is not None:
+            return compare(typedPVal, typedLValue)
+    return compare(pVal, lValue)
+
+
+# The value parsers by (class name, prop name), see getValueParser
+_valueParsers = {}
+
+
+def getValueParser(className, propName):
+    """Return the function parsing the values of a prop into what the server
+    compares, None for the props compared as strings.
+
+    The values of the numeric props are compared as numbers and the
+    constants, e.g. of enums, bitmasks or booleans, by their value, so that
+    gt(fvBD.mtu,"900") matches an mtu of 1500. The function returns None for
+    the values it cannot parse, which are compared as strings.
+    """
+    key = (className, propName)
+    try:
+        return _valueParsers[key]
+    except KeyError:
+        pass
+    propMeta = _getPropMeta(className, propName)
+    parseValue = _makeValueParser(propMeta) if propMeta is not None else None
+    _valueParsers[key] = parseValue
+    return parseValue
+
+
+def _getPropMeta(className, propName):
+    try:
+        props = getDecodePlan(className).pyClass.meta.props
+    except (ImportError, AttributeError):
+        return None
+    return props[propName]
+
+
+def _makeValueParser(propMeta):
+    constants = propMeta.constants
+    labelsToConsts = propMeta.labelsToConsts
+    typeCode = getNumericTypeCode(propMeta)
+    if not constants and typeCode is None:
+        return None
+    parseNumber = None if typeCode is None else \
+        float if typeCode == 'd' else int
+    isBitmask = (propMeta.typeClass or '').startswith('scalar:Bitmask')
+
+    def parseConstant(value):
+        constant = constants.get(value)
+        if constant is None and value in labelsToConsts:
+            constant = constants.get(labelsToConsts[value])
+        return None if constant is None else constant.value
+
+    def parseValue(value):
+        if value is None:
+            return None
+        typedValue = parseConstant(value)
+        if typedValue is not None:
+            return typedValue
+        if isBitmask:
+            # The flags of a bitmask are separated by commas
+            bits = 0
+            for flag in value.split(','):
+                flagValue = parseConstant(flag)
+                if flagValue is None:
+                    return None
+                bits |= flagValue
+            return bits
+        if parseNumber is not None:
+            try:
+                return parseNumber(value)
+            except (TypeError, ValueError):
+                return None
+        return None
+    return parseValue
+
+
+# The comparison of the values done by each operator
+_COMPARES = {
+    eq: operator.eq,
+    ne: operator.ne,
+    gt: operator.gt,
+    lt: operator.lt,
+    ge: operator.ge,
+    le: operator.le,
+}
+
+
 class MoPropExpr(Expression):
     def __init__(self, className, propName, lValue, opFunc):
         self.className = className
@@ -67,6 +192,59 @@ class MoPropExpr(Expression):
     def evaluate(self, mo):
         return self.opFunc(mo, self.className, self.propName, self.lValue)
 
+    def evaluateColumns(self, moColumns):
+        # Imported on first use, NumPy is slow to import
+        from ._columns import (constantMask, compareColumn,
+                               compareParsedColumn, isNumeric, wcardColumn)
+        numRows = len(moColumns)
+        if moColumns.moClassName != self.className:
+            return constantMask(False, numRows)
+        if self.propName not in moColumns.meta.props:
+            # Like a Mo, the class does not have the prop, only ne matches
+            return constantMask(self.opFunc is ne, numRows)
+        if self.opFunc is wcard:
+            return wcardColumn(moColumns._propValues(self.propName),
+                               self.lValue)
+        compare = _COMPARES[self.opFunc]
+        parseValue = getValueParser(self.className, self.propName)
+        typedLValue = parseValue(self.lValue) if parseValue is not None \
+            else None
+        column = moColumns.columns.get(self.propName)
+        if typedLValue is not None and column is not None and \
+                isNumeric(column):
+            # The values of a numeric array are parsed already
+            return compareColumn(column, compare, typedLValue)
+        values = moColumns._propValues(self.propName)
+        if typedLValue is None:
+            return compareColumn(values, compare, self.lValue)
+        return compareParsedColumn(values, compare, parseValue, self.lValue,
+                                   typedLValue)
+
+    def _compileTests(self):
+        compare = _COMPARES.get(self.opFunc)
+        if compare is None and self.opFunc is not wcard:
+            return super(MoPropExpr, self)._compileTests()
+        getProp = _propGetter(self.className, self.propName)
+        lValue = self.lValue
+        parseValue = getValueParser(self.className, self.propName)
+        # The literal is parsed once, the values of the Mos on each test
+        typedLValue = parseValue(lValue) if parseValue is not None else None
+        if compare is None:
+            def test(mo):
+                pVal = getProp(mo)
+                return pVal is not None and lValue in pVal
+        elif typedLValue is None:
+            def test(mo):
+                return compare(getProp(mo), lValue)
+        else:
+            def test(mo):
+                pVal = getProp(mo)
+                typedPVal = parseValue(pVal)
+                if typedPVal is None:
+                    return compare(pVal, lValue)
+                return compare(typedPVal, typedLValue)
+        return {self.className: test}, False
+
 
 class CompositeExpression(Expression):
     def __init__(self, eList):
@@ -75,6 +253,16 @@ class CompositeExpression(Expression):
     def evaluate(self, mo):
         raise NotImplementedError()
 
+    def _combineTests(self, combine):
+        compiled = [expression._compileTests()
+                    for expression in self.expressionList]
+        classNames = set().union(*[tests for tests, _ in compiled])
+        testsByClass = dict(
+            (className, combine([tests.get(className, otherwise)
+                                 for tests, otherwise in compiled]))
+            for className in classNames)
+        return testsByClass, combine([otherwise for _, otherwise in compiled])
+
 
 class And(CompositeExpression):
     def __init__(self, eList):
@@ -86,6 +274,14 @@ class And(CompositeExpression):
                 return False
         return True
 
+    def evaluateColumns(self, moColumns):
+        from ._columns import andMasks
+        return andMasks([expression.evaluateColumns(moColumns)
+                         for expression in self.expressionList])
+
+    def _compileTests(self):
+        return self._combineTests(_allTests)
+
 
 class Or(CompositeExpression):
     def __init__(self, eList):
@@ -97,6 +293,14 @@ class Or(CompositeExpression):
                 return True
         return False
 
+    def evaluateColumns(self, moColumns):
+        from ._columns import orMasks
+        return orMasks([expression.evaluateColumns(moColumns)
+                        for expression in self.expressionList])
+
+    def _compileTests(self):
+        return self._combineTests(_anyTests)
+
 
 class Not(Or):
     def __init__(self, eList):
@@ -104,3 +308,72 @@ class Not(Or):
 
     def evaluate(self, mo):
         return not super(Not, self).evaluate(mo)
+
+    def evaluateColumns(self, moColumns):
+        from ._columns import notMask
+        return notMask(super(Not, self).evaluateColumns(moColumns))
+
+    def _compileTests(self):
+        testsByClass, otherwise = super(Not, self)._compileTests()
+        return (dict((className, _notTest(test))
+                     for className, test in testsByClass.items()),
+                _notTest(otherwise))
+
+
+def _propGetter(className, propName):
+    """Return a function reading a prop of the Mos of a class."""
+    if _getPropMeta(className, propName) is not None:
+        return operator.attrgetter(propName)
+    return lambda mo: getattr(mo, propName, None)
+
+
+def _asFunction(test):
+    if test is True or test is False:
+        return lambda mo: test
+    return test
+
+
+def _allTests(tests):
+    if any(test is False for test in tests):
+        return False
+    tests = [test for test in tests if test is not True]
+    if not tests:
+        return True
+    elif len(tests) == 1:
+        return tests[0]
+    elif len(tests) == 2:
+        first, second = tests
+        return lambda mo: first(mo) and second(mo)
+
+    def test(mo):
+        for subTest in tests:
+            if not subTest(mo):
+                return False
+        return True
+    return test
+
+
+def _anyTests(tests):
+    if any(test is True for test in tests):
+        return True
+    tests = [test for test in tests if test is not False]
+    if not tests:
+        return False
+    elif len(tests) == 1:
+        return tests[0]
+    elif len(tests) == 2:
+        first, second = tests
+        return lambda mo: first(mo) or second(mo)
+
+    def test(mo):
+        for subTest in tests:
+            if subTest(mo):
+                return True
+        return False
+    return test
+
+
+def _notTest(test):
+    if test is True or test is False:
+        return not test
+    return lambda mo: not test(mo)
@@ -14,11 +14,15 @@
 
 from builtins import object
 
+import os
+from threading import Lock
+
 import ply.lex as lex
 import ply.yacc as yacc
 
 from ._expr import MoPropExpr, And, Or, Not
 from ._expr import eq, ne, gt, ge, lt, le, wcard
+from ._cache import ParseCache
 
 
 class LexerException(Exception):
@@ -77,13 +81,57 @@ class Lexer(object):
 class Parser(object):
     tokens = Lexer.tokens
 
+    # The parser tables shipped with the package, see writeTables
+    TABLES_MODULE = 'cobra.mit._filter_parsetab'
+
+    PARSE_CACHE_SIZE = 1024
+
     def __init__(self, **kwargs):
         self.lexer = Lexer()
-        self.parser = yacc.yacc(module=self, **kwargs)
+        # Load the shipped tables, they are only generated, in memory, when
+        # they do not match the grammar
+        yaccArgs = dict(tabmodule=Parser.TABLES_MODULE, write_tables=False,
+                        debug=False)
+        yaccArgs.update(kwargs)
+        self.parser = yacc.yacc(module=self, **yaccArgs)
+        self.__parseCache = ParseCache(Parser.PARSE_CACHE_SIZE)
+        self.__lock = Lock()
 
     # get ast from a string expr
     def from_string(self, expressionStr):
-        return self.parser.parse(expressionStr)
+        """Return the expression of a filter string.
+
+        The expressions are cached by filter string and shared, they must
+        not be modified.
+        """
+        expression = self.__parseCache.get(expressionStr)
+        if expression is None:
+            # The PLY parser and lexer keep their state while parsing
+            with self.__lock:
+                expression = self.parser.parse(expressionStr,
+                                               lexer=self.lexer.lexer)
+            self.__parseCache.put(expressionStr, expression)
+        return expression
+
+    def parseCacheInfo(self):
+        """Return the hits, misses, maxSize and currSize of the parse cache."""
+        return self.__parseCache.info()
+
+    def clearParseCache(self):
+        self.__parseCache.clear()
+
+    @classmethod
+    def writeTables(cls):
+        """Write the parser tables next to this module.
+
+        This is meant to be run after changing the grammar, the tables are
+        shipped with the package:
+
+            python -c 'from cobra.mit._filter import Parser; Parser.writeTables()'
+        """
+        outputDir = os.path.dirname(os.path.abspath(__file__))
+        return cls(tabmodule=cls.TABLES_MODULE.rsplit('.', 1)[1],
+                   outputdir=outputDir, write_tables=True)
 
     # Grammar rules
     def p_head_expression(self, p):
@@ -0,0 +1,35 @@
+
+# _filter_parsetab.py
+# This file is automatically generated. Do not edit.
+# pylint: disable=W,C,R
+_tabversion = '3.10'
+
+_lr_method = 'LALR'
+
+_lr_signature = 'CLASS_PROP COMMA COMP LPAREN OP RPAREN VALUEhead_expression : expressionexpression : COMP LPAREN expressions RPARENexpressions : expressions COMMA expressionexpressions : expressionexpression : OP LPAREN CLASS_PROP COMMA VALUE RPAREN'
+    
+_lr_action_items = {'COMP':([0,5,11,],[3,3,3,]),'OP':([0,5,11,],[4,4,4,]),'$end':([1,2,10,15,],[0,-1,-2,-5,]),'LPAREN':([3,4,],[5,6,]),'CLASS_PROP':([6,],[9,]),'RPAREN':([7,8,10,13,14,15,],[10,-4,-2,-3,15,-5,]),'COMMA':([7,8,9,10,13,15,],[11,-4,12,-2,-3,-5,]),'VALUE':([12,],[14,]),}
+
+_lr_action = {}
+for _k, _v in _lr_action_items.items():
+   for _x,_y in zip(_v[0],_v[1]):
+      if not _x in _lr_action:  _lr_action[_x] = {}
+      _lr_action[_x][_k] = _y
+del _lr_action_items
+
+_lr_goto_items = {'head_expression':([0,],[1,]),'expression':([0,5,11,],[2,8,13,]),'expressions':([5,],[7,]),}
+
+_lr_goto = {}
+for _k, _v in _lr_goto_items.items():
+   for _x, _y in zip(_v[0], _v[1]):
+       if not _x in _lr_goto: _lr_goto[_x] = {}
+       _lr_goto[_x][_k] = _y
+del _lr_goto_items
+_lr_productions = [
+  ("S' -> head_expression","S'",1,None,None,None),
+  ('head_expression -> expression','head_expression',1,'p_head_expression','_filter.py',138),
+  ('expression -> COMP LPAREN expressions RPAREN','expression',4,'p_expression','_filter.py',142),
+  ('expressions -> expressions COMMA expression','expressions',3,'p_expressions_list','_filter.py',148),
+  ('expressions -> expression','expressions',1,'p_expressions_one','_filter.py',154),
+  ('expression -> OP LPAREN CLASS_PROP COMMA VALUE RPAREN','expression',6,'p_expression_op','_filter.py',159),
+]
@@ -6,12 +6,176 @@ if sys.version_info[0] == 3:
 from builtins import object
 
 import importlib
+import json
+import os
+import pkgutil
 
 
 class ClassLoader(object):
+    """Load the model classes by fully qualified class name.
+
+    The loaded classes are memoized, and so are the names that failed to load,
+    so hot paths do not go through the import machinery more than once per
+    class. A long running service can warm the cache with :meth:`preload`.
+
+    The model packages are only imported when one of their classes is first
+    loaded. An optional class index maps the wire class names to the modules
+    defining them, so a class can be loaded without deriving its name. The
+    index is not built automatically, neither by the SDK install nor on first
+    use, :meth:`writeClassIndex` has to be run after installing the model.
+    """
+
+    CLASS_INDEX_FILE = '_classindex.json'
+
+    # fqClassName -> class
+    _classes = {}
+    # fqClassName -> error raised when getting it from its module
+    _missing = {}
+    # moClassName -> (moduleName, className), loaded on first use
+    _classIndex = None
+    # Incremented by clearCache, what is derived from the loaded classes is
+    # only valid for the generation it was derived in
+    _generation = 0
+
     @classmethod
     def loadClass(cls, fqClassName):
+        """Load a class by its fully qualified name, e.g. cobra.model.fv.BD.
+
+        The loaded classes are cached, as are the classes that a module that
+        could be imported does not have. A module that cannot be imported is
+        tried again on the next call, it may be installed meanwhile. Call
+        :meth:`clearCache` after upgrading the model in a running process.
+
+        Raises:
+            ImportError: if the module of the class cannot be imported
+            AttributeError: if the module does not have the class
+        """
+        try:
+            return cls._classes[fqClassName]
+        except KeyError:
+            pass
+        error = cls._missing.get(fqClassName)
+        if error is not None:
+            raise error[0](*error[1])
+
         fqClassName = str(fqClassName)
         moduleName, className = fqClassName.rsplit('.', 1)
         module = importlib.import_module(moduleName)
-        return getattr(module, className)
+        try:
+            klass = getattr(module, className)
+        except AttributeError as ex:
+            cls._missing[fqClassName] = (type(ex), ex.args)
+            raise
+        cls._classes[fqClassName] = klass
+        return klass
+
+    @classmethod
+    def loadMoClass(cls, moClassName):
+        """Load a class by its wire class name using the class index.
+
+        Args:
+            moClassName (str): the wire class name, e.g. fvTenant
+
+        Returns:
+            the class, or None if the class index does not know moClassName
+            or its entry is out of date, e.g. after a model upgrade
+        """
+        entry = cls.getClassIndex().get(moClassName)
+        if entry is None:
+            return None
+        moduleName, className = entry
+        try:
+            return cls.loadClass(moduleName + '.' + className)
+        except (ImportError, AttributeError):
+            # The index is only a cache, the caller derives the class name
+            return None
+
+    @classmethod
+    def getClassIndex(cls):
+        """Return the class index of the installed model, empty if none."""
+        if cls._classIndex is None:
+            classIndex = {}
+            try:
+                with open(cls.__classIndexPath()) as indexFile:
+                    for moClassName, entry in json.load(indexFile).items():
+                        classIndex[moClassName] = tuple(entry)
+            except (ImportError, IOError, ValueError):
+                pass
+            cls._classIndex = classIndex
+        return cls._classIndex
+
+    @classmethod
+    def writeClassIndex(cls, path=None):
+        """Write the class index of all the installed model packages.
+
+        This imports the whole model, it is meant to be run by hand after the
+        model has been installed or upgraded::
+
+            python -c 'from cobra.mit.meta import ClassLoader; ClassLoader.writeClassIndex()'
+
+        Args:
+            path (str): the index file, defaults to the one read by
+                :meth:`getClassIndex`
+
+        Returns:
+            int: the number of classes in the index
+        """
+        modelPackage = importlib.import_module('cobra.model')
+        classIndex = {}
+        for _, package, _ in pkgutil.iter_modules(modelPackage.__path__):
+            module = importlib.import_module('cobra.model.' + package)
+            for name, value in list(vars(module).items()):
+                meta = getattr(value, 'meta', None)
+                if isinstance(value, type) and meta is not None:
+                    # The module defining the class, which may not be the
+                    # package re-exporting it
+                    classIndex[meta.moClassName] = (value.__module__,
+                                                    value.__name__)
+        if path is None:
+            path = cls.__classIndexPath()
+        with open(path, 'w') as indexFile:
+            json.dump(classIndex, indexFile, sort_keys=True)
+        cls._classIndex = classIndex
+        return len(classIndex)
+
+    @classmethod
+    def __classIndexPath(cls):
+        modelPackage = importlib.import_module('cobra.model')
+        return os.path.join(os.path.dirname(modelPackage.__file__),
+                            cls.CLASS_INDEX_FILE)
+
+    @classmethod
+    def preload(cls, packages):
+        """Import model packages and cache all the classes they contain.
+
+        Args:
+            packages (list of str): the packages to load, either fully
+                qualified (cobra.model.fv) or relative to cobra.model (fv)
+
+        Returns:
+            int: the number of classes loaded
+        """
+        numClasses = 0
+        for package in packages:
+            if not package.startswith('cobra.model'):
+                package = 'cobra.model.' + package
+            module = importlib.import_module(package)
+            for name, value in list(vars(module).items()):
+                if isinstance(value, type) and hasattr(value, 'meta'):
+                    fqClassName = package + '.' + name
+                    cls._classes[fqClassName] = value
+                    cls._missing.pop(fqClassName, None)
+                    numClasses += 1
+        return numClasses
+
+    @classmethod
+    def clearCache(cls):
+        """Forget all the loaded and missing classes and the class index.
+
+        The decode plans of the codecs, which refer to the loaded classes,
+        are rebuilt on their next use.
+        """
+        cls._classes.clear()
+        cls._missing.clear()
+        cls._classIndex = None
+        cls._generation += 1
@@ -0,0 +1,77 @@
+# Copyright 2019 Cisco Systems, Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""The queries of the short-form lookups shared by the MoDirectories, and
+the sort order of the paged queries."""
+
+from cobra.mit.request import DnQuery, ClassQuery
+
+
+def setQueryParams(query, queryParams):
+    """Utility function to set the query parameters.
+
+    Utility function used to set in the 'query' passed as
+    argument, the 'queryParams' dictionary. The key in the
+    dictionary will be used as the property name to set, with
+    the value content.
+
+    Args:
+      query: query class to be modified
+      queryParams: a dictionary including the properties to the
+        added to the query.
+    """
+    for param, value in list(queryParams.items()):
+        if value is not None:
+            setattr(query, param, value)
+
+
+def makeDnQuery(dnStrOrDn, queryParams):
+    query = DnQuery(dnStrOrDn)
+    setQueryParams(query, queryParams)
+    return query
+
+
+def makeClassQuery(classNames, parentDn, queryParams):
+    if parentDn:
+        query = DnQuery(parentDn)
+        query.classFilter = classNames
+        query.queryTarget = 'subtree'
+    else:
+        query = ClassQuery(classNames)
+    setQueryParams(query, queryParams)
+    return query
+
+
+def setPageOrder(query):
+    """Sort a paged query by dn, unless the query has its own orderBy.
+
+    Without a sort key the server returns the objects in no stable order
+    across the pages, an object can be returned on two pages or on none.
+    Only the queries of known classes, class queries and queries with a
+    classFilter, can be sorted.
+    """
+    if query.orderBy is not None:
+        return
+    if isinstance(query, ClassQuery):
+        classNames = query.className
+    else:
+        classNames = query.classFilter
+    if classNames:
+        query.orderBy = ['{0}.dn'.format(className)
+                         for className in classNames.split(',')]
+
+
+def isPresent(countMo):
+    """Return True if the count returned by an exists lookup is positive."""
+    return countMo is not None and int(countMo.count) > 0
@@ -17,15 +17,11 @@ if sys.version_info[0] == 3:
     from builtins import str
 from builtins import object
 
-import importlib
 from .naming import Dn
 from .request import DnQuery, ClassQuery
+from ._loader import ClassLoader
 from ._query import DnQueryProc, ClassQueryProc
 
-# Load the top root class dynamically from the cobra model runtime
-topRoot = importlib.import_module('cobra.model.top')
-topRoot = getattr(topRoot, 'Root')
-
 
 class Mit(object):
     """
@@ -38,6 +34,8 @@ class Mit(object):
     }
 
     def __init__(self):
+        # The top root class is loaded from the cobra model runtime on demand
+        topRoot = ClassLoader.loadClass('cobra.model.top.Root')
         self.__rootMo = topRoot(Dn())
         self.__classIndex = dict()
         self.__dnIndex = dict()
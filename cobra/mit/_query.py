@@ -16,21 +16,24 @@
 # if sys.version_info[0] == 3:
 from builtins import object
 
-import importlib
-
 
 class QueryProc(object):
+    # The filter parser is imported on first use, to keep PLY out of the
+    # startup, and then shared by all the procs
+    _filterParser = None
+
     def __init__(self, query):
         self._query = query
-        self._filterParser = self.__makeFilterParser()
+        if QueryProc._filterParser is None:
+            QueryProc._filterParser = self.__makeFilterParser()
 
     def process(self, mit, moList):
         raise NotImplementedError()
 
     @staticmethod
     def __makeFilterParser():
-        filterMod = importlib.import_module('cobra.mit._filter')
-        return getattr(filterMod, 'filterParser')
+        from ._filter import filterParser
+        return filterParser
 
 
 class QueryTargetProc(QueryProc):
@@ -44,7 +47,7 @@ class QueryTargetProc(QueryProc):
         }
         classes = query.classFilter
         self.__queryClassList = classes.split(',') if classes is not None else []
-        self.__propFilter = self._filterParser.from_string(query.propFilter) if query.propFilter is not None else None
+        self.__propFilter = self._filterParser.from_string(query.propFilter).compile() if query.propFilter is not None else None
         self.__respProc = ResponseQueryProc(self._query)
 
     def process(self, mit, moList):
@@ -79,7 +82,7 @@ class QueryTargetProc(QueryProc):
     def __doRespProcess(self, mo):
         mos = []
         if not self.__queryClassList or mo.isInstance(self.__queryClassList):
-            if self.__propFilter is None or self.__propFilter.evaluate(mo):
+            if self.__propFilter is None or self.__propFilter(mo):
                 if not mo.status.deleted:
                     mos = self.__respProc.process(None, [mo])
         return mos
@@ -90,7 +93,7 @@ class ResponseQueryProc(QueryProc):
         super(ResponseQueryProc, self).__init__(query)
         classes = query.subtreeClassFilter
         self.__queryClassList = classes.split(',') if classes is not None else []
-        self.__propFilter = self._filterParser.from_string(query.subtreePropFilter) if query.subtreePropFilter is not None else None
+        self.__propFilter = self._filterParser.from_string(query.subtreePropFilter).compile() if query.subtreePropFilter is not None else None
         self.__procTable = {
             None: self.selfProc,
             'no': self.selfProc,
@@ -147,7 +150,7 @@ class ResponseQueryProc(QueryProc):
 
     def __filterMo(self, mo):
         if not self.__queryClassList or mo.isInstance(self.__queryClassList):
-            if self.__propFilter is None or self.__propFilter.evaluate(mo):
+            if self.__propFilter is None or self.__propFilter(mo):
                 return not mo.status.deleted
         return False
 
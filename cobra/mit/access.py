@@ -20,10 +20,26 @@ interface by which requests are made.
 
 from builtins import object
 
+import copy
+from multiprocessing.pool import ThreadPool
+from time import time
+
+from cobra.mit.naming import Dn
 from cobra.mit.request import DnQuery, ClassQuery, CommitError
+from cobra.mit._lookup import (setQueryParams, makeDnQuery, makeClassQuery,
+                               setPageOrder, isPresent)
 from cobra.internal.rest.accessimpl import RestAccess
 
 
+class setWithQueryCost(set):
+    """A set carrying the cost of the queries that were run to build it."""
+
+    def __init__(self, *args, **kwargs):
+        super(setWithQueryCost, self).__init__(*args, **kwargs)
+        self.requestCount = 0
+        self.elapsedTime = 0.0
+
+
 class MoDirectory(object):
 
     """
@@ -31,6 +47,16 @@ class MoDirectory(object):
     MoDirectory requires an existing session and endpoint.
     """
 
+    # Number of managed objects (MOs) requested per page by the paged queries
+    DEFAULT_PAGE_SIZE = 1000
+
+    # Number of queries run concurrently by the bulk lookups
+    DEFAULT_QUERY_WORKERS = 8
+
+    # Maximum number of dns OR-ed together in the filter of one bulk query,
+    # this keeps the query URLs to a reasonable length
+    MAX_DNS_PER_QUERY = 64
+
     def __init__(self, session):
         """
         Arguments:
@@ -61,12 +87,151 @@ class MoDirectory(object):
         """
         self._accessImpl.refreshSession()
 
-    def query(self, queryObject):
+    def query(self, queryObject, compact=False, frozen=False):
         """
         Queries the MIT for a specified object. The queryObject provides a
         variety of search options.
+
+        Args:
+          queryObject (cobra.mit.request.AbstractQuery): The query.
+          compact (bool, optional): Decode the MOs with a compact layout that
+            takes about a quarter less memory, meant for read-only results. The
+            MOs are instances of the queried classes, their clones are
+            regular MOs. The default is False.
+          frozen (bool, optional): Decode read-only MOs, which are faster to
+            read and smaller than regular MOs. Setting a property raises a
+            ValueError, use thaw() to get a mutable copy before changing and
+            committing them. Takes precedence over compact. The default is
+            False.
+        """
+        return self._accessImpl.get(queryObject, compact, frozen)
+
+    def queryStream(self, queryObject, compact=False, frozen=False):
+        """
+        Queries the MIT for a specified object, the managed objects (MOs) are
+        decoded one at a time while the response is being downloaded, so that
+        memory use does not grow with the size of the response.
+
+        Args:
+          queryObject (cobra.mit.request.AbstractQuery): The query.
+          compact (bool, optional): Decode the MOs with the compact layout,
+            see query. The default is False.
+          frozen (bool, optional): Decode read-only MOs, see query. The
+            default is False.
+
+        Returns:
+          iterator: The MOs, the iterator has a totalCount attribute.
+        """
+        return self._accessImpl.getStream(queryObject, compact, frozen)
+
+    def queryColumns(self, queryObject, propNames=None, arrays=False):
+        """
+        Queries the MIT and decodes the result into columns instead of
+        managed objects (MOs), for analytics over large class queries.
+
+        Every property received for the top level objects of a class becomes
+        a column holding one value per object, along with a column of their
+        Dns, so the propInclude option of the query selects the columns.
+        Children are not decoded. Use MoColumns.getMo to create the MO of a
+        row.
+
+        Args:
+          queryObject (cobra.mit.request.AbstractQuery): The query.
+          propNames (list of str, optional): The properties to decode, all
+            the properties received by default. The naming properties are
+            always decoded.
+          arrays (bool, optional): Convert the columns to arrays, NumPy
+            arrays if NumPy is installed, see MoColumns.convertToArrays. The
+            default is False.
+
+        Returns:
+          dict: The MoColumns of each class by class name, e.g. fvCEp, the
+            dict has a totalCount attribute.
+        """
+        return self._accessImpl.getColumns(queryObject, propNames, arrays)
+
+    def iterQuery(self, queryObject, pageSize=None, prefetch=False):
+        """Query the MIT page by page and yield the managed objects (MOs).
+
+        The `pageSize` and `page` options of copies of the queryObject are
+        driven by this method: the first page is requested and its totalCount
+        is used to determine how many more pages have to be fetched. Only the
+        page being consumed is kept in memory, plus the next one when
+        prefetching.
+
+        The pages are only consistent if the objects are sorted, the copies
+        are ordered by dn when the queryObject has no `orderBy` of its own.
+        A DnQuery without a `classFilter` cannot be ordered by dn, the caller
+        must set its `orderBy`.
+
+        Args:
+          queryObject (cobra.mit.request.AbstractQuery): The query to page
+            through, it is not modified.
+          pageSize (int, optional): The number of MOs requested per page. The
+            default is `DEFAULT_PAGE_SIZE`.
+          prefetch (bool, optional): If True the next page is fetched in a
+            background thread while the current page is being consumed.
+
+        Yields:
+          cobra.mit.mo.Mo: The MOs matching the query, in page order.
+        """
+        pageSize = pageSize if pageSize else self.DEFAULT_PAGE_SIZE
+        queryObject = copy.deepcopy(queryObject)
+        queryObject.pageSize = pageSize
+        setPageOrder(queryObject)
+        page = 0
+        mos = self.__queryPage(queryObject, page)
+        numPages = (mos.totalCount + pageSize - 1) // pageSize
+        pool = ThreadPool(1) if prefetch and numPages > 1 else None
+        try:
+            while mos:
+                page += 1
+                pending = None
+                if pool is not None and page < numPages:
+                    pending = pool.apply_async(self.__queryPage,
+                                               (queryObject, page))
+                for mo in mos:
+                    yield mo
+                if page >= numPages:
+                    break
+                if pending is not None:
+                    mos = pending.get()
+                else:
+                    mos = self.__queryPage(queryObject, page)
+        finally:
+            if pool is not None:
+                pool.terminate()
+
+    def queryPaged(self, queryObject, pageSize=None, maxWorkers=None,
+                   cacheId=None):
+        """Query the MIT fetching the pages of the result concurrently.
+
+        Once the first page returns the totalCount of the query, the remaining
+        pages are fetched in parallel and merged in page order. The pages are
+        ordered like those of `iterQuery`.
+
+        Args:
+          queryObject (cobra.mit.request.AbstractQuery): The query to run.
+          pageSize (int, optional): The number of MOs requested per page. The
+            default is `DEFAULT_PAGE_SIZE`.
+          maxWorkers (int, optional): The maximum number of pages fetched
+            concurrently.
+          cacheId (int, optional): A cache-session id pinned on every page so
+            that all the pages come from a consistent snapshot.
+
+        Returns:
+          list: The MOs of all the pages, with the totalCount of the query.
         """
-        return self._accessImpl.get(queryObject)
+        pageSize = pageSize if pageSize else self.DEFAULT_PAGE_SIZE
+        return self._accessImpl.getPaged(queryObject, pageSize,
+                                         maxWorkers=maxWorkers,
+                                         cacheId=cacheId)
+
+    def __queryPage(self, queryObject, page):
+        # Each page has its own copy, the next one may be prefetched
+        pageQuery = copy.deepcopy(queryObject)
+        pageQuery.page = page
+        return self.query(pageQuery)
 
     def commit(self, configObject, sync_wait_timeout=None):
         """
@@ -89,11 +254,45 @@ class MoDirectory(object):
           queryParams: a dictionary including the properties to the
             added to the query.
         """
-        dnQuery = DnQuery(dnStrOrDn)
-        self.__setQueryParams(dnQuery, queryParams)
-        mos = self.query(dnQuery)
+        mos = self.query(makeDnQuery(dnStrOrDn, queryParams))
         return mos[0] if mos else None
 
+    def lookupByDns(self, dnStrsOrDns, maxWorkers=None, **queryParams):
+        """Lookup many managed objects (MOs) by dn with a few queries.
+
+        The dns are grouped by class, each group is looked up by a single
+        query filtering on the dn property and scoped to the common parent of
+        the group. Dns that do not share their class with any other dn are
+        looked up individually. The queries are run concurrently.
+
+        Args:
+          dnStrsOrDns (list): The distinguished names to lookup as
+            :class:`cobra.mit.naming.Dn` or strings.
+          maxWorkers (int, optional): The maximum number of queries run
+            concurrently. The default is `DEFAULT_QUERY_WORKERS`.
+          queryParams: a dictionary including the properties to the
+            added to the queries. A propFilter is combined with the filter
+            on the dns, queryTarget and classFilter cannot be set.
+
+        Returns:
+          dict: The MO of each requested :class:`cobra.mit.naming.Dn`, or None
+            if the MO does not exist.
+
+        Raises:
+          ValueError: If queryTarget or classFilter is given.
+        """
+        for param in ('queryTarget', 'classFilter'):
+            if queryParams.get(param) is not None:
+                raise ValueError('"%s" cannot be set, the queries are scoped '
+                                 'by the dns they look up' % param)
+        foundMos = dict((dn, None) for dn in self.__toDns(dnStrsOrDns))
+        queries = self.__makeBulkQueries(list(foundMos.keys()), queryParams)
+        for _, mos in self.__queryMany(queries, maxWorkers):
+            for mo in mos:
+                if mo.dn in foundMos:
+                    foundMos[mo.dn] = mo
+        return foundMos
+
     def lookupByClass(self, classNames, parentDn=None, **queryParams):
         """
         A short-form managed object (MO) query by class.
@@ -104,17 +303,23 @@ class MoDirectory(object):
           queryParams: a dictionary including the properties to the
             added to the query.
         """
-        if parentDn:
-            dnQuery = DnQuery(parentDn)
-            dnQuery.classFilter = classNames
-            dnQuery.queryTarget = 'subtree'
-            self.__setQueryParams(dnQuery, queryParams)
-            mos = self.query(dnQuery)
-        else:
-            classQuery = ClassQuery(classNames)
-            self.__setQueryParams(classQuery, queryParams)
-            mos = self.query(classQuery)
-        return mos
+        return self.query(makeClassQuery(classNames, parentDn, queryParams))
+
+    def iterLookupByClass(self, classNames, parentDn=None, pageSize=None,
+                          prefetch=False, **queryParams):
+        """
+        A paged managed object (MO) query by class, see `iterQuery`.
+
+        Args:
+          classNames: Name of the class to lookup
+          parentDn:   dn of the root object were to start search from (optional)
+          pageSize:   number of MOs requested per page (optional)
+          prefetch:   fetch the next page while the current one is consumed
+          queryParams: a dictionary including the properties to the
+            added to the query.
+        """
+        query = makeClassQuery(classNames, parentDn, queryParams)
+        return self.iterQuery(query, pageSize=pageSize, prefetch=prefetch)
 
     def exists(self, dnStrOrDn):
         """Checks if managed object (MO) with given distinguished name (dn) is present or not
@@ -126,23 +331,102 @@ class MoDirectory(object):
         Returns:
           bool: True, if MO is present, else False.
         """
-        mo = self.lookupByDn(dnStrOrDn, subtreeInclude='count')
-        return mo is not None and int(mo.count) > 0
+        return isPresent(self.lookupByDn(dnStrOrDn, subtreeInclude='count'))
+
+    def __queryMany(self, queries, maxWorkers):
+        """Run the queries concurrently and yield (query, result) tuples in
+        the order they complete."""
+        if len(queries) <= 1:
+            for query in queries:
+                yield query, self.query(query)
+            return
+        maxWorkers = maxWorkers if maxWorkers else self.DEFAULT_QUERY_WORKERS
+        pool = ThreadPool(min(maxWorkers, len(queries)))
+        try:
+            for result in pool.imap_unordered(self.__queryWithQuery, queries):
+                yield result
+        finally:
+            pool.terminate()
+
+    def __queryWithQuery(self, query):
+        return query, self.query(query)
 
     @staticmethod
-    def __setQueryParams(query, queryParams):
-        """Utility function to set the query parameters.
+    def __toDns(dnStrsOrDns):
+        return [dn if isinstance(dn, Dn) else Dn.fromString(str(dn))
+                for dn in dnStrsOrDns]
 
-        Utility function used to set in the 'query' passed as
-        argument, the 'queryParams' dictionary. The key in the
-        dictionary will be used as the property name to set, with
-        the value content.
+    @classmethod
+    def __makeBulkQueries(cls, dns, queryParams, singleQueryParams=None):
+        """Make the queries looking up the given dns, grouped by class.
+
+        The singleQueryParams, when given, replace the queryParams for the
+        dns that are looked up individually.
+        """
+        if singleQueryParams is None:
+            singleQueryParams = queryParams
+        dnsByClass = {}
+        for dn in dns:
+            dnsByClass.setdefault(dn.meta.moClassName, []).append(dn)
+
+        queries = []
+        for className, classDns in sorted(dnsByClass.items()):
+            for start in range(0, len(classDns), cls.MAX_DNS_PER_QUERY):
+                batch = classDns[start:start + cls.MAX_DNS_PER_QUERY]
+                if len(batch) == 1:
+                    # Nothing to group, a plain lookup is the cheapest
+                    queries.append(makeDnQuery(batch[0], singleQueryParams))
+                    continue
+
+                parentDn = Dn.findCommonParent(batch)
+                if parentDn.isRoot:
+                    query = ClassQuery(className)
+                else:
+                    query = DnQuery(parentDn)
+                    query.classFilter = className
+                    query.queryTarget = 'subtree'
+                setQueryParams(query, queryParams)
+                dnFilter = 'or({0})'.format(','.join(
+                    'eq({0}.dn,"{1}")'.format(className, str(dn))
+                    for dn in batch))
+                propFilter = queryParams.get('propFilter')
+                if propFilter is not None:
+                    # Keep the caller's filter, like the single lookups do
+                    dnFilter = 'and({0},{1})'.format(propFilter, dnFilter)
+                query.propFilter = dnFilter
+                queries.append(query)
+        return queries
+
+    def existsMany(self, dnStrsOrDns, maxWorkers=None):
+        """Checks which of the given distinguished names (dns) are present
+
+        The dns are checked with the batched queries of `lookupByDns`, the
+        batches only request the naming properties of the managed objects and
+        the dns checked individually only request a count, like `exists`.
 
         Args:
-          query: query class to be modified
-          queryParams: a dictionary including the properties to the
-            added to the query.
+          dnStrsOrDns (list): The distinguished names to check as
+            :class:`cobra.mit.naming.Dn` or strings.
+          maxWorkers (int, optional): The maximum number of queries run
+            concurrently. The default is `DEFAULT_QUERY_WORKERS`.
+
+        Returns:
+          setWithQueryCost: The :class:`cobra.mit.naming.Dn` of the managed
+            objects that are present. Its `requestCount` and `elapsedTime`
+            attributes report the number of queries run and the time spent.
         """
-        for param, value in list(queryParams.items()):
-            if value is not None:
-                setattr(query, param, value)
+        startTime = time()
+        dns = set(self.__toDns(dnStrsOrDns))
+        queries = self.__makeBulkQueries(list(dns),
+                                         {'propInclude': 'naming-only'},
+                                         {'subtreeInclude': 'count'})
+        presentDns = setWithQueryCost()
+        for query, mos in self.__queryMany(queries, maxWorkers):
+            if query.subtreeInclude == 'count':
+                if mos and isPresent(mos[0]):
+                    presentDns.add(Dn.fromString(query.dnStr))
+                continue
+            presentDns.update(mo.dn for mo in mos if mo.dn in dns)
+        presentDns.requestCount = len(queries)
+        presentDns.elapsedTime = time() - startTime
+        return presentDns
@@ -0,0 +1,139 @@
+# Copyright 2019 Cisco Systems, Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""The asyncio Access module for the ACI Python SDK (cobra).
+
+This module is the asyncio counterpart of :mod:`cobra.mit.access`, it requires
+Python 3.7 or later and the aiohttp package (``pip install acicobra[async]``).
+"""
+
+from cobra.mit._lookup import makeDnQuery, makeClassQuery, isPresent
+from cobra.internal.rest.asyncaccessimpl import AsyncRestAccess
+
+
+class AsyncMoDirectory(object):
+
+    """
+    The AsyncMoDirectory class creates a connection to the APIC and the MIT
+    whose operations are coroutines. Any number of queries can be in flight
+    concurrently on a single event loop, they share one connection pool.
+    AsyncMoDirectory requires an existing session and endpoint.
+
+    The directory can be used as an asynchronous context manager to release
+    its connections::
+
+        async with AsyncMoDirectory(session) as moDir:
+            await moDir.login()
+            tenants = await moDir.lookupByClass('fvTenant')
+    """
+
+    def __init__(self, session):
+        """
+        Arguments:
+            session: Specifies a session
+        """
+        self._accessImpl = AsyncRestAccess(session)
+        self.session = session
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, excType, excValue, traceback):
+        await self.close()
+
+    async def close(self):
+        """
+        Closes the connections to the APIC.
+        """
+        await self._accessImpl.close()
+
+    async def login(self):
+        """
+        Creates a session to an APIC.
+        """
+        await self._accessImpl.login()
+
+    async def logout(self):
+        """
+        Ends a session to an APIC.
+        """
+        await self._accessImpl.logout()
+
+    async def reauth(self):
+        """
+        Re-authenticate this session with the current authentication cookie.
+        """
+        await self._accessImpl.refreshSession()
+
+    async def query(self, queryObject, compact=False, frozen=False):
+        """
+        Queries the MIT for a specified object. The queryObject provides a
+        variety of search options. With compact the MOs are decoded with the
+        compact layout and with frozen they are read-only, see
+        MoDirectory.query.
+        """
+        return await self._accessImpl.get(queryObject, compact, frozen)
+
+    async def queryColumns(self, queryObject, propNames=None, arrays=False):
+        """
+        Queries the MIT and decodes the result into columns instead of MOs,
+        see MoDirectory.queryColumns.
+        """
+        return await self._accessImpl.getColumns(queryObject, propNames,
+                                                 arrays)
+
+    async def commit(self, configObject):
+        """
+        Short-form commit operation for a configRequest
+        """
+        return await self._accessImpl.post(configObject)
+
+    async def lookupByDn(self, dnStrOrDn, **queryParams):
+        """
+        A short-form managed object (MO) query using the distinguished name(Dn)
+        of the MO.
+
+        Args:
+          dnStrOrDn:   dn of the object to lookup
+          queryParams: a dictionary including the properties to the
+            added to the query.
+        """
+        mos = await self.query(makeDnQuery(dnStrOrDn, queryParams))
+        return mos[0] if mos else None
+
+    async def lookupByClass(self, classNames, parentDn=None, **queryParams):
+        """
+        A short-form managed object (MO) query by class.
+
+        Args:
+          classNames: Name of the class to lookup
+          parentDn:   dn of the root object were to start search from (optional)
+          queryParams: a dictionary including the properties to the
+            added to the query.
+        """
+        return await self.query(makeClassQuery(classNames, parentDn,
+                                               queryParams))
+
+    async def exists(self, dnStrOrDn):
+        """Checks if managed object (MO) with given distinguished name (dn) is present or not
+
+        Args:
+          dnStrOrDn (str or cobra.mit.naming.Dn): A distinguished name as a
+            :class:`cobra.mit.naming.Dn` or string
+
+        Returns:
+          bool: True, if MO is present, else False.
+        """
+        return isPresent(await self.lookupByDn(dnStrOrDn,
+                                               subtreeInclude='count'))
@@ -15,10 +15,12 @@
 import sys
 if sys.version_info[0] == 3:
     from builtins import str
+from builtins import object
 
+import codecs
 import json
-from ._loader import ClassLoader
-from ._codec_utils import parseMoClassName, getParentDn, listWithTotalCount
+import re
+from ._codec_utils import getDecodePlan, getParentDn, listWithTotalCount
 
 
 def parseJSONError(rspText, errorClass, httpCode=None):
@@ -38,13 +40,13 @@ def parseJSONError(rspText, errorClass, httpCode=None):
         raise ValueError(rspText)
 
 
-def fromJSONStr(jsonStr, tree_only=False):
+def fromJSONStr(jsonStr, tree_only=False, compact=False, frozen=False):
     # Remove the children and add it from the fetch data set
     moDict = json.loads(jsonStr)
-    return fromJSONDict(moDict) if not tree_only else moDict
+    return fromJSONDict(moDict, compact, frozen) if not tree_only else moDict
 
 
-def fromJSONDict(moDict):
+def fromJSONDict(moDict, compact=False, frozen=False):
     rootNode = moDict["imdata"]
 
     allMos = listWithTotalCount()
@@ -52,43 +54,203 @@ def fromJSONDict(moDict):
     for moNode in rootNode:
         className = list(moNode.keys())[0]
         moData = moNode[className]
-        mo = _createMo(className, moData, None)
+        mo = _createMo(className, moData, None, compact, frozen)
         allMos.append(mo)
     return allMos
 
 
-def _createMo(moClassName, moData, parentMo):
-    pkgName, className = parseMoClassName(moClassName)
-    fqClassName = "cobra.model." + pkgName + "." + className
-    pyClass = ClassLoader.loadClass(fqClassName)
+def fromJSONColumns(jsonStr, propNames=None, arrays=False):
+    """Decode the top level objects of a JSON response into columns
+
+    Args:
+        jsonStr (str): the response
+        propNames (list of str): the props to decode, all when None
+        arrays (bool): convert the columns to arrays
+    Returns:
+        columnsWithTotalCount: the MoColumns of each class
+    """
+    # Imported on first use, NumPy is slow to import
+    from ._columns import decodeColumns
+    moDict = json.loads(jsonStr)
+    rows = []
+    for moNode in moDict["imdata"]:
+        className = list(moNode.keys())[0]
+        rows.append((className, moNode[className]['attributes']))
+    result = decodeColumns(rows, propNames, arrays)
+    result.totalCount = int(moDict["totalCount"])
+    return result
+
+
+class JSONStreamDecoder(object):
+    """Incrementally decode the imdata of a JSON response into Mos.
+
+    The response is consumed chunk by chunk and every top-level imdata element
+    is turned into a Mo as soon as its closing brace is read, so memory scales
+    with the largest element instead of the whole response. The totalCount of
+    the response is available once the iteration has started.
+    """
+
+    CHUNK_SIZE = 65536
+
+    # Characters that matter when scanning outside and inside of a string
+    __OUTSIDE_STR = re.compile(r'[{}\[\]"]')
+    __INSIDE_STR = re.compile(r'["\\]')
+    __BETWEEN_ELEMENTS = re.compile(r'[\s,]*')
+    __IMDATA = re.compile(r'"imdata"\s*:\s*\[')
+    __TOTAL_COUNT = re.compile(r'"totalCount"\s*:\s*"?(\d+)')
+
+    def __init__(self, jsonStream, chunkSize=CHUNK_SIZE, compact=False,
+                 frozen=False):
+        """
+        Args:
+            jsonStream: a file like object with a read method or an iterable
+                of bytes or str chunks such as requests' iter_content
+            chunkSize (int): number of bytes read at once from a file object
+            compact (bool): decode the Mos with the compact layout
+            frozen (bool): decode read-only Mos
+        """
+        self.totalCount = None
+        self.__compact = compact
+        self.__frozen = frozen
+        self.__chunks = self.__iterTextChunks(jsonStream, chunkSize)
+        self.__mos = self.__iterMos()
+
+    def __iter__(self):
+        return self
+
+    def __next__(self):
+        return next(self.__mos)
+
+    def __iterMos(self):
+        for elementStr in self.__iterElements():
+            moNode = json.loads(elementStr)
+            className = list(moNode.keys())[0]
+            yield _createMo(className, moNode[className], None,
+                            self.__compact, self.__frozen)
+
+    @staticmethod
+    def __iterTextChunks(jsonStream, chunkSize):
+        if hasattr(jsonStream, 'read'):
+            read = jsonStream.read
+            jsonStream = iter(lambda: read(chunkSize) or None, None)
+        decoder = codecs.getincrementaldecoder('utf-8')()
+        for chunk in jsonStream:
+            if isinstance(chunk, bytes):
+                chunk = decoder.decode(chunk)
+            if chunk:
+                yield chunk
+
+    def __setTotalCount(self, text):
+        match = self.__TOTAL_COUNT.search(text)
+        if match and self.totalCount is None:
+            self.totalCount = int(match.group(1))
+
+    def __iterElements(self):
+        """Yield the string of every top-level imdata element."""
+        head = ''
+        for chunk in self.__chunks:
+            head += chunk
+            match = self.__IMDATA.search(head)
+            if match:
+                break
+        else:
+            raise ValueError('No imdata found in the response')
+        self.__setTotalCount(head[:match.start()])
+
+        buf = head[match.end():]
+        pos = 0
+        pieces = []
+        elementStart = None
+        depth = 0
+        inString = False
+        while True:
+            while pos < len(buf):
+                if depth == 0:
+                    pos = self.__BETWEEN_ELEMENTS.match(buf, pos).end()
+                    if pos == len(buf):
+                        break
+                    if buf[pos] == ']':
+                        self.__readTail(buf[pos + 1:])
+                        return
+                    elementStart = pos
+                if inString:
+                    match = self.__INSIDE_STR.search(buf, pos)
+                    if match is None:
+                        pos = len(buf)
+                    elif match.group() == '\\':
+                        # Skip the escaped character, it may be in the next
+                        # chunk
+                        pos = match.end() + 1
+                    else:
+                        inString = False
+                        pos = match.end()
+                    continue
+                match = self.__OUTSIDE_STR.search(buf, pos)
+                if match is None:
+                    pos = len(buf)
+                    continue
+                pos = match.end()
+                symbol = match.group()
+                if symbol == '"':
+                    inString = True
+                elif symbol in '{[':
+                    depth += 1
+                else:
+                    depth -= 1
+                    if depth == 0:
+                        pieces.append(buf[elementStart:pos])
+                        yield ''.join(pieces)
+                        pieces = []
+                        elementStart = None
+
+            if elementStart is not None:
+                pieces.append(buf[elementStart:])
+                elementStart = 0
+            nextBuf = next(self.__chunks, None)
+            if nextBuf is None:
+                raise ValueError('Truncated JSON response')
+            pos -= len(buf)
+            buf = nextBuf
+
+    def __readTail(self, tail):
+        if self.totalCount is None:
+            self.__setTotalCount(tail + ''.join(self.__chunks))
+
+
+def fromJSONStream(jsonStream, chunkSize=JSONStreamDecoder.CHUNK_SIZE,
+                   compact=False, frozen=False):
+    """Return an iterator of the Mos in a JSON response read incrementally
+
+    Args:
+        jsonStream: a file like object or an iterable of bytes or str chunks
+        chunkSize (int): number of bytes read at once from a file object
+        compact (bool): decode the Mos with the compact layout
+        frozen (bool): decode read-only Mos
+    Returns:
+        JSONStreamDecoder: iterator of the Mos with a totalCount attribute
+    """
+    return JSONStreamDecoder(jsonStream, chunkSize, compact, frozen)
+
+
+def _createMo(moClassName, moData, parentMo, compact=False, frozen=False):
+    plan = getDecodePlan(moClassName)
     parentDnStr = None
     moProps = moData['attributes']
     if 'dn' in moProps:
         parentDnStr = getParentDn(moProps['dn'])
-        del moProps['dn']
-    if 'rn' in moProps:
-        del moProps['rn']
-    if 'instanceId' in moProps:
-        del moProps['instanceId']
-    if 'status' in moProps:
-        del moProps['status']
-
-    namingVals = []
-    for propMeta in pyClass.meta.namingProps:
-        propName = propMeta.moPropName
-        namingVals.append(moProps[propName])
-        del moProps[propName]
-
-    parentMoOrDn = parentMo if parentMo else parentDnStr
-    mo = pyClass(parentMoOrDn, *namingVals, markDirty=False, **moProps)
-    mo.resetProps()
-    parentMoOrDn = parentMo if parentMo else parentDnStr
+    for propName in plan.droppedProps:
+        moProps.pop(propName, None)
+
+    namingVals = [moProps.pop(propName) for propName in plan.namingPropNames]
+
+    mo = plan.pyClass._fromWire(parentMo, parentDnStr, namingVals, moProps,
+                                compact, frozen)
 
     children = moData.get('children', [])
     for childNode in children:
         className = list(childNode.keys())[0]
         moData = childNode[className]
-        _createMo(className, moData, mo)
+        _createMo(className, moData, mo, compact, frozen)
 
     return mo
 
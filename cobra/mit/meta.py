@@ -140,6 +140,10 @@ def findDeploymentPathsMatchingResources(meta, resCategories):
 
 
 class ClassMeta(object):
+    # Number of child classes from which the rn prefixes are looked up in a
+    # table, scanning fewer prefixes is faster than building and probing it
+    MIN_CHILDREN_PREFIX_TABLE = 8
+
     def __init__(self, className):
         self.className = className
         self.moClassName = None
@@ -167,10 +171,14 @@ class ClassMeta(object):
 
         self.childClasses = ClassMeta._ClassContainer()
         self.childNamesAndRnPrefix = []
+        # childNamesAndRnPrefix bucketed by first character, built on first use
+        self._childRnPrefixTable = None
         self.parentClasses = ClassMeta._ClassContainer()
 
         self.props = ClassMeta._PropContainer()
         self.namingProps = []
+        # Names of the props, computed on first use by the codecs
+        self._wirePropNames = None
 
         self.rnFormat = None
         self.rnPrefixes = None
@@ -184,6 +192,45 @@ class ClassMeta(object):
     def getClass(self):
         return ClassLoader.loadClass(self.className)
 
+    def findChildClassName(self, rnStr):
+        """Return the name of the child class whose rn prefix starts rnStr.
+
+        The longest matching prefix wins, None is returned if no child class
+        matches.
+        """
+        childNamesAndRnPrefix = self.childNamesAndRnPrefix
+        if len(childNamesAndRnPrefix) < ClassMeta.MIN_CHILDREN_PREFIX_TABLE:
+            # childNamesAndRnPrefix is sorted with longest prefix first, so
+            # 'action' is matched before 'ac'
+            for childClassName, childRnPrefix in childNamesAndRnPrefix:
+                if rnStr.startswith(childRnPrefix):
+                    return childClassName
+            return None
+        table = self._childRnPrefixTable
+        if table is None or table[0] != len(childNamesAndRnPrefix):
+            table = self._childRnPrefixTable = self.__makeChildRnPrefixTable()
+        candidates = table[1].get(rnStr[:1], table[2])
+        for childRnPrefix, childClassName in candidates:
+            if rnStr.startswith(childRnPrefix):
+                return childClassName
+        return None
+
+    def __makeChildRnPrefixTable(self):
+        # Each bucket holds the prefixes starting with the same character,
+        # longest first, followed by the empty prefixes that match any rn
+        prefixes = sorted(((childRnPrefix, childClassName) for
+                           childClassName, childRnPrefix in
+                           self.childNamesAndRnPrefix),
+                          key=lambda prefix: -len(prefix[0]))
+        emptyPrefixes = tuple(prefix for prefix in prefixes if not prefix[0])
+        buckets = {}
+        for prefix in prefixes:
+            if prefix[0]:
+                buckets.setdefault(prefix[0][0], []).append(prefix)
+        buckets = dict((firstChar, tuple(bucket) + emptyPrefixes)
+                       for firstChar, bucket in buckets.items())
+        return len(self.childNamesAndRnPrefix), buckets, emptyPrefixes
+
     def hasContextRoot(self):
         ctxRoot = self.getContextRoot()
         return ctxRoot and ctxRoot != self
@@ -22,6 +22,8 @@ from builtins import object
 from builtins import next
 #from past.builtins import cmp
 from cobra.mit.meta import ClassLoader
+from cobra.mit._cache import ParseCache
+from cobra.mit._codec_utils import splitDnStr
 from collections import deque
 
 
@@ -139,6 +141,7 @@ class Rn(object):
         self.__namingVals = namingVals
         self.__meta = classMeta
         self.__rnStr = None
+        self.__hash = None
 
     @property
     def namingVals(self):
@@ -191,27 +194,27 @@ class Rn(object):
 
     def __lt__(self, other):
         """Implement <."""
-        return str(self) < str(other)
+        return self.__key() < Rn.__otherKey(other)
 
     def __le__(self, other):
         """Implement <=."""
-        return str(self) <= str(other)
+        return self.__key() <= Rn.__otherKey(other)
 
     def __eq__(self, other):
         """Implement ==."""
-        return str(self) == str(other)
+        return self.__key() == Rn.__otherKey(other)
 
     def __ne__(self, other):
         """Implement !=."""
-        return str(self) != str(other)
+        return self.__key() != Rn.__otherKey(other)
 
     def __gt__(self, other):
         """Implement >."""
-        return str(self) > str(other)
+        return self.__key() > Rn.__otherKey(other)
 
     def __ge__(self, other):
         """Implement >=."""
-        return str(self) >= str(other)
+        return self.__key() >= Rn.__otherKey(other)
 
     def __str__(self):
         """
@@ -220,9 +223,7 @@ class Rn(object):
         :returns: string form of the Rn
         :rtype: str
         """
-        if not self.__rnStr:
-            self.__rnStr = self.__makeRnStr()
-        return self.__rnStr
+        return self.__key()
 
     def __hash__(self):
         """
@@ -231,7 +232,23 @@ class Rn(object):
         :returns: hash code for the Rn
         :rtype: int
         """
-        return hash(str(self))
+        if self.__hash is None:
+            self.__hash = hash(self.__key())
+        return self.__hash
+
+    def __key(self):
+        # The string form is the comparison key, it is computed once as the
+        # naming values of a Rn never change
+        rnStr = self.__rnStr
+        if rnStr is None:
+            rnStr = self.__rnStr = self.__makeRnStr()
+        return rnStr
+
+    @staticmethod
+    def __otherKey(other):
+        if isinstance(other, Rn):
+            return other.__key()
+        return str(other)
 
     def __makeRnStr(self):
         if self.__meta.namingProps:
@@ -244,6 +261,46 @@ class Rn(object):
             return self.__meta.rnFormat
 
 
+class _DnNode(object):
+    """
+    An immutable link of a Dn: its last Rn and the node of its parent Dn.
+    Dns share the nodes of their common prefix, so cloning a Dn or creating
+    the Dn of a child is O(1).
+    """
+
+    __slots__ = ('parent', 'rn', 'depth', 'dnStr', 'hash')
+
+    def __init__(self, parent, rn):
+        self.parent = parent
+        self.rn = rn
+        self.depth = parent.depth + 1 if parent is not None else 1
+        self.dnStr = None
+        self.hash = None
+
+    def getDnStr(self):
+        if self.dnStr is None:
+            if self.parent is None:
+                self.dnStr = str(self.rn)
+            else:
+                self.dnStr = self.parent.getDnStr() + '/' + str(self.rn)
+        return self.dnStr
+
+    def getAncestor(self, depth):
+        node = self
+        while node is not None and node.depth > depth:
+            node = node.parent
+        return node
+
+    def rnList(self):
+        rns = []
+        node = self
+        while node is not None:
+            rns.append(node.rn)
+            node = node.parent
+        rns.reverse()
+        return rns
+
+
 class Dn(object):
     """
     The distinguished name (Dn) uniquely identifies a managed object (MO).
@@ -257,6 +314,10 @@ class Dn(object):
     dn = "uni/userext/user-john"
     """
 
+    PARSE_CACHE_SIZE = 65536
+
+    __parseCache = ParseCache(PARSE_CACHE_SIZE)
+
     @classmethod
     def fromString(cls, dnStr):
         """
@@ -269,6 +330,10 @@ class Dn(object):
         :returns: Dn object
         :rtype: cobra.mit.naming.Dn
         """
+        node = cls.__parseCache.get(dnStr)
+        if node is not None:
+            return cls.__fromNode(node)
+
         rnStrs = cls.__splitDnStr(dnStr)
         newDn = Dn()
         pMeta = newDn.meta
@@ -280,6 +345,44 @@ class Dn(object):
             rn = Rn.fromString(rnMeta, rnStr)
             newDn.appendRn(rn)
             pMeta = rnMeta
+        if newDn.__node is not None:
+            cls.__parseCache.put(dnStr, newDn.__node)
+        return newDn
+
+    @classmethod
+    def parseCacheInfo(cls):
+        """
+        Statistics of the cache of parsed Dn strings used by fromString
+
+        :returns: named tuple of hits, misses, maxSize and currSize
+        :rtype: tuple
+        """
+        return cls.__parseCache.info()
+
+    @classmethod
+    def setParseCacheSize(cls, maxSize):
+        """
+        Set the maximum number of Dn strings kept by the parse cache, the
+        least recently used ones are evicted first. 0 disables the cache.
+
+        :param maxSize: maximum number of cached Dn strings
+        :type maxSize: int
+        """
+        cls.__parseCache.maxSize = maxSize
+        cls.__parseCache.clear()
+
+    @classmethod
+    def clearParseCache(cls):
+        """
+        Empty the parse cache and reset its statistics
+        """
+        cls.__parseCache.clear()
+
+    @classmethod
+    def __fromNode(cls, node):
+        # The Rns of the nodes were validated when they were appended
+        newDn = Dn()
+        newDn.__node = node
         return newDn
 
     @classmethod
@@ -293,10 +396,10 @@ class Dn(object):
         :returns: Dn object of the common parent if any, else Dn for topRoot
         :rtype: cobra.mit.naming.Dn
         """
-        def allRnsEqual(allDns, i):
+        def allRnsEqual(allRns, i):
             firstRn = None
-            for eachDn in allDns:
-                currentRn = eachDn.__rns[i]
+            for eachRns in allRns:
+                currentRn = eachRns[i]
                 if firstRn is None:
                     firstRn = currentRn
                 else:
@@ -311,17 +414,17 @@ class Dn(object):
         elif len(dns) == 1:
             return dns[0]
 
+        allRns = [dn.__rnList() for dn in dns]
         index = 0
-        maxLen = min([len(dn.__rns) for dn in dns])
+        maxLen = min([len(rns) for rns in allRns])
         while index < maxLen:
-            if allRnsEqual(dns, index):
+            if allRnsEqual(allRns, index):
                 index += 1
             else:
                 break
         if index == 0:
             return Dn()
-        rns = dns[0].__rns
-        return Dn(rns[:index])
+        return Dn.__fromNode(dns[0].__node.getAncestor(index))
 
     def __init__(self, rns=None):
         """
@@ -330,11 +433,7 @@ class Dn(object):
         :param rns: list of Rns
         :type rns: list
         """
-        self.__dnStr = None
-        self.__hash = None
-        self.__rns = []
-        self.__class = ClassLoader.loadClass('cobra.model.top.Root')
-        self.__meta = self.__class.meta
+        self.__node = None
         if rns is None:
             rns = []
         for rn in rns:
@@ -353,8 +452,10 @@ class Dn(object):
         :rtype: cobra.mit.naming.Rn
         """
         if index is None:
-            return self.__rns[-1]
-        return self.__rns[index]
+            if self.__node is None:
+                raise IndexError('the root Dn has no Rn')
+            return self.__node.rn
+        return self.__rnList()[index]
 
     def getAncestor(self, level):
         """
@@ -366,8 +467,17 @@ class Dn(object):
         :returns: Dn object of the ancestor as specified by the level param
         :rtype: cobra.mit.naming.Dn
         """
-        rns = self.__rns[:-level]
-        return Dn(rns)
+        # Same ancestor as the rns up to [:-level]
+        depth = len(self)
+        if level > 0:
+            depth = max(depth - level, 0)
+        elif level == 0:
+            depth = 0
+        else:
+            depth = min(depth, -level)
+        if self.__node is None:
+            return Dn()
+        return Dn.__fromNode(self.__node.getAncestor(depth))
 
     def getParent(self):
         """
@@ -381,7 +491,7 @@ class Dn(object):
 
     @property
     def isRoot(self):
-        return len(self.__rns) == 0
+        return self.__node is None
 
     @property
     def rns(self):
@@ -391,7 +501,7 @@ class Dn(object):
         :returns: iterator of Rns in this Dn
         :rtype: iterator
         """
-        return iter(self.__rns)
+        return iter(self.__rnList())
 
     @property
     def meta(self):
@@ -401,7 +511,9 @@ class Dn(object):
         :returns: class meta of the mo for this Dn
         :rtype: cobra.mit.meta.ClassMeta
         """
-        return self.__meta
+        if self.__node is None:
+            return ClassLoader.loadClass('cobra.model.top.Root').meta
+        return self.__node.rn.meta
 
     @property
     def moClass(self):
@@ -411,13 +523,17 @@ class Dn(object):
         :returns: Mo class for this Dn
         :rtype: cobra.mit.mo.Mo
         """
-        return self.__class
+        if self.__node is None:
+            return ClassLoader.loadClass('cobra.model.top.Root')
+        return self.__node.rn.moClass
 
     @property
     def contextRoot(self):
-        for rn in reversed(self.__rns):
-            if rn.meta.isContextRoot:
-                return rn.meta
+        node = self.__node
+        while node is not None:
+            if node.rn.meta.isContextRoot:
+                return node.rn.meta
+            node = node.parent
         return None
 
     def clone(self):
@@ -427,28 +543,23 @@ class Dn(object):
         :returns: copy of this Dn
         :rtype: cobra.mit.naming.Dn
         """
-        newDn = Dn()
-        for rn in self.__rns:
-            newDn.appendRn(rn)
-        return newDn
+        return Dn.__fromNode(self.__node)
 
     def appendRn(self, rn):
         """
         Appends an Rn to this Dn, changes the target Mo
         """
-        if len(self.__rns) == 0 and str(rn) == '':
+        if self.__node is None and str(rn) == '':
             # ignore addition of topRoot to topRoot its just a clone side-effect
             return
         rnClassName = rn.meta.className
-        if rnClassName not in self.__meta.childClasses and not rn.meta.isWireOnly:
-            className = str(self.meta.className)
+        meta = self.meta
+        if rnClassName not in meta.childClasses and not rn.meta.isWireOnly:
+            className = str(meta.className)
             raise ValueError("'%s' cannot contain '%s'" % (className,
                                                            str(rnClassName)))
-        self.__rns.append(rn)
-        self.__meta = rn.meta
-        self.__class = rn.moClass
-        self.__dnStr = None
-        self.__hash = None
+        # The current node may be shared, it is replaced rather than modified
+        self.__node = _DnNode(self.__node, rn)
 
     def isDescendantOf(self, ancestorDn):
         """
@@ -484,7 +595,9 @@ class Dn(object):
         :returns: number of rns in the dn
         :rtype: int
         """
-        return len(self.__rns)
+        if self.__node is None:
+            return 0
+        return self.__node.depth
 
     def __str__(self):
         """
@@ -493,9 +606,7 @@ class Dn(object):
         :returns: string form of the Dn
         :rtype: str
         """
-        if not self.__dnStr:
-            self.__dnStr = self.__makeDn()
-        return self.__dnStr
+        return self.__key()
 
     # def __cmp__(self, other):
     #     """
@@ -511,27 +622,27 @@ class Dn(object):
 
     def __lt__(self, other):
         """Implement <."""
-        return str(self) < str(other)
+        return self.__key() < Dn.__otherKey(other)
 
     def __le__(self, other):
         """Implement <=."""
-        return str(self) <= str(other)
+        return self.__key() <= Dn.__otherKey(other)
 
     def __eq__(self, other):
         """Implement ==."""
-        return str(self) == str(other)
+        return self.__key() == Dn.__otherKey(other)
 
     def __ne__(self, other):
         """Implement !=."""
-        return str(self) != str(other)
+        return self.__key() != Dn.__otherKey(other)
 
     def __gt__(self, other):
         """Implement >."""
-        return str(self) > str(other)
+        return self.__key() > Dn.__otherKey(other)
 
     def __ge__(self, other):
         """Implement >=."""
-        return str(self) >= str(other)
+        return self.__key() >= Dn.__otherKey(other)
 
     def __hash__(self):
         """
@@ -540,51 +651,41 @@ class Dn(object):
         :returns: hash code for the Dn
         :rtype: int
         """
-        if self.__hash is None:
-            self.__hash = hash(str(self))
-        return self.__hash
-
-    def __makeDn(self):
-        rnStrs = []
-        for rn in self.__rns:
-            rnStrs.append(str(rn))
-        return '/'.join(rnStrs)
+        node = self.__node
+        if node is None:
+            return hash('')
+        if node.hash is None:
+            node.hash = hash(node.getDnStr())
+        return node.hash
+
+    def __key(self):
+        # The string form is the comparison key, it is cached by the node
+        if self.__node is None:
+            return ''
+        return self.__node.getDnStr()
+
+    @staticmethod
+    def __otherKey(other):
+        if isinstance(other, Dn):
+            return other.__key()
+        return str(other)
+
+    def __rnList(self):
+        if self.__node is None:
+            return []
+        return self.__node.rnList()
 
     @classmethod
     def __splitDnStr(cls, dnStr):
-        rnStrs = []
-        rnStr = ""
-        delimCount = 0
-        for dnChar in dnStr:
-            if delimCount == 0 and dnChar == '/':
-                # Found rn string, eat the char and capture the Rn
-                if rnStr:
-                    rnStrs.append(rnStr)
-                rnStr = ""
-            elif dnChar == '[':
-                delimCount += 1
-                rnStr += dnChar
-            elif dnChar == ']':
-                delimCount -= 1
-                rnStr += dnChar
-            else:
-                rnStr += dnChar
-        if rnStr:
-            rnStrs.append(rnStr)
-        if delimCount != 0:
+        rnStrs, delimDepth = splitDnStr(dnStr)
+        if delimDepth != 0:
             raise ValueError("Invalid dn '%s' with unbalanced delimiters" %
                              dnStr)
-        return rnStrs
+        return [rnStr for rnStr in rnStrs if rnStr]
 
     @classmethod
     def __findChild(cls, pMeta, rnStr):
-        # This method assumes that the childNamesAndRnPrefix in the meta
-        # is sorted with longest prefix first. This will allow us to match
-        # child prefixes that are sub strings. For example 'ac' and 'action'
-        # where the list will have 'action' first and then 'ac'. This way
-        # it is guaranteed that the longest prefix is matched first
-        for childClassName, childRnPrefix in pMeta.childNamesAndRnPrefix:
-            if rnStr.startswith(childRnPrefix):
-                childClass = pMeta.childClasses[childClassName]
-                return childClass.meta
-        return None
+        childClassName = pMeta.findChildClassName(rnStr)
+        if childClassName is None:
+            return None
+        return pMeta.childClasses[childClassName].meta
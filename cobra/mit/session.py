@@ -41,13 +41,24 @@ import math
 class AbstractSession(object):
     XML_FORMAT, JSON_FORMAT = 0, 1
 
-    def __init__(self, controllerUrl, secure, timeout, requestFormat):
+    # Connection pool defaults, these match the requests library defaults
+    DEFAULT_POOL_CONNECTIONS = 10
+    DEFAULT_POOL_MAXSIZE = 10
+
+    def __init__(self, controllerUrl, secure, timeout, requestFormat,
+                 poolConnections=DEFAULT_POOL_CONNECTIONS,
+                 poolMaxSize=DEFAULT_POOL_MAXSIZE, keepAlive=True,
+                 maxRetries=0):
         if requestFormat not in {'xml', 'json'}:
             raise NotImplementedError("requestFormat should be one of: %s" %
                                       {'xml', 'json'})
         self.__secure = secure
         self.__timeout = timeout
         self.__controllerUrl = controllerUrl
+        self.__poolConnections = poolConnections
+        self.__poolMaxSize = poolMaxSize
+        self.__keepAlive = keepAlive
+        self.__maxRetries = maxRetries
         if requestFormat == 'xml':
             self.__format = AbstractSession.XML_FORMAT
         elif requestFormat == 'json':
@@ -71,6 +82,34 @@ class AbstractSession(object):
     def url(self):
         return self.__controllerUrl
 
+    @property
+    def poolConnections(self):
+        """
+        number of connection pools (one per host) kept by the session
+        """
+        return self.__poolConnections
+
+    @property
+    def poolMaxSize(self):
+        """
+        maximum number of connections kept alive per host
+        """
+        return self.__poolMaxSize
+
+    @property
+    def keepAlive(self):
+        """
+        reuse the connections across requests
+        """
+        return self.__keepAlive
+
+    @property
+    def maxRetries(self):
+        """
+        number of retries on connection errors such as a connection reset
+        """
+        return self.__maxRetries
+
     @property
     def formatType(self):
         return self.__format
@@ -106,14 +145,16 @@ class LoginSession(AbstractSession):
     """
 
     def __init__(self, controllerUrl, user, password, secure=False, timeout=90,
-                 requestFormat='xml'):
+                 requestFormat='xml', **poolOptions):
         """
         Args:
             user (str): Username
             password (str): Password
+            poolOptions: connection pool options, see AbstractSession:
+                poolConnections, poolMaxSize, keepAlive and maxRetries
         """
         super(LoginSession, self).__init__(controllerUrl, secure, timeout,
-                                           requestFormat)
+                                           requestFormat, **poolOptions)
         self._user = user
         self._password = password
         self._cookie = None
@@ -227,13 +268,15 @@ class CertSession(AbstractSession):
     """
 
     def __init__(self, controllerUrl, certificateDn, privateKey, secure=False,
-                 timeout=90, requestFormat='xml'):
+                 timeout=90, requestFormat='xml', **poolOptions):
         """
         Args:
             cert (str): Certificate String
+            poolOptions: connection pool options, see AbstractSession:
+                poolConnections, poolMaxSize, keepAlive and maxRetries
         """
         super(CertSession, self).__init__(controllerUrl, secure, timeout,
-                                          requestFormat)
+                                          requestFormat, **poolOptions)
         self.__certificateDn = certificateDn
         self.__privateKey = privateKey
 
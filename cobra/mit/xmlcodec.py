@@ -5,11 +5,11 @@
 import sys
 if sys.version_info[0] == 3:
     from builtins import str
+from builtins import object
 
 import xml.etree.cElementTree as ET
 import xml.dom.minidom
-from ._loader import ClassLoader
-from ._codec_utils import parseMoClassName, getParentDn, listWithTotalCount
+from ._codec_utils import getDecodePlan, getParentDn, listWithTotalCount
 
 
 def parseXMLError(rspStr, errorClass, httpCode=None):
@@ -22,55 +22,126 @@ def parseXMLError(rspStr, errorClass, httpCode=None):
     raise ValueError(rspStr)
 
 
-def _fromXMLRootNode(xmlRootNode):
+def _fromXMLRootNode(xmlRootNode, compact=False, frozen=False):
     allMos = listWithTotalCount()
     allMos.totalCount = int(xmlRootNode.attrib['totalCount'])
     for moNode in xmlRootNode:
-        mo = _createMo(moNode, None)
+        mo = _createMo(moNode, None, compact, frozen)
         allMos.append(mo)
     return allMos
 
 
-def fromXMLStr(xmlStr, tree_only=False):
+def fromXMLStr(xmlStr, tree_only=False, compact=False, frozen=False):
     xmlRootNode = ET.fromstring(xmlStr)
-    return _fromXMLRootNode(xmlRootNode) if not tree_only else xmlRootNode
+    return _fromXMLRootNode(xmlRootNode, compact, frozen) if not tree_only else xmlRootNode
 
 
-def fromXMLStream(xmlStream, tree_only=False):
+def fromXMLStream(xmlStream, tree_only=False, compact=False, frozen=False):
     # Remove the children and add it from the fetch data set
     xmlRootNode = ET.parse(xmlStream).getroot()
-    return _fromXMLRootNode(xmlRootNode) if not tree_only else xmlRootNode
+    return _fromXMLRootNode(xmlRootNode, compact, frozen) if not tree_only else xmlRootNode
 
 
-def _createMo(node, parentMo):
-    pkgName, className = parseMoClassName(node.tag)
-    fqClassName = "cobra.model." + pkgName + "." + className
-    pyClass = ClassLoader.loadClass(fqClassName)
+def fromXMLColumns(xmlStr, propNames=None, arrays=False):
+    """Decode the top level objects of an XML response into columns
+
+    Args:
+        xmlStr (str): the response
+        propNames (list of str): the props to decode, all when None
+        arrays (bool): convert the columns to arrays
+    Returns:
+        columnsWithTotalCount: the MoColumns of each class
+    """
+    # Imported on first use, NumPy is slow to import
+    from ._columns import decodeColumns
+    xmlRootNode = ET.fromstring(xmlStr)
+    rows = ((moNode.tag, moNode.attrib) for moNode in xmlRootNode)
+    result = decodeColumns(rows, propNames, arrays)
+    result.totalCount = int(xmlRootNode.attrib['totalCount'])
+    return result
+
+
+class XMLStreamDecoder(object):
+    """Incrementally decode the imdata of an XML response into Mos.
+
+    The response is parsed with iterparse, every direct child of the imdata
+    root element is turned into a Mo as soon as its end tag is read and its
+    element tree is then discarded, so memory scales with the largest element
+    instead of the whole response. The totalCount of the response is
+    available once the iteration has started.
+    """
+
+    def __init__(self, xmlStream, compact=False, frozen=False):
+        """
+        Args:
+            xmlStream: a file like object returning the bytes of the response
+            compact (bool): decode the Mos with the compact layout
+            frozen (bool): decode read-only Mos
+        """
+        self.totalCount = None
+        self.__compact = compact
+        self.__frozen = frozen
+        self.__mos = self.__iterMos(xmlStream)
+
+    def __iter__(self):
+        return self
+
+    def __next__(self):
+        return next(self.__mos)
+
+    def __iterMos(self, xmlStream):
+        depth = 0
+        rootNode = None
+        for event, node in ET.iterparse(xmlStream, events=('start', 'end')):
+            if event == 'start':
+                depth += 1
+                if depth == 1:
+                    rootNode = node
+                    self.totalCount = int(node.attrib['totalCount'])
+                continue
+
+            depth -= 1
+            if depth == 1:
+                mo = _createMo(node, None, self.__compact, self.__frozen)
+                # The element is fully consumed, drop it from the tree
+                rootNode.clear()
+                yield mo
+
+
+def iterXMLStream(xmlStream, compact=False, frozen=False):
+    """Return an iterator of the Mos in an XML response parsed incrementally
+
+    Args:
+        xmlStream: a file like object returning the bytes of the response
+        compact (bool): decode the Mos with the compact layout
+        frozen (bool): decode read-only Mos
+    Returns:
+        XMLStreamDecoder: iterator of the Mos with a totalCount attribute
+    """
+    return XMLStreamDecoder(xmlStream, compact, frozen)
+
+
+def _createMo(node, parentMo, compact=False, frozen=False):
+    plan = getDecodePlan(node.tag)
+    droppedProps = plan.droppedProps
     parentDnStr = None
     moProps = {}
     for attr, val in list(node.attrib.items()):
-        if attr == 'dn':
+        if attr not in droppedProps:
+            moProps[attr] = str(val)
+        elif attr == 'dn':
             # Set the dn of this MO from the data returned by server
             parentDnStr = getParentDn(str(val))
-        elif attr == 'rn' or attr == 'instanceId':
-            pass
-        elif attr == 'status' and not val:
-            pass
-        else:
+        elif attr == 'status' and val:
             moProps[attr] = str(val)
 
-    namingVals = []
-    for propMeta in pyClass.meta.namingProps:
-        propName = propMeta.moPropName
-        namingVals.append(moProps[propName])
-        del moProps[propName]
+    namingVals = [moProps.pop(propName) for propName in plan.namingPropNames]
 
-    parentMoOrDn = parentMo if parentMo else parentDnStr
-    mo = pyClass(parentMoOrDn, *namingVals, markDirty=False, **moProps)
-    mo.resetProps()
+    mo = plan.pyClass._fromWire(parentMo, parentDnStr, namingVals, moProps,
+                                compact, frozen)
 
     for childNode in node:
-        _createMo(childNode, mo)
+        _createMo(childNode, mo, compact, frozen)
 
     return mo
 
@@ -85,6 +85,8 @@ setup(
     install_requires=INSTALL_REQUIRES,
     extras_require={
         'ssl': ['pyOpenSSL',],
+        # The asyncio MoDirectory requires Python 3.7 or later
+        'async': ['aiohttp; python_version >= "3.7"'],
         'docs': DOCS_REQUIRES,
     },
     tests_require=TESTS_REQUIRES,
@@ -0,0 +1,182 @@
+# Copyright 2015 Cisco Systems, Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Codec benchmarks, run with --runslow."""
+
+from __future__ import print_function
+from builtins import object
+
+import json
+import timeit
+import pytest
+
+from cobra.mit.jsoncodec import fromJSONStr, fromJSONColumns
+from cobra.mit.meta import PropMeta
+
+fv = pytest.importorskip("cobra.model.fv")
+
+slow = pytest.mark.slow
+
+NUM_TENANTS = 2000
+NUM_BDS = 5
+
+
+def bdProps():
+    return {'descr': '', 'lcOwn': 'local', 'childAction': '',
+            'mac': '00:22:BD:F8:19:FF'}
+
+
+def constructMos():
+    for i in range(NUM_TENANTS):
+        tenant = fv.Tenant('uni', 't{0}'.format(i), markDirty=False)
+        tenant.resetProps()
+        for j in range(NUM_BDS):
+            bd = fv.BD(tenant, 'b{0}'.format(j), markDirty=False, **bdProps())
+            bd.resetProps()
+
+
+def hydrateMos():
+    for i in range(NUM_TENANTS):
+        tenant = fv.Tenant._fromWire(None, 'uni', ['t{0}'.format(i)], {})
+        for j in range(NUM_BDS):
+            fv.BD._fromWire(tenant, None, ['b{0}'.format(j)], bdProps())
+
+
+def bestOf(func, repeat=3):
+    return min(timeit.repeat(func, number=1, repeat=repeat))
+
+
+class Test_benchmark_codec(object):
+
+    @slow
+    def test_benchmark_fromWire(self):
+        constructTime = bestOf(constructMos)
+        hydrateTime = bestOf(hydrateMos)
+        print('\nconstructor: {0:.3f}s, _fromWire: {1:.3f}s ({2:.1f}x)'.format(
+            constructTime, hydrateTime, constructTime / hydrateTime))
+
+    def test_fromWire_skips_constructor(self, monkeypatch):
+        calls = []
+
+        def counting(name, func):
+            def wrapper(*args, **kwargs):
+                calls.append(name)
+                return func(*args, **kwargs)
+            return wrapper
+
+        for moClass in (fv.Tenant, fv.BD):
+            monkeypatch.setattr(moClass, '__init__',
+                                counting('__init__', moClass.__init__))
+        monkeypatch.setattr(PropMeta, 'makeValue', staticmethod(
+            counting('makeValue', PropMeta.makeValue)))
+
+        hydrateMos()
+        assert calls == []
+        constructMos()
+        assert calls.count('__init__') == NUM_TENANTS * (NUM_BDS + 1)
+        assert 'makeValue' in calls
+
+
+def cepsJSON(numCeps):
+    imdata = [{'fvCEp': {'attributes': {
+        'dn': 'uni/tn-t/ap-a/epg-e/cep-00:00:00:00:{0:02X}:{1:02X}'.format(
+            i // 256, i % 256),
+        'mac': '00:00:00:00:{0:02X}:{1:02X}'.format(i // 256, i % 256),
+        'ip': '10.0.{0}.{1}'.format(i // 256, i % 256),
+        'encap': 'vlan-{0}'.format(i % 4096),
+        'descr': '', 'lcOwn': 'local', 'childAction': ''}}}
+        for i in range(numCeps)]
+    return json.dumps({'totalCount': str(numCeps), 'imdata': imdata})
+
+
+def decodedSize(jsonStr, **decodeArgs):
+    # tracemalloc is not available before Python 3.4
+    tracemalloc = pytest.importorskip('tracemalloc')
+    tracemalloc.start()
+    mos = fromJSONStr(jsonStr, **decodeArgs)
+    size = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del mos
+    return size
+
+
+class Test_benchmark_compact(object):
+
+    @slow
+    def test_benchmark_compact_memory(self):
+        jsonStr = cepsJSON(20000)
+        regularSize = decodedSize(jsonStr)
+        compactSize = decodedSize(jsonStr, compact=True)
+        print('\nregular: {0:.1f}MB, compact: {1:.1f}MB'.format(
+            regularSize / 1e6, compactSize / 1e6))
+        assert compactSize < regularSize * 0.75
+
+
+def readProps(mos):
+    for mo in mos:
+        mo.mac, mo.ip, mo.encap, mo.descr, mo.lcOwn, mo.childAction, mo.id
+
+
+class Test_benchmark_frozen(object):
+
+    @slow
+    def test_benchmark_frozen_memory(self):
+        jsonStr = cepsJSON(20000)
+        regularSize = decodedSize(jsonStr)
+        frozenSize = decodedSize(jsonStr, frozen=True)
+        print('\nregular: {0:.1f}MB, frozen: {1:.1f}MB'.format(
+            regularSize / 1e6, frozenSize / 1e6))
+        assert frozenSize < regularSize * 0.75
+
+    @slow
+    def test_benchmark_frozen_read(self):
+        jsonStr = cepsJSON(20000)
+        # The first read of a default prop stores it in a regular Mo, read
+        # freshly decoded Mos
+        regularMos = [fromJSONStr(jsonStr) for _ in range(3)]
+        frozenMos = [fromJSONStr(jsonStr, frozen=True) for _ in range(3)]
+        regularTime = bestOf(lambda: readProps(regularMos.pop()))
+        frozenTime = bestOf(lambda: readProps(frozenMos.pop()))
+        print('\nregular: {0:.3f}s, frozen: {1:.3f}s'.format(regularTime,
+                                                            frozenTime))
+
+
+class Test_benchmark_columns(object):
+
+    @slow
+    def test_benchmark_columns(self):
+        jsonStr = cepsJSON(20000)
+        ceps = fromJSONColumns(jsonStr)['fvCEp']
+        assert (list(zip(ceps['mac'], ceps['ip'], ceps['encap'])) ==
+                [(mo.mac, mo.ip, mo.encap) for mo in fromJSONStr(jsonStr)])
+        mosTime = bestOf(lambda: [(mo.mac, mo.ip, mo.encap)
+                                  for mo in fromJSONStr(jsonStr)])
+        columnsTime = bestOf(lambda: fromJSONColumns(jsonStr))
+        print('\nmos: {0:.3f}s, columns: {1:.3f}s'.format(mosTime,
+                                                         columnsTime))
+
+    @slow
+    def test_benchmark_columns_filter(self):
+        from cobra.mit._filter import filterParser
+        jsonStr = cepsJSON(20000)
+        expression = filterParser.from_string(
+            'and(wcard(fvCEp.ip,"10.0.1"),ne(fvCEp.encap,"vlan-300"))')
+        mos = fromJSONStr(jsonStr)
+        ceps = fromJSONColumns(jsonStr, arrays=True)['fvCEp']
+        assert ([bool(value) for value in expression.evaluateColumns(ceps)] ==
+                [expression.evaluate(mo) for mo in mos])
+        mosTime = bestOf(lambda: [mo for mo in mos if expression.evaluate(mo)])
+        columnsTime = bestOf(lambda: expression.evaluateColumns(ceps))
+        print('\nmos: {0:.3f}s, columns: {1:.3f}s'.format(mosTime,
+                                                         columnsTime))
@@ -0,0 +1,81 @@
+# Copyright 2015 Cisco Systems, Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Mo tree benchmarks, run with --runslow."""
+
+from __future__ import print_function
+from builtins import object
+
+import json
+import timeit
+import pytest
+
+from cobra.mit.jsoncodec import fromJSONStr
+
+fv = pytest.importorskip("cobra.model.fv")
+
+slow = pytest.mark.slow
+
+
+def epgsJSON(numEpgs, numCeps):
+    imdata = [{'fvAEPg': {
+        'attributes': {'dn': 'uni/tn-t/ap-a/epg-e{0}'.format(j),
+                       'name': 'e{0}'.format(j)},
+        'children': [{'fvCEp': {'attributes': {'mac': 'c{0}'.format(i)}}}
+                     for i in range(numCeps)]}}
+        for j in range(numEpgs)]
+    return json.dumps({'totalCount': str(numEpgs), 'imdata': imdata})
+
+
+def copyingChildren(mo):
+    # The iteration before the child containers were made lazy, the class
+    # containers and their children were copied on every iteration
+    classContainers = mo.__dict__['_BaseMo__children']
+    for classContainer in list(getattr(classContainers, '_classContainers',
+                                       {}).values()):
+        for childMo in list(classContainer._childObjects.values()):
+            yield childMo
+
+
+def walkTree(mos, children):
+    numMos = 0
+    for mo in mos:
+        for childMo in children(mo):
+            numMos += 1
+            for _ in children(childMo):
+                numMos += 1
+    return numMos
+
+
+class Test_benchmark_mo(object):
+
+    @slow
+    def test_benchmark_children(self):
+        mos = fromJSONStr(epgsJSON(400, 50))
+        assert (walkTree(mos, lambda mo: mo.children) ==
+                walkTree(mos, copyingChildren) == 20000)
+        lazyTime = min(timeit.repeat(
+            lambda: walkTree(mos, lambda mo: mo.children), number=5,
+            repeat=3))
+        copyingTime = min(timeit.repeat(
+            lambda: walkTree(mos, copyingChildren), number=5, repeat=3))
+        print('\ncopying: {0:.3f}s, lazy: {1:.3f}s'.format(copyingTime,
+                                                          lazyTime))
+
+    @slow
+    def test_benchmark_leaves_share_children(self):
+        mos = fromJSONStr(epgsJSON(400, 50))
+        containers = set(id(childMo.__dict__['_BaseMo__children'])
+                         for mo in mos for childMo in mo.children)
+        assert len(containers) == 1
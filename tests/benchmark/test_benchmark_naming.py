@@ -0,0 +1,197 @@
+# Copyright 2015 Cisco Systems, Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Naming benchmarks, run with --runslow."""
+
+from __future__ import print_function
+from builtins import object
+
+import timeit
+import pytest
+
+from cobra.mit.meta import ClassMeta
+from cobra.mit._codec_utils import getParentDn, splitDnStr
+from cobra.mit.naming import Dn
+pytest.importorskip("cobra.model.fv")
+
+slow = pytest.mark.slow
+
+DN_CORPUS = [
+    'uni/tn-common',
+    'uni/tn-common/ctx-default',
+    'uni/tn-common/BD-default',
+    'uni/tn-mgmt/BD-inb/subnet-[10.0.0.1/24]',
+    'uni/tn-t1/ap-app/epg-web',
+    'uni/tn-t1/ap-app/epg-web/cep-00:50:56:AA:BB:CC',
+    'uni/tn-t1/ap-app/epg-web/rspathAtt-[topology/pod-1/paths-101/pathep-[eth1/1]]',
+    'topology/pod-1',
+]
+
+
+def rnsWithParentMeta():
+    rns = []
+    for dnStr in DN_CORPUS:
+        pMeta = Dn().meta
+        for rn in Dn.fromString(dnStr).rns:
+            rns.append((pMeta, str(rn)))
+            pMeta = rn.meta
+    return rns
+
+
+def wideMeta(numChildren=600):
+    # Like polUni or topRoot, which have hundreds of child classes
+    meta = ClassMeta('cobra.model.bench.Wide')
+    prefixes = ['{0}{1}child{2}-'.format(chr(ord('a') + i % 26), 'x' * (i % 3),
+                                         i) for i in range(numChildren)]
+    for prefix in sorted(prefixes, key=len, reverse=True):
+        meta.childNamesAndRnPrefix.append(('cobra.model.bench.C' + prefix,
+                                           prefix))
+    return meta, [(meta, prefix + 'name') for prefix in prefixes]
+
+
+def findChildLinear(pMeta, rnStr):
+    # The lookup Dn used before the prefix tables
+    for childClassName, childRnPrefix in pMeta.childNamesAndRnPrefix:
+        if rnStr.startswith(childRnPrefix):
+            return childClassName
+    return None
+
+
+def findChildMetaLinear(pMeta, rnStr):
+    # Dn.__findChild before the prefix tables
+    for childClassName, childRnPrefix in pMeta.childNamesAndRnPrefix:
+        if rnStr.startswith(childRnPrefix):
+            return pMeta.childClasses[childClassName].meta
+    return None
+
+
+def deepDns(numDns=200):
+    dns = []
+    for i in range(numDns):
+        pathDn = 'topology/pod-1/paths-{0}/pathep-[eth1/{1}]'.format(100 + i,
+                                                                     i % 48)
+        dns.append('uni/tn-t{0}/ap-a/epg-e/rspathAtt-[{1}]/'
+                   'rsfoo-[uni/tn-t{0}/ap-a/epg-[f/{0}]]/bar-{0}'.format(
+                       i, pathDn))
+    return dns
+
+
+def getParentDnCharByChar(dnStr):
+    # getParentDn before the shared tokenizer
+    count = 0
+    pDn = ''
+    foundParent = False
+    for dnChar in dnStr[::-1]:
+        if not foundParent and dnChar == ']':
+            count += 1
+        elif not foundParent and dnChar == '[':
+            count -= 1
+        elif not foundParent and count == 0 and dnChar == '/':
+            foundParent = True
+        elif foundParent:
+            pDn += dnChar
+    return pDn[::-1]
+
+
+def splitDnStrCharByChar(dnStr):
+    # Dn.__splitDnStr before the shared tokenizer
+    rnStrs = []
+    rnStr = ""
+    delimCount = 0
+    for dnChar in dnStr:
+        if delimCount == 0 and dnChar == '/':
+            if rnStr:
+                rnStrs.append(rnStr)
+            rnStr = ""
+        elif dnChar == '[':
+            delimCount += 1
+            rnStr += dnChar
+        elif dnChar == ']':
+            delimCount -= 1
+            rnStr += dnChar
+        else:
+            rnStr += dnChar
+    if rnStr:
+        rnStrs.append(rnStr)
+    return rnStrs
+
+
+def splitDnStrScan(dnStr):
+    return [rnStr for rnStr in splitDnStr(dnStr)[0] if rnStr]
+
+
+class Test_benchmark_naming(object):
+
+    @pytest.mark.parametrize('oldFunc, newFunc', [
+        (getParentDnCharByChar, getParentDn),
+        (splitDnStrCharByChar, splitDnStrScan),
+    ])
+    @slow
+    def test_benchmark_dn_tokenizer(self, oldFunc, newFunc):
+        dns = deepDns()
+        for dnStr in dns:
+            assert newFunc(dnStr) == oldFunc(dnStr)
+
+        def run(func):
+            def runAll():
+                for dnStr in dns:
+                    func(dnStr)
+            return min(timeit.repeat(runAll, number=20, repeat=3))
+        oldTime = run(oldFunc)
+        newTime = run(newFunc)
+        print('\n{0}: {1:.3f}s, {2}: {3:.3f}s'.format(
+            oldFunc.__name__, oldTime, newFunc.__name__, newTime))
+
+    @pytest.mark.parametrize('corpus', ['dns', 'wide'])
+    @slow
+    def test_benchmark_findChildClassName(self, corpus):
+        if corpus == 'dns':
+            # Dn.fromString resolves the rns of the corpus through
+            # Dn.__findChild
+            rns = rnsWithParentMeta()
+            oldFunc, newFunc = findChildMetaLinear, Dn._Dn__findChild
+        else:
+            rns = wideMeta()[1]
+            oldFunc, newFunc = findChildLinear, ClassMeta.findChildClassName
+
+        def run(func):
+            def runAll():
+                for pMeta, rnStr in rns:
+                    func(pMeta, rnStr)
+            return min(timeit.repeat(runAll, number=1, repeat=5))
+
+        for pMeta, _ in rns:
+            # Tables built by other tests
+            pMeta._childRnPrefixTable = None
+        for pMeta, rnStr in set(rns):
+            assert newFunc(pMeta, rnStr) is oldFunc(pMeta, rnStr)
+            assert pMeta.findChildClassName(rnStr) == \
+                findChildLinear(pMeta, rnStr)
+        # A table is built for the parents with many child classes only, e.g.
+        # topRoot and polUni, the others are scanned like before
+        for pMeta, _ in rns:
+            assert (pMeta._childRnPrefixTable is not None) == (
+                len(pMeta.childNamesAndRnPrefix) >=
+                ClassMeta.MIN_CHILDREN_PREFIX_TABLE)
+
+        # Only the lookups under the parents with many child classes changed
+        rns = [(pMeta, rnStr) for pMeta, rnStr in rns
+               if pMeta._childRnPrefixTable is not None]
+        if not rns:
+            pytest.skip('no parent of the corpus has many child classes')
+        rns *= 10000 // len(rns)
+        linearTime = run(oldFunc)
+        bucketedTime = run(newFunc)
+        print('\n{0}: {1} lookups, linear: {2:.3f}s, bucketed: {3:.3f}s'
+              .format(corpus, len(rns), linearTime, bucketedTime))
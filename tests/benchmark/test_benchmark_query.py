@@ -0,0 +1,88 @@
+# Copyright 2015 Cisco Systems, Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Local Mit query benchmarks, run with --runslow."""
+
+from __future__ import print_function
+from builtins import object
+
+import timeit
+import pytest
+
+from cobra.mit._filter import filterParser
+from cobra.mit.request import ClassQuery
+
+fv = pytest.importorskip("cobra.model.fv")
+Mit = pytest.importorskip("cobra.mit._mit").Mit
+
+slow = pytest.mark.slow
+
+FILTER = ('or(and(eq(fvCEp.encap,"vlan-7"),wcard(fvCEp.ip,"10.0.1")),'
+          'and(eq(fvBD.descr,"bd"),not(eq(fvBD.name,"b1"))))')
+
+
+def makeMit(numEpgs, numCeps):
+    mit = Mit()
+    tenant = fv.Tenant('uni', 't')
+    fv.Ctx(tenant, 'c0')
+    fv.BD(tenant, 'b0', descr='bd')
+    ap = fv.Ap(tenant, 'a')
+    for j in range(numEpgs):
+        epg = fv.AEPg(ap, 'e{0}'.format(j))
+        for i in range(numCeps):
+            fv.CEp(epg, 'c{0}'.format(i), encap='vlan-{0}'.format(i % 16),
+                   ip='10.0.{0}.{1}'.format(j, i))
+    mit.add(tenant)
+    return mit
+
+
+def bestOf(func, repeat=3):
+    return min(timeit.repeat(func, number=1, repeat=repeat))
+
+
+class Test_benchmark_query(object):
+
+    @slow
+    def test_benchmark_compiled_filter(self):
+        mit = makeMit(100, 200)
+        mos = list(mit)
+        expression = filterParser.from_string(FILTER)
+        predicate = expression.compile()
+        assert ([mo for mo in mos if predicate(mo)] ==
+                [mo for mo in mos if expression.evaluate(mo)])
+        evaluateTime = bestOf(lambda: [mo for mo in mos
+                                       if expression.evaluate(mo)])
+        compiledTime = bestOf(lambda: [mo for mo in mos if predicate(mo)])
+        query = ClassQuery('fvCEp')
+        query.propFilter = FILTER
+        queryTime = bestOf(lambda: mit.query(query))
+        print('\nevaluate: {0:.3f}s, compiled: {1:.3f}s, query: {2:.3f}s'
+              .format(evaluateTime, compiledTime, queryTime))
+        # vlan-7 on 13 of the 200 CEps of the 11 EPgs with 10.0.1 in their ips
+        assert len(mit.query(query)) == 13 * 11
+
+    @slow
+    def test_benchmark_parse_cache(self):
+        parser = filterParser.parser
+        lexer = filterParser.lexer.lexer
+        parseTime = bestOf(lambda: [parser.parse(FILTER, lexer=lexer)
+                                    for _ in range(100)])
+        filterParser.clearParseCache()
+        cachedTime = bestOf(lambda: [filterParser.from_string(FILTER)
+                                     for _ in range(100)])
+        print('\nparse: {0:.4f}s, cached: {1:.4f}s'.format(parseTime,
+                                                          cachedTime))
+        # Only the first of the 300 lookups parses the filter
+        info = filterParser.parseCacheInfo()
+        assert (info.hits, info.misses) == (299, 1)
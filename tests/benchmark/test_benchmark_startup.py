@@ -0,0 +1,102 @@
+# Copyright 2015 Cisco Systems, Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Startup benchmarks, run with --runslow."""
+
+from __future__ import print_function
+from builtins import object
+
+import subprocess
+import sys
+import timeit
+import pytest
+
+pytest.importorskip("cobra.model.fv")
+
+slow = pytest.mark.slow
+
+STARTUP = '''
+import cobra.mit.access, cobra.mit._mit
+'''
+
+# The import path before the model was imported on demand: cobra.mit._mit
+# imported the top package of the model at module load
+BASELINE_STARTUP = '''
+import cobra.model.top
+''' + STARTUP
+
+# The first real use of the SDK, which imports the model packages it needs
+FIRST_USE = '''
+from cobra.mit._mit import Mit
+from cobra.mit.jsoncodec import fromJSONStr
+Mit()
+fromJSONStr('{"imdata": [{"fvTenant": {"attributes": {"dn": "uni/tn-t"}}}]}')
+'''
+
+TIMED = '''
+import sys, time
+
+def modelModules():
+    return len([m for m in sys.modules if m.startswith('cobra.model.')])
+
+start = time.time()
+{0}
+importTime = time.time() - start
+importModules = modelModules()
+{1}
+print(importTime, importModules, time.time() - start, modelModules())
+'''
+
+
+def startupTime(code, repeat=5):
+    """Return the best times to import the SDK and to its first use, with
+    the number of model modules imported by then."""
+    results = []
+    for _ in range(repeat):
+        output = subprocess.check_output([sys.executable, '-c',
+                                          TIMED.format(code, FIRST_USE)])
+        importTime, importModules, useTime, useModules = output.split()
+        results.append((float(importTime), int(importModules),
+                        float(useTime), int(useModules)))
+    return (min(result[0] for result in results), results[0][1],
+            min(result[2] for result in results), results[0][3])
+
+
+class Test_benchmark_startup(object):
+
+    @slow
+    def test_benchmark_lazy_model_import(self):
+        lazy = startupTime(STARTUP)
+        baseline = startupTime(BASELINE_STARTUP)
+        for name, (importTime, importModules, useTime, useModules) in (
+                ('lazy', lazy), ('baseline', baseline)):
+            print('\n{0}: import {1:.3f}s {2} model modules, first use '
+                  '{3:.3f}s {4} model modules'.format(
+                      name, importTime, importModules, useTime, useModules))
+        # Importing the SDK no longer imports the model, the first use
+        # imports the same model packages as before. Whether the deferred
+        # import saves time overall depends on the program and the size of
+        # the installed model, the times are only reported.
+        assert lazy[1] == 0
+        assert lazy[3] == baseline[3]
+
+    @slow
+    def test_benchmark_filter_tables(self):
+        from cobra.mit._filter import Parser
+        shippedTime = min(timeit.repeat(Parser, number=20, repeat=5))
+        # What the filter parser cost at import when its tables were generated
+        generatedTime = min(timeit.repeat(
+            lambda: Parser(tabmodule='noSuchTables'), number=20, repeat=5))
+        print('\nshipped tables: {0:.4f}s, generated tables: {1:.4f}s'.format(
+            shippedTime / 20, generatedTime / 20))
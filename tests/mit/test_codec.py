@@ -0,0 +1,301 @@
+# Copyright 2015 Cisco Systems, Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from builtins import str
+from builtins import object
+
+import io
+import json
+import pytest
+
+from cobra.mit.jsoncodec import fromJSONStr, fromJSONStream, toJSONStr
+from cobra.mit.xmlcodec import fromXMLStr, iterXMLStream
+from cobra.mit._codec_utils import getDecodePlan, getParentDn, splitDnStr
+fv = pytest.importorskip("cobra.model.fv")
+
+
+def tenantsJSON(numTenants, totalCountFirst=True):
+    imdata = []
+    for i in range(numTenants):
+        imdata.append({
+            'fvTenant': {
+                'attributes': {
+                    'dn': 'uni/tn-t{0}'.format(i),
+                    'name': 't{0}'.format(i),
+                    'descr': u'escaped \\" {braces} [brackets] é☃',
+                },
+                'children': [{
+                    'fvBD': {
+                        'attributes': {
+                            'dn': 'uni/tn-t{0}/BD-b'.format(i),
+                            'name': 'b',
+                        }
+                    }
+                }]
+            }
+        })
+    items = [('totalCount', str(numTenants)), ('imdata', imdata)]
+    if not totalCountFirst:
+        items.reverse()
+    return u'{' + u','.join(u'{0}: {1}'.format(json.dumps(key),
+                                               json.dumps(value,
+                                                          ensure_ascii=False))
+                           for key, value in items) + u'}'
+
+
+def summary(mos):
+    return [(str(mo.dn), mo.descr, [str(child.dn) for child in mo.children])
+            for mo in mos]
+
+
+class Test_jsoncodec_fromJSONStream(object):
+
+    @pytest.mark.parametrize('chunkSize', [1, 2, 3, 7, 64, 65536])
+    @pytest.mark.parametrize('totalCountFirst', [True, False])
+    def test_fromJSONStream_matches_fromJSONStr(self, chunkSize,
+                                                totalCountFirst):
+        jsonStr = tenantsJSON(5, totalCountFirst)
+        mos = fromJSONStream(io.BytesIO(jsonStr.encode('utf-8')), chunkSize)
+        assert summary(mos) == summary(fromJSONStr(jsonStr))
+        assert mos.totalCount == 5
+
+    def test_fromJSONStream_chunk_iterable(self):
+        jsonBytes = tenantsJSON(3).encode('utf-8')
+        chunks = [jsonBytes[i:i + 5] for i in range(0, len(jsonBytes), 5)]
+        mos = fromJSONStream(iter(chunks))
+        assert [mo.name for mo in mos] == ['t0', 't1', 't2']
+
+    def test_fromJSONStream_is_incremental(self):
+        jsonBytes = tenantsJSON(3).encode('utf-8')
+        stream = io.BytesIO(jsonBytes)
+        mos = fromJSONStream(stream, 16)
+        assert next(mos).name == 't0'
+        assert mos.totalCount == 3
+        assert stream.tell() < len(jsonBytes)
+
+    def test_fromJSONStream_empty(self):
+        mos = fromJSONStream([b'{"totalCount":"0","imdata":[]}'])
+        assert list(mos) == []
+        assert mos.totalCount == 0
+
+    def test_fromJSONStream_truncated(self):
+        jsonBytes = tenantsJSON(2).encode('utf-8')
+        with pytest.raises(ValueError):
+            list(fromJSONStream([jsonBytes[:-20]]))
+
+
+def tenantsXML(numTenants):
+    tenants = u''.join(
+        u'<fvTenant dn="uni/tn-t{0}" name="t{0}" descr="&lt;&amp; é☃">'
+        u'<fvBD dn="uni/tn-t{0}/BD-b" name="b"/></fvTenant>'.format(i)
+        for i in range(numTenants))
+    return (u'<?xml version="1.0" encoding="UTF-8"?><imdata totalCount="{0}">'
+            u'{1}</imdata>'.format(numTenants, tenants))
+
+
+class Test_xmlcodec_iterXMLStream(object):
+
+    def test_iterXMLStream_matches_fromXMLStr(self):
+        xmlStr = tenantsXML(5)
+        mos = iterXMLStream(io.BytesIO(xmlStr.encode('utf-8')))
+        assert summary(mos) == summary(fromXMLStr(xmlStr.encode('utf-8')))
+        assert mos.totalCount == 5
+
+    def test_iterXMLStream_is_incremental(self):
+        xmlBytes = tenantsXML(400).encode('utf-8')
+        stream = io.BytesIO(xmlBytes)
+        mos = iterXMLStream(stream)
+        assert next(mos).name == 't0'
+        assert mos.totalCount == 400
+        assert stream.tell() < len(xmlBytes)
+
+    def test_iterXMLStream_empty(self):
+        mos = iterXMLStream(io.BytesIO(b'<imdata totalCount="0"></imdata>'))
+        assert list(mos) == []
+        assert mos.totalCount == 0
+
+
+class Test_codec_utils_getDecodePlan(object):
+
+    def test_getDecodePlan_is_cached(self):
+        plan = getDecodePlan('fvTenant')
+        assert plan is getDecodePlan('fvTenant')
+        assert plan.pyClass.meta.moClassName == 'fvTenant'
+        assert plan.namingPropNames == ('name',)
+
+    def test_decode_drops_props(self):
+        attributes = {'dn': 'uni/tn-t', 'rn': 'tn-t', 'name': 't',
+                      'status': 'created', 'instanceId': '1', 'descr': 'd'}
+        jsonStr = json.dumps({'totalCount': '1', 'imdata': [
+            {'fvTenant': {'attributes': attributes}}]})
+        mo = fromJSONStr(jsonStr)[0]
+        assert str(mo.dn) == 'uni/tn-t'
+        assert mo.descr == 'd'
+        assert not hasattr(mo, 'instanceId')
+
+
+class Test_codec_utils_splitDnStr(object):
+
+    @pytest.mark.parametrize('dnStr, rnStrs, parentDnStr', [
+        ('', [''], ''),
+        ('uni', ['uni'], ''),
+        ('uni/tn-a', ['uni', 'tn-a'], 'uni'),
+        ('uni/tn-a/', ['uni', 'tn-a', ''], 'uni/tn-a'),
+        ('uni/tn-a/BD-b/subnet-[10.0.0.1/24]',
+         ['uni', 'tn-a', 'BD-b', 'subnet-[10.0.0.1/24]'], 'uni/tn-a/BD-b'),
+        ('uni/epp/fv-[uni/tn-a/ap-b/epg-[c/d]]/node-1',
+         ['uni', 'epp', 'fv-[uni/tn-a/ap-b/epg-[c/d]]', 'node-1'],
+         'uni/epp/fv-[uni/tn-a/ap-b/epg-[c/d]]'),
+    ])
+    def test_splitDnStr(self, dnStr, rnStrs, parentDnStr):
+        assert splitDnStr(dnStr) == (rnStrs, 0)
+        assert getParentDn(dnStr) == parentDnStr
+
+    def test_splitDnStr_unbalanced(self):
+        assert splitDnStr('uni/tn-[a/b')[1] == 1
+        assert getParentDn(None) == ''
+
+
+def moState(mo):
+    props = dict((propName, getattr(mo, propName))
+                 for propName in mo.meta.props.names
+                 if propName not in ('dn', 'rn', 'status'))
+    return (str(mo.dn), str(mo.parentDn), str(mo.status),
+            sorted(mo.dirtyProps), props, mo.numChildren,
+            sorted(moState(child) for child in mo.children))
+
+
+class Test_codec_compact(object):
+
+    def test_compact_matches_regular(self):
+        jsonStr = tenantsJSON(3)
+        regularMos = fromJSONStr(jsonStr)
+        compactMos = fromJSONStr(jsonStr, compact=True)
+        assert [moState(mo) for mo in compactMos] == \
+            [moState(mo) for mo in regularMos]
+        xmlBytes = tenantsXML(3).encode('utf-8')
+        assert [moState(mo) for mo in fromXMLStr(xmlBytes, compact=True)] == \
+            [moState(mo) for mo in fromXMLStr(xmlBytes)]
+        assert [moState(mo) for mo in
+                fromJSONStream([jsonStr.encode('utf-8')], compact=True)] == \
+            [moState(mo) for mo in regularMos]
+
+    def test_compact_mo(self):
+        tenant = fromJSONStr(tenantsJSON(1), compact=True)[0]
+        assert isinstance(tenant, fv.Tenant)
+        assert type(tenant) is not fv.Tenant
+        assert '_BaseMo__status' not in tenant.__dict__
+        assert tenant.status is tenant.status
+        assert tenant.BD['b'].name == 'b'
+        assert toJSONStr(tenant) == toJSONStr(fromJSONStr(tenantsJSON(1))[0])
+
+    def test_compact_mo_stores_decoded_props(self):
+        tenants = fromJSONStr(tenantsJSON(2), compact=True)
+        assert tenants[0]._propLayout is tenants[1]._propLayout
+        assert len(tenants[0]._propValues) < len(fv.Tenant.meta.props.names)
+
+    def test_compact_mo_set_prop(self):
+        tenant = fromJSONStr(tenantsJSON(1), compact=True)[0]
+        assert not tenant.isPropDirty('descr')
+        tenant.descr = 'changed'
+        assert tenant.descr == 'changed'
+        assert sorted(tenant.dirtyProps) == ['descr', 'status']
+        assert str(tenant.status) == 'created,modified'
+        tenant.resetProps()
+        assert list(tenant.dirtyProps) == []
+
+    def test_compact_mo_clone_is_regular(self):
+        tenant = fromJSONStr(tenantsJSON(1), compact=True)[0]
+        clone = tenant.clone()
+        assert type(clone) is fv.Tenant
+        assert type(next(clone.children)) is fv.BD
+        regularClone = fromJSONStr(tenantsJSON(1))[0].clone()
+        assert moState(clone) == moState(regularClone)
+
+
+class Test_codec_frozen(object):
+
+    def test_frozen_matches_regular(self):
+        jsonStr = tenantsJSON(3)
+        regularMos = fromJSONStr(jsonStr)
+        frozenMos = fromJSONStr(jsonStr, frozen=True)
+        assert [moState(mo) for mo in frozenMos] == \
+            [moState(mo) for mo in regularMos]
+        xmlBytes = tenantsXML(3).encode('utf-8')
+        assert [moState(mo) for mo in fromXMLStr(xmlBytes, frozen=True)] == \
+            [moState(mo) for mo in fromXMLStr(xmlBytes)]
+        assert [moState(mo) for mo in
+                fromJSONStream([jsonStr.encode('utf-8')], frozen=True)] == \
+            [moState(mo) for mo in regularMos]
+
+    def test_frozen_mo(self):
+        tenant = fromJSONStr(tenantsJSON(1), frozen=True)[0]
+        assert isinstance(tenant, fv.Tenant)
+        assert type(tenant) is not fv.Tenant
+        assert 'descr' in type(tenant).__slots__
+        assert tenant.BD['b'].name == 'b'
+        assert toJSONStr(tenant) == toJSONStr(fromJSONStr(tenantsJSON(1))[0])
+
+    @pytest.mark.parametrize('modify', [
+        lambda mo: setattr(mo, 'descr', 'changed'),
+        lambda mo: mo.delete(),
+        lambda mo: fv.Ap(mo, 'a'),
+        lambda mo: fv.Tenant('uni', 't1')._attachChild(mo.BD['b']),
+        lambda mo: mo._attachChild(fv.Ap('uni/tn-t0', 'a')),
+        lambda mo: mo._detachChild(mo.BD['b']),
+    ])
+    def test_frozen_mo_cannot_be_modified(self, modify):
+        tenant = fromJSONStr(tenantsJSON(1), frozen=True)[0]
+        before = moState(tenant)
+        with pytest.raises(ValueError):
+            modify(tenant)
+        assert moState(tenant) == before
+
+    def test_frozen_mo_reset_props(self):
+        tenant = fromJSONStr(tenantsJSON(1), frozen=True)[0]
+        tenant.resetProps()
+        assert list(tenant.dirtyProps) == []
+
+    def test_frozen_status_is_shared(self):
+        tenants = fromJSONStr(tenantsJSON(2), frozen=True)
+        assert tenants[0].status is tenants[1].status
+
+    def test_thaw(self):
+        regularTenant = fromJSONStr(tenantsJSON(1))[0]
+        tenant = fromJSONStr(tenantsJSON(1), frozen=True)[0]
+        thawed = tenant.thaw()
+        assert type(thawed) is fv.Tenant
+        assert type(next(thawed.children)) is fv.BD
+        assert moState(thawed) == moState(regularTenant)
+        thawed.descr = 'changed'
+        assert sorted(thawed.dirtyProps) == ['descr', 'status']
+        assert tenant.descr != 'changed'
+
+    def test_thaw_subtree(self):
+        bd = fromJSONStr(tenantsJSON(1), frozen=True)[0].BD['b']
+        thawed = bd.thaw()
+        assert thawed.parent is None
+        assert str(thawed.dn) == 'uni/tn-t0/BD-b'
+        assert moState(thawed) == moState(fromJSONStr(tenantsJSON(1))[0].BD['b'])
+
+    def test_thaw_regular_mo(self):
+        tenant = fromJSONStr(tenantsJSON(1))[0]
+        assert tenant.thaw() is tenant
+
+    def test_frozen_mo_clone_is_regular(self):
+        tenant = fromJSONStr(tenantsJSON(1), frozen=True)[0]
+        clone = tenant.clone()
+        assert type(clone) is fv.Tenant
+        regularClone = fromJSONStr(tenantsJSON(1))[0].clone()
+        assert moState(clone) == moState(regularClone)
@@ -0,0 +1,213 @@
+# Copyright 2015 Cisco Systems, Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from builtins import str
+from builtins import object
+
+import array
+import json
+import subprocess
+import sys
+import pytest
+
+from cobra.mit.jsoncodec import fromJSONStr, fromJSONColumns, toJSONStr
+from cobra.mit.xmlcodec import fromXMLColumns
+from cobra.mit._columns import MoColumns
+fv = pytest.importorskip("cobra.model.fv")
+
+
+def cepAttributes(i):
+    attributes = {
+        'dn': 'uni/tn-t/ap-a/epg-e/cep-c{0}'.format(i),
+        'mac': 'c{0}'.format(i),
+        'ip': '10.0.0.{0}'.format(i),
+        'encap': 'vlan-{0}'.format(100 + i % 4),
+        'id': str(i * 10),
+    }
+    if i % 2:
+        attributes['descr'] = 'odd'
+    return attributes
+
+
+def cepsJSON(numCeps, extraImdata=()):
+    imdata = [{'fvCEp': {'attributes': cepAttributes(i)}}
+              for i in range(numCeps)]
+    imdata.extend(extraImdata)
+    return json.dumps({'totalCount': str(len(imdata)), 'imdata': imdata})
+
+
+def cepsXML(numCeps):
+    ceps = ''.join(
+        '<fvCEp {0}/>'.format(' '.join('{0}="{1}"'.format(name, value)
+                                       for name, value in
+                                       sorted(cepAttributes(i).items())))
+        for i in range(numCeps))
+    return ('<?xml version="1.0" encoding="UTF-8"?><imdata totalCount="{0}">'
+            '{1}</imdata>'.format(numCeps, ceps))
+
+
+class Test_columns_decode(object):
+
+    def test_numpy_not_imported(self):
+        # NumPy is only imported when columns are decoded
+        output = subprocess.check_output([
+            sys.executable, '-c',
+            'import sys, cobra.mit.access; print("numpy" in sys.modules)'])
+        assert output.strip() == b'False'
+
+    def test_columns(self):
+        result = fromJSONColumns(cepsJSON(4))
+        assert result.totalCount == 4
+        assert list(result.keys()) == ['fvCEp']
+        ceps = result['fvCEp']
+        assert isinstance(ceps, MoColumns)
+        assert len(ceps) == 4
+        assert ceps.dns == ['uni/tn-t/ap-a/epg-e/cep-c{0}'.format(i)
+                            for i in range(4)]
+        assert sorted(ceps.columns) == ['descr', 'encap', 'id', 'ip', 'mac']
+        assert ceps['ip'] == ['10.0.0.{0}'.format(i) for i in range(4)]
+        # A column found after the first row is filled for the previous ones
+        assert ceps['descr'] == [None, 'odd', None, 'odd']
+
+    def test_columns_prop_names(self):
+        ceps = fromJSONColumns(cepsJSON(3), propNames=['ip', 'noSuchProp'])
+        ceps = ceps['fvCEp']
+        assert sorted(ceps.columns) == ['ip', 'mac']
+        assert 'encap' not in ceps
+
+    def test_columns_classes(self):
+        tenant = {'fvTenant': {'attributes': {'dn': 'uni/tn-t',
+                                              'name': 't'}}}
+        result = fromJSONColumns(cepsJSON(2, [tenant]))
+        assert sorted(result) == ['fvCEp', 'fvTenant']
+        assert result.totalCount == 3
+        assert result['fvTenant']['name'] == ['t']
+
+    def test_columns_xml(self):
+        jsonCeps = fromJSONColumns(cepsJSON(4))['fvCEp']
+        xmlCeps = fromXMLColumns(cepsXML(4))['fvCEp']
+        assert xmlCeps.dns == jsonCeps.dns
+        assert xmlCeps.columns == jsonCeps.columns
+
+    def test_getMo(self):
+        ceps = fromJSONColumns(cepsJSON(4))['fvCEp']
+        mos = fromJSONStr(cepsJSON(4))
+        for row in range(4):
+            mo = ceps.getMo(row)
+            assert type(mo) is fv.CEp
+            assert toJSONStr(mo, includeAllProps=True) == \
+                toJSONStr(mos[row], includeAllProps=True)
+        assert [str(mo.dn) for mo in ceps.iterMos()] == ceps.dns
+
+    def test_getMo_frozen(self):
+        ceps = fromJSONColumns(cepsJSON(2))['fvCEp']
+        mo = ceps.getMo(1, frozen=True)
+        assert mo.thaw() is not mo
+        assert mo.descr == 'odd'
+
+    def test_getMo_naming_from_dn(self):
+        cep = {'fvCEp': {'attributes': {'dn': 'uni/tn-t/ap-a/epg-e/cep-x',
+                                        'ip': '10.0.1.1'}}}
+        ceps = fromJSONColumns(cepsJSON(1, [cep]))['fvCEp']
+        assert ceps['mac'] == ['c0', None]
+        mo = ceps.getMo(1)
+        assert mo.mac == 'x'
+        assert str(mo.dn) == 'uni/tn-t/ap-a/epg-e/cep-x'
+        assert mo.ip == '10.0.1.1'
+
+
+class Test_columns_arrays(object):
+
+    def test_arrays(self):
+        ceps = fromJSONColumns(cepsJSON(4), arrays=True)['fvCEp']
+        assert not isinstance(ceps['id'], list)
+        assert [int(value) for value in ceps['id']] == [0, 10, 20, 30]
+        assert list(ceps['ip']) == ['10.0.0.{0}'.format(i) for i in range(4)]
+        assert ceps.getMo(3).id == '30'
+
+    def test_arrays_missing_value(self):
+        cep = {'fvCEp': {'attributes': {'dn': 'uni/tn-t/ap-a/epg-e/cep-x',
+                                        'mac': 'x'}}}
+        ceps = fromJSONColumns(cepsJSON(2, [cep]), arrays=True)['fvCEp']
+        assert list(ceps['id']) == ['0', '10', None]
+        assert ceps.getMo(2).id == ''
+
+    def test_arrays_keep_wire_strings(self):
+        cep = {'fvCEp': {'attributes': {'dn': 'uni/tn-t/ap-a/epg-e/cep-x',
+                                        'mac': 'x', 'id': '007'}}}
+        ceps = fromJSONColumns(cepsJSON(2, [cep]), arrays=True)['fvCEp']
+        assert list(ceps['id']) == ['0', '10', '007']
+        assert ceps.getMo(2).id == '007'
+        assert list(ceps.evaluate('gt(fvCEp.id,"5")')) == [False, True, True]
+
+    def test_arrays_without_numpy(self, monkeypatch):
+        monkeypatch.setattr('cobra.mit._columns.numpy', None)
+        ceps = fromJSONColumns(cepsJSON(3), arrays=True)['fvCEp']
+        assert ceps['id'] == array.array('q', [0, 10, 20])
+        assert ceps['ip'] == ['10.0.0.0', '10.0.0.1', '10.0.0.2']
+
+
+FILTERS = [
+    'eq(fvCEp.encap,"vlan-101")',
+    'ne(fvCEp.encap,"vlan-101")',
+    'wcard(fvCEp.ip,"10.0.0.1")',
+    'eq(fvCEp.descr,"odd")',
+    'eq(fvCEp.descr,"")',
+    'gt(fvCEp.mac,"c3")',
+    'and(eq(fvCEp.descr,"odd"),ne(fvCEp.encap,"vlan-103"))',
+    'or(eq(fvCEp.mac,"c0"),eq(fvCEp.mac,"c5"))',
+    'not(eq(fvCEp.encap,"vlan-100"),eq(fvCEp.encap,"vlan-102"))',
+    'eq(fvTenant.name,"t")',
+    'ne(fvCEp.noSuchProp,"x")',
+    'gt(fvCEp.id,"20")',
+    'le(fvCEp.id,"x")',
+]
+
+
+class Test_columns_evaluate(object):
+
+    def expectedMask(self, propFilter, numCeps):
+        from cobra.mit._filter import filterParser
+        expression = filterParser.from_string(propFilter)
+        return [expression.evaluate(mo)
+                for mo in fromJSONStr(cepsJSON(numCeps))]
+
+    @pytest.mark.parametrize('arrays', [False, True])
+    @pytest.mark.parametrize('propFilter', FILTERS)
+    def test_evaluate(self, propFilter, arrays):
+        ceps = fromJSONColumns(cepsJSON(8), arrays=arrays)['fvCEp']
+        mask = ceps.evaluate(propFilter)
+        assert [bool(value) for value in mask] == \
+            self.expectedMask(propFilter, 8)
+
+    @pytest.mark.parametrize('propFilter', FILTERS)
+    def test_evaluate_without_numpy(self, propFilter, monkeypatch):
+        monkeypatch.setattr('cobra.mit._columns.numpy', None)
+        ceps = fromJSONColumns(cepsJSON(8), arrays=True)['fvCEp']
+        assert ceps.evaluate(propFilter) == self.expectedMask(propFilter, 8)
+
+    def test_evaluate_numeric_arrays(self):
+        ceps = fromJSONColumns(cepsJSON(12), arrays=True)['fvCEp']
+        # The ids are compared as numbers like on the Mos, 100 > 20
+        mask = ceps.evaluate('gt(fvCEp.id,"20")')
+        assert [bool(value) for value in mask] == [i > 2 for i in range(12)]
+        assert not any(ceps.evaluate('eq(fvCEp.id,"x")'))
+
+    def test_select(self):
+        ceps = fromJSONColumns(cepsJSON(8), arrays=True)['fvCEp']
+        odd = ceps.select(ceps.evaluate('eq(fvCEp.descr,"odd")'))
+        assert len(odd) == 4
+        assert list(odd['mac']) == ['c1', 'c3', 'c5', 'c7']
+        assert [int(value) for value in odd['id']] == [10, 30, 50, 70]
+        assert odd.getMo(1).dn == ceps.getMo(3).dn
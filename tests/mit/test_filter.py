@@ -0,0 +1,180 @@
+# Copyright 2015 Cisco Systems, Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from builtins import str
+from builtins import object
+
+import os
+import pytest
+import ply.yacc as yacc
+
+from cobra.mit._expr import MoPropExpr, And, _makeValueParser
+from cobra.mit._filter import Parser, filterParser
+import cobra.mit._filter_parsetab as parsetab
+from cobra.mit.meta import PropMeta
+from cobra.mit.request import ClassQuery, DnQuery
+fv = pytest.importorskip("cobra.model.fv")
+Mit = pytest.importorskip("cobra.mit._mit").Mit
+
+
+def makeTenant():
+    tenant = fv.Tenant('uni', 't', descr='tenant')
+    for i in range(4):
+        fv.BD(tenant, 'b{0}'.format(i), descr='bd' if i % 2 else '')
+        fv.Ctx(tenant, 'c{0}'.format(i), descr='ctx{0}'.format(i))
+    ap = fv.Ap(tenant, 'a')
+    epg = fv.AEPg(ap, 'e')
+    for i in range(4):
+        fv.CEp(epg, 'c{0}'.format(i), encap='vlan-{0}'.format(100 + i))
+    return tenant
+
+
+def allMos(mo):
+    yield mo
+    for childMo in mo.children:
+        for descendantMo in allMos(childMo):
+            yield descendantMo
+
+
+FILTERS = [
+    'eq(fvBD.descr,"bd")',
+    'ne(fvBD.descr,"bd")',
+    'gt(fvCEp.encap,"vlan-101")',
+    'le(fvCEp.encap,"vlan-101")',
+    'wcard(fvCtx.descr,"ctx")',
+    'and(eq(fvBD.descr,"bd"),wcard(fvBD.name,"3"))',
+    'and(eq(fvBD.descr,"bd"),eq(fvCtx.descr,"ctx1"))',
+    'or(eq(fvBD.name,"b0"),eq(fvCtx.name,"c1"),eq(fvCEp.mac,"c2"))',
+    'not(eq(fvBD.descr,"bd"))',
+    'not(or(eq(fvCtx.name,"c0"),ne(fvCtx.name,"c1")))',
+    'and(ne(fvBD.descr,"x"),not(eq(fvCtx.name,"c0")))',
+    'ne(fvBD.noSuchProp,"x")',
+    'eq(noSuchClass.name,"x")',
+    'ne(noSuchClass.name,"x")',
+]
+
+
+class Test_filter_parser(object):
+
+    def test_parse_cache(self):
+        parser = Parser()
+        propFilter = 'and(eq(fvBD.name,"b"),ne(fvBD.descr,"x"))'
+        expression = parser.from_string(propFilter)
+        assert isinstance(expression, And)
+        assert parser.from_string(propFilter) is expression
+        info = parser.parseCacheInfo()
+        assert (info.hits, info.misses, info.currSize) == (1, 1, 1)
+        parser.clearParseCache()
+        assert parser.from_string(propFilter) is not expression
+
+    def test_shipped_tables_match_grammar(self):
+        # Run Parser.writeTables after changing the grammar
+        parserInfo = yacc.ParserReflect(dict(
+            (name, getattr(Parser(), name)) for name in dir(Parser)))
+        parserInfo.get_all()
+        assert parsetab._lr_signature == parserInfo.signature()
+
+    def test_no_files_written(self, tmpdir, monkeypatch):
+        monkeypatch.chdir(str(tmpdir))
+        Parser().from_string('eq(fvBD.name,"b")')
+        assert tmpdir.listdir() == []
+        filterDir = os.path.dirname(parsetab.__file__)
+        assert not os.path.exists(os.path.join(filterDir, 'parsetab.py'))
+        assert not os.path.exists(os.path.join(filterDir, 'parser.out'))
+
+
+class Test_filter_compile(object):
+
+    @pytest.mark.parametrize('propFilter', FILTERS)
+    def test_compile(self, propFilter):
+        expression = filterParser.from_string(propFilter)
+        predicate = expression.compile()
+        for mo in allMos(makeTenant()):
+            assert predicate(mo) is expression.evaluate(mo), str(mo.dn)
+
+    def test_compile_custom_op(self):
+        def startsWith(mo, className, propName, lValue):
+            return (mo.meta.moClassName == className and
+                    getattr(mo, propName).startswith(lValue))
+        expression = MoPropExpr('fvCtx', 'descr', 'ctx1', startsWith)
+        predicate = expression.compile()
+        assert ([str(mo.dn) for mo in allMos(makeTenant()) if predicate(mo)] ==
+                ['uni/tn-t/ctx-c1'])
+
+
+def makeBDs():
+    tenant = fv.Tenant('uni', 't')
+    for name, mtu, arpFlood in [('b0', '800', 'no'), ('b1', '1500', 'yes'),
+                                ('b2', '9000', 'no'), ('b3', 'inherit', 'no')]:
+        fv.BD(tenant, name, mtu=mtu, arpFlood=arpFlood)
+    return list(tenant.children)
+
+
+class Test_filter_typed(object):
+
+    @pytest.mark.parametrize('propFilter,names', [
+        # Compared as numbers, 1500 > 900, as strings only '9000' and
+        # 'inherit' would be greater than '900'
+        ('gt(fvBD.mtu,"900")', ['b1', 'b2']),
+        # The inherit constant has value 1
+        ('lt(fvBD.mtu,"900")', ['b0', 'b3']),
+        ('eq(fvBD.mtu,"01500")', ['b1']),
+        ('le(fvBD.mtu,"inherit")', ['b3']),
+        ('gt(fvBD.arpFlood,"no")', ['b1']),
+        # Not a number, compared as strings
+        ('ge(fvBD.mtu,"i")', ['b3']),
+    ])
+    def test_typed(self, propFilter, names):
+        expression = filterParser.from_string(propFilter)
+        predicate = expression.compile()
+        bds = makeBDs()
+        assert sorted(bd.name for bd in bds if predicate(bd)) == names
+        assert sorted(bd.name for bd in bds if expression.evaluate(bd)) == \
+            names
+
+    def test_bitmask(self):
+        propMeta = PropMeta('scalar:Bitmask32', 'scope', 'scope', 1, None)
+        propMeta._addConstant('private', 'private-to-vrf', 1)
+        propMeta._addConstant('public', 'advertised-externally', 2)
+        propMeta._addConstant('shared', 'shared-between-vrfs', 4)
+        parseValue = _makeValueParser(propMeta)
+        assert parseValue('public,shared') == parseValue('shared,public') == 6
+        assert parseValue('advertised-externally') == 2
+        assert parseValue('public,unknown') is None
+
+    def test_string_props(self):
+        propMeta = PropMeta('naming:Name', 'name', 'name', 1, None)
+        assert _makeValueParser(propMeta) is None
+
+
+class Test_filter_mit_query(object):
+
+    def test_class_query(self):
+        mit = Mit()
+        mit.add(makeTenant())
+        query = ClassQuery('fvBD')
+        query.propFilter = 'eq(fvBD.descr,"bd")'
+        assert (sorted(str(mo.dn) for mo in mit.query(query)) ==
+                ['uni/tn-t/BD-b1', 'uni/tn-t/BD-b3'])
+
+    def test_subtree_filter(self):
+        mit = Mit()
+        mit.add(makeTenant())
+        query = DnQuery('uni/tn-t')
+        query.subtree = 'full'
+        query.subtreePropFilter = 'or(eq(fvCtx.name,"c2"),eq(fvCEp.mac,"c1"))'
+        tenant, = mit.query(query)
+        assert (sorted(str(mo.dn) for mo in allMos(tenant)) ==
+                ['uni/tn-t', 'uni/tn-t/ap-a', 'uni/tn-t/ap-a/epg-e',
+                 'uni/tn-t/ap-a/epg-e/cep-c1', 'uni/tn-t/ctx-c2'])
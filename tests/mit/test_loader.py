@@ -0,0 +1,117 @@
+# Copyright 2015 Cisco Systems, Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from builtins import object
+
+import importlib
+import json
+import subprocess
+import sys
+import pytest
+
+from cobra.mit._loader import ClassLoader
+pytest.importorskip("cobra.model.fv")
+
+
+@pytest.fixture
+def importCalls(monkeypatch):
+    ClassLoader.clearCache()
+    calls = []
+    importModule = importlib.import_module
+
+    def countingImport(name, *args):
+        calls.append(name)
+        return importModule(name, *args)
+    monkeypatch.setattr(importlib, 'import_module', countingImport)
+    yield calls
+    ClassLoader.clearCache()
+
+
+class Test_loader_ClassLoader(object):
+
+    def test_loadClass_is_memoized(self, importCalls):
+        tenantClass = ClassLoader.loadClass('cobra.model.fv.Tenant')
+        assert tenantClass.meta.moClassName == 'fvTenant'
+        assert ClassLoader.loadClass('cobra.model.fv.Tenant') is tenantClass
+        assert importCalls == ['cobra.model.fv']
+
+    def test_loadClass_negative_cache(self, importCalls):
+        for _ in range(2):
+            with pytest.raises(AttributeError):
+                ClassLoader.loadClass('cobra.model.fv.NoSuchClass')
+        assert len(importCalls) == 1
+
+    def test_loadClass_import_error_not_cached(self, importCalls):
+        for _ in range(2):
+            with pytest.raises(ImportError):
+                ClassLoader.loadClass('cobra.model.nosuchpkg.Class')
+        assert importCalls == ['cobra.model.nosuchpkg'] * 2
+
+    @pytest.mark.parametrize('package', ['fv', 'cobra.model.fv'])
+    def test_preload(self, importCalls, package):
+        assert ClassLoader.preload([package]) > 0
+        del importCalls[:]
+        assert ClassLoader.loadClass('cobra.model.fv.BD').meta.moClassName == \
+            'fvBD'
+        assert importCalls == []
+
+    def test_class_index(self, importCalls, tmpdir):
+        indexPath = str(tmpdir.join(ClassLoader.CLASS_INDEX_FILE))
+        assert ClassLoader.writeClassIndex(indexPath) > 0
+        with open(indexPath) as indexFile:
+            classIndex = json.load(indexFile)
+        assert classIndex['fvTenant'] == ['cobra.model.fv', 'Tenant']
+        assert ClassLoader.loadMoClass('fvTenant') is \
+            ClassLoader.loadClass('cobra.model.fv.Tenant')
+        assert ClassLoader.loadMoClass('fvNoSuchClass') is None
+
+    def test_class_index_out_of_date(self, importCalls, monkeypatch):
+        from cobra.mit import _codec_utils
+        ClassLoader._classIndex = {
+            'fvTenant': ('cobra.model.fv.old', 'Tenant'),
+            'fvBD': ('cobra.model.fv', 'OldBD'),
+        }
+        monkeypatch.setattr(_codec_utils, '_decodePlans', {})
+        assert ClassLoader.loadMoClass('fvTenant') is None
+        assert ClassLoader.loadMoClass('fvBD') is None
+        fv = importlib.import_module('cobra.model.fv')
+        assert _codec_utils.getDecodePlan('fvTenant').pyClass is fv.Tenant
+        assert _codec_utils.getDecodePlan('fvBD').pyClass is fv.BD
+
+    def test_clearCache_rebuilds_decode_plans(self, importCalls):
+        from cobra.mit._codec_utils import getDecodePlan
+        plan = getDecodePlan('fvTenant')
+        assert getDecodePlan('fvTenant') is plan
+        ClassLoader.clearCache()
+        newPlan = getDecodePlan('fvTenant')
+        assert newPlan is not plan
+        assert getDecodePlan('fvTenant') is newPlan
+
+    def test_class_index_reexported_class(self, monkeypatch, tmpdir):
+        fv = importlib.import_module('cobra.model.fv')
+        top = importlib.import_module('cobra.model.top')
+        # top is indexed after fv
+        monkeypatch.setattr(top, 'ReexportedTenant', fv.Tenant, raising=False)
+        indexPath = str(tmpdir.join(ClassLoader.CLASS_INDEX_FILE))
+        ClassLoader.writeClassIndex(indexPath)
+        with open(indexPath) as indexFile:
+            classIndex = json.load(indexFile)
+        assert classIndex['fvTenant'] == ['cobra.model.fv', 'Tenant']
+        ClassLoader.clearCache()
+
+    def test_model_is_imported_on_demand(self):
+        code = ('import sys, cobra.mit.access, cobra.mit._mit; '
+                'print([m for m in sys.modules if m.startswith("cobra.model.")])')
+        output = subprocess.check_output([sys.executable, '-c', code])
+        assert output.strip() == b'[]'
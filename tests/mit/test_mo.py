@@ -0,0 +1,100 @@
+# Copyright 2015 Cisco Systems, Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from builtins import object
+
+import json
+import pytest
+
+from cobra.mit.jsoncodec import fromJSONStr
+fv = pytest.importorskip("cobra.model.fv")
+
+
+def childContainer(mo):
+    return mo.__dict__['_BaseMo__children']
+
+
+def epgJSON(numCeps, compact=False):
+    ceps = [{'fvCEp': {'attributes': {'mac': 'c{0}'.format(i)}}}
+            for i in range(numCeps)]
+    jsonStr = json.dumps({'totalCount': '1', 'imdata': [{'fvAEPg': {
+        'attributes': {'dn': 'uni/tn-t/ap-a/epg-e', 'name': 'e'},
+        'children': ceps}}]})
+    return fromJSONStr(jsonStr, compact=compact)[0]
+
+
+class Test_mit_mo_children(object):
+
+    def test_leaves_share_no_children(self):
+        ap = fv.Ap('uni/tn-t', 'a')
+        epg1 = fv.AEPg(ap, 'e1')
+        epg2 = fv.AEPg(ap, 'e2')
+        assert childContainer(epg1) is childContainer(epg2)
+        assert epg1.numChildren == 0
+        assert list(epg1.children) == []
+        assert childContainer(ap) is not childContainer(epg1)
+        assert ap.numChildren == 2
+
+    def test_decoded_leaves_share_no_children(self):
+        epg = epgJSON(3)
+        ceps = list(epg.children)
+        assert len(ceps) == 3
+        assert childContainer(ceps[0]) is childContainer(ceps[1])
+        assert epg.numChildren == 3
+
+    def test_compact_leaves(self):
+        epg = epgJSON(3, compact=True)
+        assert epg.numChildren == 3
+        for cep in epg.children:
+            assert cep.numChildren == 0
+            assert list(cep.children) == []
+
+    def test_failed_lookup_keeps_no_children(self):
+        epg = fv.AEPg('uni/tn-t/ap-a', 'e')
+        with pytest.raises(AttributeError):
+            epg.nonExistingChildClass
+        assert not hasattr(epg, 'nonExistingChildClass')
+        assert childContainer(epg) is childContainer(fv.AEPg('uni', 'x'))
+
+    def test_child_class_container_lookup(self):
+        epg = fv.AEPg('uni/tn-t/ap-a', 'e')
+        ceps = epg.cep
+        assert len(ceps) == 0
+        cep = fv.CEp(epg, 'c')
+        assert list(epg.cep) == [cep]
+        assert epg.cep['c'] is cep
+
+    def test_clone_leaf(self):
+        epg = fv.AEPg('uni/tn-t/ap-a', 'e')
+        clonedEpg = epg.clone()
+        assert clonedEpg.numChildren == 0
+        fv.CEp(clonedEpg, 'c')
+        assert clonedEpg.numChildren == 1
+        assert epg.numChildren == 0
+
+    def test_clone_subtree(self):
+        epg = epgJSON(4)
+        clonedEpg = epg.clone()
+        assert (sorted(str(mo.dn) for mo in clonedEpg.children) ==
+                sorted(str(mo.dn) for mo in epg.children))
+
+    def test_iterate_multiple_classes(self):
+        tenant = fv.Tenant('uni', 't')
+        fv.BD(tenant, 'b1')
+        fv.BD(tenant, 'b2')
+        fv.Ap(tenant, 'a')
+        fv.Ctx(tenant, 'c')
+        assert tenant.numChildren == 4
+        assert (sorted(str(mo.rn) for mo in tenant.children) ==
+                ['BD-b1', 'BD-b2', 'ap-a', 'ctx-c'])
@@ -0,0 +1,169 @@
+# Copyright 2015 Cisco Systems, Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from builtins import str
+from builtins import object
+
+import pytest
+
+from cobra.mit.meta import ClassMeta
+from cobra.mit.naming import Dn, Rn
+fv = pytest.importorskip("cobra.model.fv")
+
+
+@pytest.fixture
+def parseCache():
+    Dn.clearParseCache()
+    yield
+    Dn.setParseCacheSize(Dn.PARSE_CACHE_SIZE)
+
+
+class Test_naming_Dn_parseCache(object):
+
+    def test_fromString_hits(self, parseCache):
+        first = Dn.fromString('uni/tn-t/BD-b')
+        second = Dn.fromString('uni/tn-t/BD-b')
+        info = Dn.parseCacheInfo()
+        assert (info.hits, info.misses, info.currSize) == (1, 1, 1)
+        assert first == second and first is not second
+        assert second.meta is fv.BD.meta
+        assert second.moClass is fv.BD
+        assert [str(rn) for rn in second.rns] == ['uni', 'tn-t', 'BD-b']
+
+    def test_shared_dn_is_not_mutated(self, parseCache):
+        tenantDn = Dn.fromString('uni/tn-t')
+        tenantDn.appendRn(Rn(fv.BD.meta, 'b'))
+        assert str(Dn.fromString('uni/tn-t')) == 'uni/tn-t'
+
+    def test_lru_eviction(self, parseCache):
+        Dn.setParseCacheSize(2)
+        for name in ['a', 'b', 'a', 'c']:
+            Dn.fromString('uni/tn-' + name)
+        assert Dn.parseCacheInfo().currSize == 2
+        Dn.fromString('uni/tn-a')
+        Dn.fromString('uni/tn-b')
+        info = Dn.parseCacheInfo()
+        assert (info.hits, info.misses) == (2, 4)
+
+    def test_invalid_dn_is_not_cached(self, parseCache):
+        for _ in range(2):
+            with pytest.raises(ValueError):
+                Dn.fromString('uni/nosuchrn-x')
+        assert Dn.parseCacheInfo().currSize == 0
+
+    def test_disabled(self, parseCache):
+        Dn.setParseCacheSize(0)
+        Dn.fromString('uni/tn-t')
+        Dn.fromString('uni/tn-t')
+        assert Dn.parseCacheInfo().hits == 0
+
+
+@pytest.fixture(params=[True, False], ids=['table', 'scan'])
+def prefixTable(request, monkeypatch):
+    if request.param:
+        monkeypatch.setattr(ClassMeta, 'MIN_CHILDREN_PREFIX_TABLE', 0)
+    else:
+        monkeypatch.setattr(ClassMeta, 'MIN_CHILDREN_PREFIX_TABLE', 1000)
+
+
+@pytest.mark.usefixtures('prefixTable')
+class Test_meta_ClassMeta_findChildClassName(object):
+
+    def test_findChildClassName(self):
+        meta = fv.AEPg.meta
+        assert meta.findChildClassName('cep-00:11') == 'cobra.model.fv.CEp'
+        assert meta.findChildClassName('rspathAtt-[x]') == \
+            'cobra.model.fv.RsPathAtt'
+        assert meta.findChildClassName('nosuchrn-x') is None
+        assert meta.findChildClassName('') is None
+
+    def test_longest_prefix_first(self):
+        meta = ClassMeta('cobra.model.test.Parent')
+        meta.childNamesAndRnPrefix.append(('cobra.model.test.Ac', 'ac-'))
+        meta.childNamesAndRnPrefix.append(('cobra.model.test.Action',
+                                           'action-'))
+        meta.childNamesAndRnPrefix.append(('cobra.model.test.Any', ''))
+        assert meta.findChildClassName('action-x') == 'cobra.model.test.Action'
+        assert meta.findChildClassName('ac-x') == 'cobra.model.test.Ac'
+        assert meta.findChildClassName('a') == 'cobra.model.test.Any'
+        assert meta.findChildClassName('x') == 'cobra.model.test.Any'
+
+    def test_findChild(self, parseCache):
+        assert Dn.fromString('uni/tn-t/ap-a/epg-e/cep-00:11').meta is \
+            fv.CEp.meta
+
+
+class Test_naming_keys(object):
+
+    def test_dn_compares_like_its_string(self):
+        dns = [Dn.fromString(dnStr) for dnStr in
+               ['uni/tn-b', 'uni/tn-a/BD-x', 'uni/tn-a', 'uni']]
+        assert sorted(dns) == sorted(dns, key=str)
+        assert dns[2] == 'uni/tn-a' and dns[2] != 'uni/tn-b'
+        assert dns[2] == Dn.fromString('uni/tn-a')
+        assert hash(dns[2]) == hash(Dn.fromString('uni/tn-a'))
+        assert Dn() == '' and Dn() < dns[3]
+
+    def test_dn_key_follows_appendRn(self):
+        dn = Dn.fromString('uni/tn-a')
+        assert hash(dn) == hash('uni/tn-a')
+        dn.appendRn(Rn(fv.BD.meta, 'x'))
+        assert dn == 'uni/tn-a/BD-x'
+        assert hash(dn) == hash('uni/tn-a/BD-x')
+
+    def test_rn_compares_like_its_string(self):
+        rns = [Rn(fv.Tenant.meta, name) for name in ['b', 'a', 'c']]
+        assert sorted(rns) == sorted(rns, key=str)
+        assert rns[0] == 'tn-b' and rns[0] == Rn(fv.Tenant.meta, 'b')
+        assert {rns[0]: 1}[Rn(fv.Tenant.meta, 'b')] == 1
+        assert rns[0] != rns[1] and rns[1] < rns[0] <= rns[2]
+
+
+class Test_naming_Dn_sharing(object):
+
+    def test_clone_is_independent(self):
+        dn = Dn.fromString('uni/tn-a')
+        clone = dn.clone()
+        clone.appendRn(Rn(fv.BD.meta, 'b'))
+        assert str(dn) == 'uni/tn-a' and len(dn) == 2
+        assert str(clone) == 'uni/tn-a/BD-b' and len(clone) == 3
+        assert clone.meta is fv.BD.meta
+
+    def test_appendRn_validates(self):
+        with pytest.raises(ValueError):
+            Dn.fromString('uni/tn-a').appendRn(Rn(fv.Subnet.meta, '1.1.1.1'))
+
+    def test_ancestors(self):
+        dn = Dn.fromString('uni/tn-a/BD-b/subnet-[10.0.0.1/24]')
+        assert dn.getParent() == 'uni/tn-a/BD-b'
+        assert dn.getAncestor(3) == 'uni'
+        assert dn.getAncestor(4).isRoot
+        assert dn.getAncestor(0).isRoot
+        assert dn.getParent().moClass is fv.BD
+        assert [str(rn) for rn in dn.rns] == \
+            ['uni', 'tn-a', 'BD-b', 'subnet-[10.0.0.1/24]']
+        assert str(dn.rn()) == 'subnet-[10.0.0.1/24]'
+        assert str(dn.rn(1)) == 'tn-a'
+
+    def test_findCommonParent(self):
+        dns = [Dn.fromString('uni/tn-a/BD-b'), Dn.fromString('uni/tn-a/ctx-c')]
+        assert Dn.findCommonParent(dns) == 'uni/tn-a'
+        dns.append(Dn.fromString('topology/pod-1'))
+        assert Dn.findCommonParent(dns).isRoot
+
+    def test_mo_dns_share_their_prefix(self):
+        tenant = fv.Tenant('uni', 'a')
+        bd = fv.BD(tenant, 'b')
+        assert bd.dn == 'uni/tn-a/BD-b'
+        assert bd.dn.getParent()._Dn__node is tenant.dn._Dn__node
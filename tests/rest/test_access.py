@@ -0,0 +1,335 @@
+# Copyright 2015 Cisco Systems, Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from future import standard_library
+standard_library.install_aliases()
+from builtins import str
+from builtins import object
+
+import json
+import re
+import pytest
+import responses
+from urllib.parse import urlparse, parse_qs
+
+import cobra.internal.rest.accessimpl
+import cobra.mit.access
+import cobra.mit.naming
+import cobra.mit.request
+import cobra.mit.session
+cobra.model.fv = pytest.importorskip("cobra.model.fv")
+
+URL = 'http://mock'
+NUM_CEPS = 25
+
+
+def cepJSON(index):
+    mac = '00:00:00:00:00:{0:02X}'.format(index)
+    return {
+        'fvCEp': {
+            'attributes': {
+                'dn': 'uni/tn-t/ap-a/epg-e/cep-{0}'.format(mac),
+                'mac': mac,
+                'ip': '10.0.0.{0}'.format(index),
+                'encap': 'vlan-{0}'.format(100 + index % 4),
+            }
+        }
+    }
+
+
+def pagedCallback(request):
+    options = parse_qs(urlparse(request.url).query)
+    pageSize = int(options.get('page-size', [NUM_CEPS])[0])
+    page = int(options.get('page', [0])[0])
+    start = page * pageSize
+    imdata = [cepJSON(i) for i in range(start, min(start + pageSize, NUM_CEPS))]
+    body = json.dumps({'totalCount': str(NUM_CEPS), 'imdata': imdata})
+    return (200, {}, body)
+
+
+@pytest.fixture
+def moDir():
+    session = cobra.mit.session.LoginSession(URL, 'admin', 'password',
+                                             requestFormat='json')
+    return cobra.mit.access.MoDirectory(session)
+
+
+@pytest.fixture
+def pagedMock():
+    with responses.RequestsMock() as rsps:
+        rsps.add_callback(responses.GET,
+                          re.compile(URL + '/api/class/fvCEp.json.*'),
+                          callback=pagedCallback)
+        yield rsps
+
+
+def pagesRequested(rsps):
+    pages = []
+    for call in rsps.calls:
+        options = parse_qs(urlparse(call.request.url).query)
+        pages.append(int(options['page'][0]))
+    return pages
+
+
+class Test_access_iterQuery(object):
+
+    @pytest.mark.parametrize('prefetch', [False, True])
+    def test_iterQuery_all_pages(self, moDir, pagedMock, prefetch):
+        query = cobra.mit.request.ClassQuery('fvCEp')
+        mos = list(moDir.iterQuery(query, pageSize=10, prefetch=prefetch))
+        assert [mo.ip for mo in mos] == ['10.0.0.{0}'.format(i)
+                                         for i in range(NUM_CEPS)]
+        assert sorted(pagesRequested(pagedMock)) == [0, 1, 2]
+        # The original query is left untouched
+        assert query.page is None
+        assert query.pageSize is None
+
+    def test_iterQuery_exact_pages(self, moDir, pagedMock):
+        query = cobra.mit.request.ClassQuery('fvCEp')
+        mos = list(moDir.iterQuery(query, pageSize=5))
+        assert len(mos) == NUM_CEPS
+        assert pagesRequested(pagedMock) == [0, 1, 2, 3, 4]
+
+    def test_iterQuery_order(self, moDir, pagedMock):
+        query = cobra.mit.request.ClassQuery('fvCEp')
+        list(moDir.iterQuery(query, pageSize=10))
+        query.orderBy = 'fvCEp.ip|desc'
+        list(moDir.iterQuery(query, pageSize=10))
+        orders = [parse_qs(urlparse(call.request.url).query)['order-by']
+                  for call in pagedMock.calls]
+        assert orders == [['fvCEp.dn']] * 3 + [['fvCEp.ip|desc']] * 3
+
+    def test_iterQuery_is_lazy(self, moDir, pagedMock):
+        mos = moDir.iterLookupByClass('fvCEp', pageSize=10)
+        assert next(mos).ip == '10.0.0.0'
+        assert pagesRequested(pagedMock) == [0]
+        mos.close()
+
+
+class Test_access_queryPaged(object):
+
+    @pytest.mark.parametrize('maxWorkers', [1, 4])
+    def test_queryPaged_page_order(self, moDir, pagedMock, maxWorkers):
+        query = cobra.mit.request.ClassQuery('fvCEp')
+        mos = moDir.queryPaged(query, pageSize=4, maxWorkers=maxWorkers)
+        assert mos.totalCount == NUM_CEPS
+        assert [mo.ip for mo in mos] == ['10.0.0.{0}'.format(i)
+                                         for i in range(NUM_CEPS)]
+        assert sorted(pagesRequested(pagedMock)) == list(range(7))
+        # The original query is left untouched
+        assert query.page is None
+
+    def test_queryPaged_cacheId(self, moDir, pagedMock):
+        query = cobra.mit.request.ClassQuery('fvCEp')
+        moDir.queryPaged(query, pageSize=10, cacheId=42)
+        for call in pagedMock.calls:
+            options = parse_qs(urlparse(call.request.url).query)
+            assert options['cache-session'] == ['42']
+
+    def test_queryPaged_order(self, moDir, pagedMock):
+        query = cobra.mit.request.ClassQuery('fvCEp')
+        moDir.queryPaged(query, pageSize=10)
+        for call in pagedMock.calls:
+            options = parse_qs(urlparse(call.request.url).query)
+            assert options['order-by'] == ['fvCEp.dn']
+        assert query.orderBy is None
+
+
+class Test_access_connectionPool(object):
+
+    def test_pool_options(self):
+        session = cobra.mit.session.LoginSession(URL, 'admin', 'password',
+                                                 poolConnections=4,
+                                                 poolMaxSize=32,
+                                                 keepAlive=False,
+                                                 maxRetries=3)
+        moDir = cobra.mit.access.MoDirectory(session)
+        requestsSession = moDir._accessImpl._requests
+        adapter = requestsSession.get_adapter(URL)
+        assert adapter._pool_connections == 4
+        assert adapter._pool_maxsize == 32
+        assert adapter.max_retries.total == 3
+        assert adapter.max_retries.connect == 3
+        assert requestsSession.headers['Connection'] == 'close'
+
+    def test_login_uses_pooled_session(self, moDir, monkeypatch):
+        def noPost(*args, **kwargs):
+            raise AssertionError('login must use the pooled session')
+        monkeypatch.setattr(cobra.internal.rest.accessimpl.requests, 'post',
+                            noPost)
+        body = json.dumps({'imdata': [{'aaaLogin': {'attributes': {
+            'token': 'fakeToken', 'refreshTimeoutSeconds': '600',
+            'version': '4.2'}}}]})
+        with responses.RequestsMock() as rsps:
+            rsps.add(responses.POST, URL + '/api/aaaLogin.json', body=body)
+            moDir.login()
+        assert moDir.session.cookie == 'fakeToken'
+
+
+MIT = dict(
+    [('uni/tn-t{0}'.format(i), 'fvTenant') for i in range(3)] +
+    [('uni/tn-t0/BD-b{0}'.format(i), 'fvBD') for i in range(100)] +
+    [('uni/tn-t1/BD-b0', 'fvBD'), ('uni/tn-t0/ctx-c0', 'fvCtx')]
+)
+
+
+def moJSON(dnStr, options):
+    attributes = {'dn': dnStr}
+    rn = dnStr.split('/')[-1]
+    attributes['name'] = rn.split('-', 1)[1]
+    if 'count' in options.get('rsp-subtree-include', []):
+        return {'moCount': {'attributes': {'count': '1'}}}
+    return {MIT[dnStr]: {'attributes': attributes}}
+
+
+def mitCallback(request):
+    parsed = urlparse(request.url)
+    options = parse_qs(parsed.query)
+    filterDns = re.findall(r'eq\(\w+\.dn,"([^"]+)"\)',
+                           options.get('query-target-filter', [''])[0])
+    path = parsed.path[:-len('.json')]
+    if path.startswith('/api/mo/'):
+        dnStr = path[len('/api/mo/'):]
+        if options.get('query-target') == ['subtree']:
+            className = options['target-subtree-class'][0]
+            dnStrs = [childDn for childDn in filterDns
+                      if childDn.startswith(dnStr + '/') and
+                      MIT.get(childDn) == className]
+        else:
+            dnStrs = [dnStr] if dnStr in MIT else []
+    else:
+        className = path[len('/api/class/'):]
+        dnStrs = [dnStr for dnStr in filterDns if MIT.get(dnStr) == className]
+    imdata = [moJSON(dnStr, options) for dnStr in dnStrs]
+    body = json.dumps({'totalCount': str(len(imdata)), 'imdata': imdata})
+    return (200, {}, body)
+
+
+@pytest.fixture
+def mitMock():
+    with responses.RequestsMock() as rsps:
+        rsps.add_callback(responses.GET, re.compile(URL + '/api/.*'),
+                          callback=mitCallback)
+        yield rsps
+
+
+class Test_access_lookupByDns(object):
+
+    def test_lookupByDns(self, moDir, mitMock):
+        dnStrs = ['uni/tn-t0/BD-b{0}'.format(i) for i in range(100)]
+        dnStrs += ['uni/tn-t0/BD-missing', 'uni/tn-t1/BD-b0',
+                   'uni/tn-t0/ctx-c0', 'uni/tn-t0', 'uni/tn-t2']
+        mos = moDir.lookupByDns(dnStrs)
+        assert len(mos) == len(dnStrs)
+        for dnStr in dnStrs:
+            dn = cobra.mit.naming.Dn.fromString(dnStr)
+            if dnStr == 'uni/tn-t0/BD-missing':
+                assert mos[dn] is None
+            else:
+                assert str(mos[dn].dn) == dnStr
+        # 2 fvBD batches, 1 fvTenant batch and one single fvCtx lookup
+        assert len(mitMock.calls) == 4
+
+    def test_lookupByDns_scoping(self, moDir, mitMock):
+        moDir.lookupByDns(['uni/tn-t0/BD-b1', 'uni/tn-t0/BD-b2',
+                           'uni/tn-t0', 'uni/tn-t1'])
+        paths = sorted(urlparse(call.request.url).path
+                       for call in mitMock.calls)
+        assert paths == ['/api/mo/uni.json', '/api/mo/uni/tn-t0.json']
+
+    def test_lookupByDns_single(self, moDir, mitMock):
+        mos = moDir.lookupByDns(['uni/tn-t2'])
+        assert list(mos.values())[0].name == 't2'
+        assert urlparse(mitMock.calls[0].request.url).query == ''
+
+    def test_lookupByDns_propFilter(self, moDir, mitMock):
+        propFilter = 'eq(fvBD.name,"b1")'
+        moDir.lookupByDns(['uni/tn-t0/BD-b1', 'uni/tn-t0/BD-b2',
+                           'uni/tn-t0/ctx-c0'], propFilter=propFilter)
+        filters = {}
+        for call in mitMock.calls:
+            parsed = urlparse(call.request.url)
+            options = parse_qs(parsed.query)
+            filters[parsed.path] = options['query-target-filter'][0]
+        assert filters['/api/mo/uni/tn-t0/ctx-c0.json'] == propFilter
+        assert filters['/api/mo/uni/tn-t0.json'] == (
+            'and(eq(fvBD.name,"b1"),or(eq(fvBD.dn,"uni/tn-t0/BD-b1"),'
+            'eq(fvBD.dn,"uni/tn-t0/BD-b2")))')
+
+    @pytest.mark.parametrize('param', ['queryTarget', 'classFilter'])
+    def test_lookupByDns_scoping_params(self, moDir, param):
+        with pytest.raises(ValueError):
+            moDir.lookupByDns(['uni/tn-t0/BD-b1', 'uni/tn-t0/BD-b2'],
+                              **{param: 'self'})
+
+
+class Test_access_existsMany(object):
+
+    def test_existsMany(self, moDir, mitMock):
+        dnStrs = ['uni/tn-t0/BD-b{0}'.format(i) for i in range(0, 120, 2)]
+        dnStrs += ['uni/tn-t0/ctx-c0', 'uni/tn-t5/ctx-c0', 'uni/tn-t1']
+        presentDns = moDir.existsMany(dnStrs)
+        expected = set(cobra.mit.naming.Dn.fromString(dnStr)
+                       for dnStr in dnStrs if dnStr in MIT)
+        assert presentDns == expected
+        # One fvBD batch, one fvCtx batch and a count for the single fvTenant
+        assert presentDns.requestCount == len(mitMock.calls) == 3
+        assert presentDns.elapsedTime >= 0
+
+    def test_existsMany_single(self, moDir, mitMock):
+        assert moDir.existsMany(['uni/tn-t5']) == set()
+        options = parse_qs(urlparse(mitMock.calls[0].request.url).query)
+        assert options['rsp-subtree-include'] == ['count']
+
+    def test_existsMany_naming_only(self, moDir, mitMock):
+        moDir.existsMany(['uni/tn-t0/BD-b1', 'uni/tn-t0/BD-b2'])
+        options = parse_qs(urlparse(mitMock.calls[0].request.url).query)
+        assert options['rsp-prop-include'] == ['naming-only']
+
+
+class Test_access_queryStream(object):
+
+    def test_queryStream(self, moDir, pagedMock):
+        query = cobra.mit.request.ClassQuery('fvCEp')
+        mos = moDir.queryStream(query)
+        assert next(mos).ip == '10.0.0.0'
+        assert mos.totalCount == NUM_CEPS
+        assert len(list(mos)) == NUM_CEPS - 1
+
+    def test_queryStream_xml(self):
+        session = cobra.mit.session.LoginSession(URL, 'admin', 'password',
+                                                 requestFormat='xml')
+        moDir = cobra.mit.access.MoDirectory(session)
+        body = ('<?xml version="1.0" encoding="UTF-8"?><imdata totalCount="2">'
+                '<fvTenant dn="uni/tn-a" name="a"/>'
+                '<fvTenant dn="uni/tn-b" name="b"/></imdata>')
+        with responses.RequestsMock() as rsps:
+            rsps.add(responses.GET, URL + '/api/class/fvTenant.xml',
+                     body=body)
+            mos = moDir.queryStream(cobra.mit.request.ClassQuery('fvTenant'))
+            assert [str(mo.dn) for mo in mos] == ['uni/tn-a', 'uni/tn-b']
+            assert mos.totalCount == 2
+
+
+class Test_access_queryColumns(object):
+
+    def test_queryColumns(self, moDir, pagedMock):
+        query = cobra.mit.request.ClassQuery('fvCEp')
+        result = moDir.queryColumns(query, propNames=['ip'])
+        ceps = result['fvCEp']
+        assert result.totalCount == NUM_CEPS
+        assert len(ceps) == NUM_CEPS
+        assert sorted(ceps.columns) == ['ip', 'mac']
+        assert ceps['ip'][3] == '10.0.0.3'
+        assert str(ceps.getMo(3).dn) == ceps.dns[3]
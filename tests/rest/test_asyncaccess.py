@@ -0,0 +1,216 @@
+# Copyright 2015 Cisco Systems, Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import asyncio
+import json
+import re
+import ssl
+import threading
+import pytest
+from http.server import BaseHTTPRequestHandler, HTTPServer
+from socketserver import ThreadingMixIn
+
+import cobra.mit.request
+import cobra.mit.session
+aiohttp = pytest.importorskip("aiohttp")
+cobra.model.fv = pytest.importorskip("cobra.model.fv")
+import cobra.mit.asyncaccess
+from cobra.internal.rest.asyncaccessimpl import (AsyncRestAccess,
+                                                BufferedResponse)
+
+TENANTS = ['common', 'mgmt', 'infra']
+
+
+def tenantJSON(name):
+    return {'fvTenant': {'attributes': {'dn': 'uni/tn-' + name,
+                                        'name': name}}}
+
+
+class MockApicHandler(BaseHTTPRequestHandler):
+    commits = []
+
+    def log_message(self, *args):
+        pass
+
+    def reply(self, imdata, status=200):
+        body = json.dumps({'totalCount': str(len(imdata)),
+                           'imdata': imdata}).encode()
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_POST(self):
+        data = self.rfile.read(int(self.headers['Content-Length']))
+        if self.path == '/api/aaaLogin.json':
+            return self.reply([{'aaaLogin': {'attributes': {
+                'token': 'fakeToken', 'refreshTimeoutSeconds': '600',
+                'version': '4.2'}}}])
+        MockApicHandler.commits.append((self.path, json.loads(data)))
+        return self.reply([])
+
+    def do_GET(self):
+        if self.headers['Cookie'] != 'APIC-cookie=fakeToken':
+            return self.reply([{'error': {'attributes': {
+                'code': '403', 'text': 'Token was invalid'}}}], 403)
+        match = re.match(r'/api/mo/uni/tn-(\w+)\.json(\?.*)?$', self.path)
+        if match:
+            name, options = match.groups()
+            if name not in TENANTS:
+                return self.reply([])
+            if options and 'rsp-subtree-include=count' in options:
+                return self.reply([{'moCount': {'attributes': {
+                    'count': '1'}}}])
+            return self.reply([tenantJSON(name)])
+        if self.path.startswith('/api/class/fvTenant.json'):
+            return self.reply([tenantJSON(name) for name in TENANTS])
+        return self.reply([{'error': {'attributes': {
+            'code': '400', 'text': 'Bad request'}}}], 400)
+
+
+class MockApic(ThreadingMixIn, HTTPServer):
+    daemon_threads = True
+
+
+@pytest.fixture(scope='module')
+def apicUrl():
+    server = MockApic(('127.0.0.1', 0), MockApicHandler)
+    thread = threading.Thread(target=server.serve_forever)
+    thread.daemon = True
+    thread.start()
+    yield 'http://127.0.0.1:{0}'.format(server.server_address[1])
+    server.shutdown()
+
+
+def run(apicUrl, coroutineFunc):
+    async def main():
+        session = cobra.mit.session.LoginSession(apicUrl, 'admin', 'password',
+                                                 requestFormat='json')
+        async with cobra.mit.asyncaccess.AsyncMoDirectory(session) as moDir:
+            await moDir.login()
+            return await coroutineFunc(moDir)
+    return asyncio.run(main())
+
+
+class Test_asyncaccess_AsyncMoDirectory(object):
+
+    def test_login(self, apicUrl):
+        async def check(moDir):
+            return moDir.session.cookie
+        assert run(apicUrl, check) == 'fakeToken'
+
+    def test_lookupByDn(self, apicUrl):
+        async def check(moDir):
+            return (await moDir.lookupByDn('uni/tn-common'),
+                    await moDir.lookupByDn('uni/tn-missing'))
+        tenant, missing = run(apicUrl, check)
+        assert str(tenant.dn) == 'uni/tn-common'
+        assert missing is None
+
+    def test_lookupByClass(self, apicUrl):
+        async def check(moDir):
+            return await moDir.lookupByClass('fvTenant')
+        tenants = run(apicUrl, check)
+        assert sorted(tenant.name for tenant in tenants) == sorted(TENANTS)
+
+    def test_exists(self, apicUrl):
+        async def check(moDir):
+            return (await moDir.exists('uni/tn-mgmt'),
+                    await moDir.exists('uni/tn-missing'))
+        assert run(apicUrl, check) == (True, False)
+
+    def test_commit(self, apicUrl):
+        async def check(moDir):
+            tenant = cobra.model.fv.Tenant('uni', 'async')
+            configRequest = cobra.mit.request.ConfigRequest()
+            configRequest.addMo(tenant)
+            return await moDir.commit(configRequest)
+        rsp = run(apicUrl, check)
+        assert rsp.status_code == 200
+        path, data = MockApicHandler.commits[-1]
+        assert path == '/api/mo/uni/tn-async.json'
+        assert data['fvTenant']['attributes']['name'] == 'async'
+
+    def test_query_error(self, apicUrl):
+        async def check(moDir):
+            return await moDir.query(cobra.mit.request.ClassQuery('fvBD'))
+        with pytest.raises(cobra.mit.request.RestError):
+            run(apicUrl, check)
+
+    def test_concurrent_queries(self, apicUrl):
+        async def check(moDir):
+            lookups = [moDir.lookupByDn('uni/tn-' + TENANTS[i % 3])
+                       for i in range(300)]
+            return await asyncio.gather(*lookups)
+        tenants = run(apicUrl, check)
+        assert [tenant.name for tenant in tenants] == \
+            [TENANTS[i % 3] for i in range(300)]
+
+
+class Test_asyncaccess_AsyncRestAccess(object):
+
+    def test_xml_error(self):
+        session = cobra.mit.session.LoginSession('http://apic', 'admin',
+                                                 'password')
+        accessImpl = AsyncRestAccess(session)
+        rsp = BufferedResponse('http://apic/api/class/fvBD.xml', 400,
+                               '<imdata totalCount="1"><error code="400" '
+                               'text="Bad request"/></imdata>')
+        with pytest.raises(cobra.mit.request.QueryError) as excinfo:
+            accessImpl._AsyncRestAccess__parseError(
+                rsp, cobra.mit.request.QueryError, 400)
+        assert excinfo.value.reason == 'Bad request'
+
+    def test_connector_limits(self):
+        session = cobra.mit.session.LoginSession('http://apic', 'admin',
+                                                 'password', poolConnections=4,
+                                                 poolMaxSize=5)
+        accessImpl = AsyncRestAccess(session)
+
+        async def limits():
+            connector = accessImpl._getClient().connector
+            await accessImpl.close()
+            return connector.limit, connector.limit_per_host
+        assert asyncio.run(limits()) == (0, 5)
+
+    @pytest.mark.parametrize('secure, expected', [
+        (False, False),
+        (True, True),
+    ])
+    def test_ssl_option(self, secure, expected):
+        session = cobra.mit.session.LoginSession('https://apic', 'admin',
+                                                 'password', secure=secure)
+        assert AsyncRestAccess(session)._sslOption() is expected
+
+    @pytest.mark.parametrize('isDir, caArg', [
+        (False, 'cafile'),
+        (True, 'capath'),
+    ])
+    def test_ssl_ca_bundle(self, monkeypatch, tmpdir, isDir, caArg):
+        caPath = tmpdir.mkdir('certs') if isDir else tmpdir.join('ca.pem')
+        caPath = str(caPath)
+        calls = []
+
+        def createContext(**kwargs):
+            calls.append(kwargs)
+            return ssl.SSLContext(ssl.PROTOCOL_TLS_CLIENT)
+        monkeypatch.setattr(ssl, 'create_default_context', createContext)
+        session = cobra.mit.session.LoginSession('https://apic', 'admin',
+                                                 'password', secure=caPath)
+        accessImpl = AsyncRestAccess(session)
+        context = accessImpl._sslOption()
+        assert isinstance(context, ssl.SSLContext)
+        assert accessImpl._sslOption() is context
+        assert calls == [{caArg: caPath}]